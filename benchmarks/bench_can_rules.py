@@ -0,0 +1,186 @@
+"""Benchmark the CAN validation rules per rule on a synthetic matrix.
+
+Usage:
+    python benchmarks/bench_can_rules.py --signals 10000
+    python benchmarks/bench_can_rules.py --signals 10000 --baseline HEAD~1
+
+``--baseline`` loads can_validation.py from that git revision and prints its
+per-rule time next to the working tree's.  The findings of both revisions
+must match rule by rule; any difference is printed and exits with 1, e.g.
+against the pre-vectorization rules:
+
+    python benchmarks/bench_can_rules.py --signals 2000 --bad 0.15 --baseline f3096af
+"""
+
+import argparse
+import dataclasses
+import os
+import subprocess
+import sys
+import time
+import types
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import can_validation
+
+
+def make_frame(n_signals: int, bad: float, per_message: int = 8, seed: int = 0) -> pd.DataFrame:
+    """Processed-matrix frame (create_correct_df columns) with ``bad`` share of broken cells."""
+    rng = np.random.default_rng(seed)
+    n_msgs = -(-n_signals // per_message)
+    msg_idx = np.arange(n_signals) // per_message
+    sig_idx = np.arange(n_signals) % per_message
+
+    def broken(good, wrong):
+        values = np.array(good, dtype=object)
+        flip = rng.random(n_signals) < bad
+        values[flip] = np.asarray(wrong, dtype=object)[rng.integers(len(wrong), size=flip.sum())]
+        return values
+
+    length = np.where(sig_idx % 2, 8, 2).astype(float)
+    frame = pd.DataFrame(
+        {
+            "Msg Row": (msg_idx * per_message).astype(float),
+            "Msg ID": [f"0x{0x100 + m % 0x300:X}" for m in msg_idx],
+            "Msg Name": [f"Msg_{m}" for m in msg_idx],
+            "Msg Type": broken(["Normal"] * n_signals, ["Diag", "NM", "Other"]),
+            "Send Type": broken(["Cycle"] * n_signals, ["Event", "CE", "Spontaneous"]),
+            "Msg Length": broken([64.0] * n_signals, [8.0, 12.0]),
+            "BRS": broken([1.0] * n_signals, [0.0, 2.0]),
+            "Frame Format": broken(["StandardCAN_FD"] * n_signals, ["StandardCAN", "Extended"]),
+            "Sig Name": [
+                f"Sig_{m}_{s}{suffix}"
+                for m, s, suffix in zip(
+                    msg_idx, sig_idx, broken([""] * n_signals, [" bad!", "_" + "x" * 40, "_" + "y" * 70])
+                )
+            ],
+            "Start Byte": broken(sig_idx.astype(float), [9.0, 2.5]),
+            "Start Bit": broken((sig_idx * 8).astype(float), [64.0, 70.0]),
+            "Length": length,
+            "Resolution": broken([0.5] * n_signals, [np.nan, "0.5"]),
+            "Offset": [-10.0] * n_signals,
+            "Initinal": broken(["0x0"] * n_signals, ["0x1FF", "0xFFFF"]),
+            "Invalid": ["0x3"] * n_signals,
+            "Min": broken([-10.0] * n_signals, [0.0, -12.0]),
+            "Min Hex": ["0x0"] * n_signals,
+            "Max": np.where(length == 8, 117.5, -8.5),
+            "Max Hex": np.where(length == 8, "0xFF", "0x3"),
+            "Byte Order": broken(["Motorola MSB"] * n_signals, ["Intel", "Motorola LSB"]),
+            "Description": broken(["Vehicle speed"] * n_signals, [np.nan, "bad|desc"]),
+            "Signal Value Description": broken(
+                ["0x0: Off\n0x1~0x3: On"] * n_signals,
+                [np.nan, "0x0: 5°C", "Off", "0x0 Off"],
+            ),
+            "Signal Send Type": broken(["Cycle"] * n_signals, ["OnWrite", "IfActive"]),
+        }
+    )
+    assert len(frame["Msg Name"].unique()) == n_msgs
+    return frame
+
+
+def load_revision(revision: str) -> types.ModuleType:
+    source = subprocess.run(
+        ["git", "show", f"{revision}:can_validation.py"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    module = types.ModuleType(f"can_validation_{revision}")
+    exec(compile(source, f"{revision}:can_validation.py", "exec"), module.__dict__)
+    return module
+
+
+def time_rules(module, frame: pd.DataFrame, protocol: str, repeat: int):
+    """Best-of-``repeat`` seconds and finding count for each rule of ``module``."""
+    ctx = module.MatrixContext(frame, protocol)
+    timings = {}
+    for rule_id, registered in module.RULES.items():
+        if registered.canfd_only and not ctx.is_canfd:
+            continue
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = list(registered.check(ctx))
+            best = min(best, time.perf_counter() - start)
+        timings[rule_id] = (best, len(found))
+    return timings
+
+
+def rule_findings(module, frame: pd.DataFrame, protocol: str):
+    """Sorted finding tuples of each rule of ``module``."""
+    ctx = module.MatrixContext(frame, protocol)
+    return {
+        rule_id: sorted(dataclasses.astuple(f) for f in registered.check(ctx))
+        for rule_id, registered in module.RULES.items()
+        if not (registered.canfd_only and not ctx.is_canfd)
+    }
+
+
+def finding_differences(current_module, baseline_module, frame: pd.DataFrame, protocol: str) -> int:
+    """Print findings that only one revision reports; the number of differing rules.
+
+    "Msg Row" is dropped first: older revisions do not know it, and with it
+    message findings point at the message header row only.
+    """
+    frame = frame.drop(columns=["Msg Row"], errors="ignore")
+    current = rule_findings(current_module, frame, protocol)
+    baseline = rule_findings(baseline_module, frame, protocol)
+    differing = 0
+    for rule_id in dict.fromkeys([*current, *baseline]):
+        now, before = current.get(rule_id, []), baseline.get(rule_id, [])
+        if now == before:
+            continue
+        differing += 1
+        missing = [f for f in before if f not in now]
+        extra = [f for f in now if f not in before]
+        print(f"{rule_id}: {len(before)} findings in baseline, {len(now)} now")
+        for finding in missing[:3]:
+            print(f"  - {finding}")
+        for finding in extra[:3]:
+            print(f"  + {finding}")
+    return differing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-rule CAN validation benchmark")
+    parser.add_argument("--signals", type=int, default=10000)
+    parser.add_argument("--bad", type=float, default=0.1, help="Share of broken cells per column")
+    parser.add_argument("--protocol", default="CANFD")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", help="Git revision to compare against, e.g. HEAD~1")
+    args = parser.parse_args()
+
+    frame = make_frame(args.signals, args.bad)
+    current = time_rules(can_validation, frame, args.protocol, args.repeat)
+    baseline_module = load_revision(args.baseline) if args.baseline else None
+    baseline = time_rules(baseline_module, frame, args.protocol, args.repeat) if baseline_module else {}
+
+    print(f"rows={len(frame)} protocol={args.protocol} repeat={args.repeat}")
+    header = f"{'rule':28s} {'findings':>9s} {'current ms':>11s}"
+    if baseline:
+        header += f" {'baseline ms':>12s} {'speedup':>8s}"
+    print(header)
+    for rule_id, (seconds, count) in current.items():
+        line = f"{rule_id:28s} {count:9d} {seconds * 1000:11.1f}"
+        if rule_id in baseline:
+            before = baseline[rule_id][0]
+            line += f" {before * 1000:12.1f} {before / seconds:7.1f}x"
+        print(line)
+    total = sum(seconds for seconds, _ in current.values())
+    footer = f"{'total':28s} {sum(c for _, c in current.values()):9d} {total * 1000:11.1f}"
+    if baseline:
+        before = sum(seconds for seconds, _ in baseline.values())
+        footer += f" {before * 1000:12.1f} {before / total:7.1f}x"
+    print(footer)
+
+    if baseline_module and finding_differences(can_validation, baseline_module, frame, args.protocol):
+        print("Findings differ from the baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
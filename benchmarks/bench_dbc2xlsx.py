@@ -0,0 +1,78 @@
+"""Benchmark DBC -> Excel row assembly on a synthetic DBC.
+
+Usage:
+    python benchmarks/bench_dbc2xlsx.py --signals 5000 --nodes 40
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cantools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dbc2xlsx import DbcRead
+
+
+def make_dbc(path: str, n_signals: int, n_nodes: int, per_message: int = 8) -> None:
+    """Write a synthetic DBC with ``n_signals`` signals spread over ``n_nodes`` ECUs."""
+    nodes = [f"ECU{idx:02d}" for idx in range(n_nodes)]
+    lines = ['VERSION ""', "", "NS_ :", "", "BS_:", "", "BU_: " + " ".join(nodes), ""]
+    attributes = []
+    for msg_idx, first in enumerate(range(0, n_signals, per_message)):
+        frame_id = 0x100 + msg_idx
+        lines.append(f"BO_ {frame_id} Msg_{msg_idx}: 8 {nodes[msg_idx % n_nodes]}")
+        for sig_idx in range(min(per_message, n_signals - first)):
+            name = f"Sig_{first + sig_idx}"
+            receivers = ",".join(
+                nodes[(first + sig_idx + k) % n_nodes] for k in range(1, 4)
+            )
+            lines.append(
+                f" SG_ {name} : {sig_idx * 8}|8@1+ (0.5,-10) [-10|117.5] "
+                f'"km/h" {receivers}'
+            )
+            attributes.append(
+                f'BA_ "GenSigSendType" SG_ {frame_id} {name} {sig_idx % 13};'
+            )
+        lines.append("")
+    lines.append('BA_DEF_ SG_ "GenSigSendType" INT 0 12;')
+    lines.append('BA_DEF_DEF_ "GenSigSendType" 0;')
+    lines.extend(attributes)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DBC -> Excel row assembly benchmark")
+    parser.add_argument("--signals", type=int, default=5000)
+    parser.add_argument("--nodes", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--write", action="store_true", help="Also time the full convert()")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dbc_path = os.path.join(tmp, "bench.dbc")
+        make_dbc(dbc_path, args.signals, args.nodes)
+        reader = DbcRead(dbc_path)
+        db = cantools.database.load_file(dbc_path)
+        ecu_nodes = [node.name for node in db.nodes]
+        non_ecu = [f"Col{idx}" for idx in range(30)]
+
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            df = reader._build_frame(db, ecu_nodes, non_ecu, non_ecu + ecu_nodes)
+            best = min(best, time.perf_counter() - start)
+        print(f"rows={len(df)} columns={len(df.columns)} build_frame best={best * 1000:.1f} ms")
+
+        if args.write:
+            start = time.perf_counter()
+            reader.convert(os.path.join(tmp, "bench.xlsx"))
+            print(f"convert total={time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
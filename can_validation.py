@@ -0,0 +1,1278 @@
+import cProfile
+import hashlib
+import io
+import marshal
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Bump when a rule changes so cached results from older rules are dropped.
+VALIDATOR_VERSION = "3"
+
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+$")
+DESCRIPTION_PATTERN = re.compile(r"^[A-Za-z0-9 ,.;:+_/-<>%()~-]+$")
+VALUE_DESCRIPTION_PATTERN = re.compile(
+    r"^(?:"
+    r"0x[0-9A-Fa-f]+(:|~0x[0-9A-Fa-f]+:)\s*"
+    r"[<>A-Za-z0-9 _+\-.,/%°()&]+"
+    r"(?:\s*[+&]\s*[<>A-Za-z0-9 _+\-.,/%°()]+)*"
+    r"(?:\n|$)"
+    r")+$"
+)
+# Full-match form of ``^[...]+$``: ``$`` also accepts one trailing newline.
+VALUE_DESCRIPTION_CHARS = re.compile(r"[A-Za-z0-9 ,.:+_/\-<>%()&~-]+\n?")
+VALUE_DESCRIPTION_SPLIT = re.compile(r"(0x[0-9A-Fa-f]+[:~]?)")
+LAST_DESCRIPTION_VALUE = r"(?:^|\n)(?:[^\n:]*~)?([^\n:~]*)(?::[^\n]*)?$"
+
+SIGNAL_SEND_TYPE_RULES = {
+    "CA": ["Cycle", "IfActiveWithRepetition"],
+    "CE": [
+        "Cycle",
+        "OnWrite",
+        "OnChange",
+        "OnWriteWithRepetition",
+        "OnChangeWithRepetition",
+    ],
+    "Cycle": ["Cycle"],
+    "Event": [
+        "OnWrite",
+        "OnChange",
+        "OnWriteWithRepetition",
+        "OnChangeWithRepetition",
+    ],
+    "IfActive": ["IfActive"],
+}
+
+BIT_LENGTH_EXPECTED = (
+    "Signal values (Max, Initial, Invalid) must not exceed 2^N - 1, "
+    "where N is the signal bit length"
+)
+
+
+@dataclass(frozen=True)
+class Finding:
+    """One rule violation, tied to processed-frame rows and a column."""
+
+    rule: str
+    error_type: str
+    name: str
+    column: str
+    rows: Tuple[int, ...]
+    details: str
+    expected: str
+    severity: str = "error"
+
+
+@dataclass(frozen=True)
+class Rule:
+    rule_id: str
+    title: str
+    success: str
+    check: Callable[["MatrixContext"], Iterable[Finding]]
+    hint: str = ""
+    canfd_only: bool = False
+    # Findings depend on rows of other messages, so revalidate() always
+    # runs the rule on the whole frame.
+    cross_row: bool = False
+
+
+RULES: Dict[str, Rule] = {}
+
+
+def rule(rule_id: str, title: str, success: str, hint: str = "", canfd_only: bool = False, cross_row: bool = False):
+    """Register a check in RULES; registration order is the tab order."""
+
+    def register(check):
+        RULES[rule_id] = Rule(rule_id, title, success, check, hint, canfd_only, cross_row)
+        return check
+
+    return register
+
+
+def _hex_to_int(value) -> int:
+    if isinstance(value, str):
+        if value.startswith(("0x", "0X")):
+            return int(value, 16)
+        return int(value)
+    return int(value)
+
+
+def _optional_int(value) -> Optional[int]:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    try:
+        return _hex_to_int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _base16(value) -> Optional[int]:
+    try:
+        return int(value, 16)
+    except (ValueError, TypeError):
+        return None
+
+
+def _flags(mask) -> np.ndarray:
+    """Plain boolean array from a mask; missing values count as False."""
+    if isinstance(mask, pd.Series):
+        mask = mask.fillna(False)
+    return np.asarray(mask, dtype=bool)
+
+
+def _is_number(series: pd.Series) -> pd.Series:
+    """Cells holding an int or float (not a string or bool)."""
+    if pd.api.types.is_bool_dtype(series):
+        return pd.Series(False, index=series.index)
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.Series(True, index=series.index)
+    return series.map(type).isin([int, float])
+
+
+def _numbers(series: pd.Series) -> pd.Series:
+    """Float view of a column; cells that are not int/float become NaN."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype(float)
+    return pd.to_numeric(series.where(_is_number(series)), errors="coerce").astype(float)
+
+
+def _map_unique(series: pd.Series, convert: Callable[[object], Optional[int]]) -> pd.Series:
+    """Apply ``convert`` once per distinct value and broadcast it back as floats.
+
+    Hex columns repeat a handful of values (0x0, 0xFF, ...) across thousands
+    of signals, so this is far cheaper than converting cell by cell.
+    """
+    table = {value: convert(value) for value in series.dropna().unique()}
+    return pd.to_numeric(series.map(table), errors="coerce").astype(float)
+
+
+def _hex_numbers(series: pd.Series) -> pd.Series:
+    """``_optional_int`` over a whole column, NaN where it gives None."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return np.trunc(series.astype(float))
+    return _map_unique(series, _optional_int)
+
+
+def _flagged(mask, *columns) -> Iterable[tuple]:
+    """Yield ``(row, *values)`` for rows where ``mask`` holds.
+
+    Values come back as Python scalars so finding details read exactly as
+    they did when the rules walked the frame row by row.
+    """
+    keep = _flags(mask)
+    index = columns[0].index[keep]
+    return zip(index, *(np.asarray(column, dtype=object)[keep].tolist() for column in columns))
+
+
+class MatrixContext:
+    """Lookups shared by every rule, built once from the processed frame.
+
+    Message-level values follow the previous ``dict(zip(...))`` semantics:
+    the last row of a message wins.  The frame itself is never modified.
+    """
+
+    def __init__(self, data_frame: pd.DataFrame, protocol: str = ""):
+        self.df = data_frame
+        self.protocol = (protocol or "").upper()
+        self.is_canfd = "CANFD" in self.protocol
+        self.named = data_frame[data_frame["Msg Name"].notna()]
+        self.messages = self.named.drop_duplicates("Msg Name", keep="last")
+
+    @cached_property
+    def message_groups(self) -> Dict[object, Tuple[int, ...]]:
+        """Rows of each message name, built on first use."""
+        groups: Dict[object, list] = {}
+        if "Msg Row" in self.df.columns:
+            # Message cells live on the header row of each message block.
+            for name, row in zip(self.named["Msg Name"], self.named["Msg Row"]):
+                if row != row:
+                    continue
+                rows = groups.setdefault(name, [])
+                if int(row) not in rows:
+                    rows.append(int(row))
+        else:
+            for name, row in zip(self.named["Msg Name"], self.named.index):
+                groups.setdefault(name, []).append(row)
+        return {name: tuple(rows) for name, rows in groups.items()}
+
+    @cached_property
+    def signal_groups(self) -> Dict[object, Tuple[int, ...]]:
+        """Rows of each signal name, built on first use."""
+        groups: Dict[object, list] = {}
+        signals = self.df["Sig Name"]
+        for name, row, present in zip(signals, self.df.index, signals.notna().to_numpy()):
+            if present:
+                groups.setdefault(name, []).append(row)
+        return {name: tuple(rows) for name, rows in groups.items()}
+
+    def message_rows(self, name) -> Tuple[int, ...]:
+        return tuple(self.message_groups.get(name, ()))
+
+
+@dataclass(frozen=True)
+class RuleStats:
+    """Wall time, frame rows in scope and findings of one rule run."""
+
+    rule_id: str
+    seconds: float
+    rows: int
+    findings: int
+
+
+def run_rule(registered: Rule, ctx) -> Tuple[List[Finding], RuleStats]:
+    """Run one rule over ``ctx`` and time it."""
+    start = time.perf_counter()
+    findings = list(registered.check(ctx))
+    elapsed = time.perf_counter() - start
+    return findings, RuleStats(registered.rule_id, elapsed, len(ctx.df), len(findings))
+
+
+@contextmanager
+def profiled(path: Optional[str]):
+    """cProfile the enclosed block and dump the stats to ``path``; no-op without a path."""
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def profile_dump(func: Callable, *args, **kwargs) -> bytes:
+    """cProfile one call of ``func``; the bytes load with pstats like a .prof file."""
+    profiler = cProfile.Profile()
+    profiler.runcall(func, *args, **kwargs)
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
+
+
+@dataclass
+class ValidationResult:
+    protocol: str
+    findings: List[Finding]
+    # Rule order for by_rule/counts; CAN rules when empty.
+    rule_ids: Tuple[str, ...] = ()
+    # Rules that do not apply to this protocol and were not run.
+    skipped: Tuple[str, ...] = ()
+    # Timing of every rule that ran, in run order.
+    stats: Dict[str, RuleStats] = field(default_factory=dict, compare=False)
+    by_rule: Dict[str, List[Finding]] = field(init=False)
+
+    def __post_init__(self):
+        self.by_rule = {rule_id: [] for rule_id in self.rule_ids or RULES}
+        for finding in self.findings:
+            self.by_rule.setdefault(finding.rule, []).append(finding)
+
+    def counts(self) -> Dict[str, int]:
+        return {rule_id: len(items) for rule_id, items in self.by_rule.items()}
+
+    def reportable(self) -> List[Finding]:
+        """Findings that belong in the highlighted export."""
+        return [f for f in self.findings if f.severity != "info"]
+
+    def errors(self) -> List[Finding]:
+        return [f for f in self.findings if f.severity == "error"]
+
+    def __bool__(self) -> bool:
+        return bool(self.findings)
+
+    def total_seconds(self) -> float:
+        return sum(stat.seconds for stat in self.stats.values())
+
+    def performance(self, rules: Dict[str, Rule]) -> List[Tuple[str, float, int, int]]:
+        """(rule title, wall time in ms, rows scanned, findings) of every rule that ran."""
+        return [
+            (rules[stat.rule_id].title, stat.seconds * 1000, stat.rows, stat.findings)
+            for stat in self.stats.values()
+        ]
+
+
+def validate_matrix(data_frame: pd.DataFrame, protocol: str = "") -> ValidationResult:
+    """Run every registered rule once over ``data_frame``."""
+    ctx = MatrixContext(data_frame, protocol)
+    findings = []
+    skipped = []
+    stats = {}
+    for registered in RULES.values():
+        if registered.canfd_only and not ctx.is_canfd:
+            skipped.append(registered.rule_id)
+            continue
+        found, stats[registered.rule_id] = run_rule(registered, ctx)
+        findings.extend(found)
+    return ValidationResult(ctx.protocol, findings, tuple(RULES), tuple(skipped), stats)
+
+
+def get_file_info(file_name: str):
+    file_start = "ATOM_CAN_Matrix_"
+    file_start1 = "ATOM_CANFD_Matrix_"
+    file_name_only = os.path.splitext(os.path.basename(file_name))[0]
+    if file_name_only.startswith(file_start1):
+        protocol = "CANFD"
+    elif file_name_only.startswith(file_start):
+        protocol = "CAN"
+    else:
+        return None
+    start_index = file_name_only.find(file_start1)
+    if start_index != -1:
+        parts = file_name_only[start_index + len(file_start1) :].split("_")
+    else:
+        parts = file_name_only[len(file_start) :].split("_")
+    domain_name = parts.pop(0)
+    version_string = parts.pop(0)
+    if version_string.startswith("V"):
+        version = version_string[1:]
+        versions = version.split(".")
+        if len(versions) != 3:
+            return None
+    else:
+        version = ""
+    file_date = parts.pop(0)
+    if len(parts) > 0:
+        if parts[0] == "internal":
+            parts.pop(0)
+        device_name = "_".join(parts)
+    else:
+        device_name = ""
+
+    return {
+        "version": version,
+        "date": file_date,
+        "device_name": device_name,
+        "domain_name": domain_name,
+        "protocol": protocol,
+    }
+
+
+def load_xlsx(file_path) -> Union[pd.DataFrame, Dict]:
+    """Matrix sheet of a path or file-like upload; a list gives {name: frame}."""
+    try:
+        if isinstance(file_path, list):
+            finally_df = {}
+            for file in file_path:
+                data_frame = pd.read_excel(
+                    file, sheet_name="Matrix", keep_default_na=True, engine="openpyxl"
+                )
+                name = getattr(file, "name", None)
+                finally_df[name if name is not None else file.split("\\")[-1]] = data_frame
+            return finally_df
+        return pd.read_excel(
+            file_path, sheet_name="Matrix", keep_default_na=True, engine="openpyxl"
+        )
+    except Exception as e:
+        return f"Undefined type of file: {e}"
+
+
+def create_correct_df(df: pd.DataFrame) -> pd.DataFrame:
+    bus_users = [
+        col
+        for col in df.columns
+        if any(val in ["S", "R"] for val in df[col].dropna().unique())
+        and col != "Unit\n单位"
+    ]
+    senders = []
+    receivers = []
+
+    for _, row in df.iterrows():
+        row_senders = []
+        row_receivers = []
+
+        for bus_user in bus_users:
+            if bus_user in df.columns:
+                if pd.notna(row[bus_user]) and row[bus_user] == "S":
+                    row_senders.append(bus_user)
+                elif pd.notna(row[bus_user]) and row[bus_user] == "R":
+                    row_receivers.append(bus_user)
+
+        senders.append(",".join(row_senders) if row_senders else "Vector__XXX")
+        receivers.append(",".join(row_receivers) if row_receivers else "Vector__XXX")
+
+    new_df_data = {
+        "Msg Row": df.index.to_series().where(df["Msg Name\n报文名称"].notna()).ffill(),
+        "Msg ID": df["Msg ID\n报文标识符"].ffill(),
+        "Msg Name": df["Msg Name\n报文名称"].ffill(),
+        "Cycle Type": df["Msg Cycle Time (ms)\n报文周期时间"].ffill(),
+        "Msg Time Fast": df["Msg Cycle Time Fast(ms)\n报文发送的快速周期"].ffill(),
+        "Msg Reption": df["Msg Nr. Of Reption\n报文快速发送的次数"].ffill(),
+        "Msg Delay": df["Msg Delay Time(ms)\n报文延时时间"].ffill(),
+        "Msg Type": df["Msg Type\n报文类型"].ffill(),
+        "Send Type": df["Msg Send Type\n报文发送类型"].ffill(),
+        "Msg Length": df["Msg Length (Byte)\n报文长度"].ffill(),
+        "Sig Name": df["Signal Name\n信号名称"],
+        "Start Byte": df["Start Byte\n起始字节"],
+        "Start Bit": df["Start Bit\n起始位"],
+        "Length": df["Bit Length (Bit)\n信号长度"],
+        "Resolution": df["Resolution\n精度"],
+        "Offset": df["Offset\n偏移量"],
+        "Initinal": df["Initial Value (Hex)\n初始值"],
+        "Invalid": df["Invalid Value(Hex)\n无效值"],
+        "Min": df["Signal Min. Value (phys)\n物理最小值"],
+        "Min Hex": df["Signal Min. Value (Hex)\n总线最小值"],
+        "Max": df["Signal Max. Value (phys)\n物理最大值"],
+        "Max Hex": df["Signal Max. Value (Hex)\n总线最大值"],
+        "Unit": df["Unit\n单位"],
+        "Receiver": receivers,
+        "Byte Order": df["Byte Order\n排列格式(Intel/Motorola)"],
+        "Data Type": df["Data Type\n数据类型"],
+        "Description": df["Signal Description\n信号描述"],
+        "Signal Value Description": df["Signal Value Description\n信号值描述"],
+        "Senders": senders,
+        "Signal Send Type": df["Signal Send Type\n信号发送类型"],
+        "Inactive value": df["Inactive Value (Hex)\n非使能值"],
+    }
+
+    if "BRS\n传输速率切换标识位" in df.columns:
+        new_df_data["BRS"] = df["BRS\n传输速率切换标识位"].ffill()
+    else:
+        new_df_data["BRS"] = None
+
+    if "Frame Format\n帧格式" in df.columns:
+        new_df_data["Frame Format"] = df["Frame Format\n帧格式"].ffill()
+    else:
+        new_df_data["Frame Format"] = None
+
+    new_df = pd.DataFrame(new_df_data)
+
+    new_df["Unit"] = new_df["Unit"].astype(str)
+    new_df["Unit"] = new_df["Unit"].str.replace("Ω", "Ohm", regex=False)
+    new_df["Unit"] = new_df["Unit"].str.replace("℃", "degC", regex=False)
+
+    new_df = new_df.dropna(subset=["Sig Name"])
+    new_df["Is Signed"] = new_df["Data Type"].str.contains("Signed", na=False)
+
+    return new_df
+
+
+def _load_processed(source, file_name: Optional[str] = None) -> Tuple[pd.DataFrame, str]:
+    """Processed frame of one matrix and the protocol read from its file name."""
+    data_frame = load_xlsx(source)
+    if isinstance(data_frame, str):
+        raise ValueError(data_frame)
+    file_attr = get_file_info(file_name or getattr(source, "name", None) or str(source))
+    protocol = file_attr["protocol"] if file_attr else ""
+    return create_correct_df(data_frame), protocol
+
+
+def validate_file(source, file_name: Optional[str] = None) -> ValidationResult:
+    """Load, process and validate one CAN matrix without Streamlit.
+
+    The protocol comes from ``file_name``, which defaults to the path itself
+    or the ``name`` of a file-like upload.
+    """
+    return validate_matrix(*_load_processed(source, file_name))
+
+
+def _validate_source(
+    file_name: str, source: Union[str, bytes]
+) -> Tuple[Union[ValidationResult, str], Optional[pd.DataFrame]]:
+    """Findings and message layouts of one matrix, or its error message."""
+    try:
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        processed_df, protocol = _load_processed(source, file_name)
+        return validate_matrix(processed_df, protocol), message_layouts(processed_df)
+    except Exception as e:
+        return str(e), None
+
+
+def _validate_sources(sources: Dict[str, Union[str, bytes]], workers: Optional[int] = None) -> Dict[str, tuple]:
+    if len(sources) <= 1:
+        return {name: _validate_source(name, source) for name, source in sources.items()}
+    workers = min(len(sources), workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(_validate_source, name, source) for name, source in sources.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def validate_files(
+    sources: Dict[str, Union[str, bytes]], workers: Optional[int] = None
+) -> Dict[str, Union[ValidationResult, str]]:
+    """Validate a set of matrices, each file in its own worker process.
+
+    ``sources`` maps file names to paths or raw file bytes.  Results keep the
+    input order; a matrix that cannot be validated maps to its error message.
+    The whole set takes about as long as its slowest file.
+    """
+    return {name: result for name, (result, _) in _validate_sources(sources, workers).items()}
+
+
+def validate_domain(
+    sources: Dict[str, Union[str, bytes]], workers: Optional[int] = None
+) -> Tuple[Dict[str, Union[ValidationResult, str]], List["LayoutMismatch"]]:
+    """validate_files() plus check_consistency() over the same worker run.
+
+    Workers send back the small per-message layout tables, so no matrix is
+    parsed twice.
+    """
+    runs = _validate_sources(sources, workers)
+    layouts = {name: layout for name, (_, layout) in runs.items() if layout is not None}
+    return {name: result for name, (result, _) in runs.items()}, check_consistency(layouts)
+
+
+# Message columns compared across matrices, and the signal columns that make
+# up a message's signal layout.
+LAYOUT_FIELDS = {"ID": "Msg ID", "Length": "Msg Length", "Cycle Time": "Cycle Type"}
+SIGNAL_LAYOUT_COLUMNS = ["Sig Name", "Start Bit", "Length", "Byte Order"]
+
+
+@dataclass(frozen=True)
+class LayoutMismatch:
+    """A message shared by two matrices whose layouts differ."""
+
+    message: str
+    file: str
+    other_file: str
+    fields: Tuple[str, ...]
+    details: str
+
+
+def _number_text(value: float, hex_values: bool) -> str:
+    if hex_values:
+        return f"0x{int(value):X}"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _layout_text(series: pd.Series, hex_values: bool = False) -> List[str]:
+    """Comparable cell texts: 8, 8.0 and " 8 " read the same, as do 0x1A and 26 for hex columns."""
+    numbers = _hex_numbers(series) if hex_values else pd.to_numeric(series, errors="coerce")
+    texts = series.astype(object).where(series.notna(), "").tolist()
+    table = {value: _number_text(value, hex_values) for value in numbers.dropna().unique().tolist()}
+    return [
+        table[number] if number == number else str(text).strip()
+        for number, text in zip(numbers.astype(float).tolist(), texts)
+    ]
+
+
+def message_layouts(data_frame: pd.DataFrame) -> pd.DataFrame:
+    """One row per message with its comparable ID, length, cycle time and signals.
+
+    ``Signals`` lists one "name|start bit|length|byte order" line per signal,
+    sorted, and ``Layout Hash`` covers all fields so matrices can be joined on
+    one column.
+    """
+    named = data_frame[data_frame["Msg Name"].notna()]
+    messages = named.drop_duplicates("Msg Name", keep="last")
+    layout = pd.DataFrame({"Msg Name": [str(name).strip() for name in messages["Msg Name"]]}, dtype=object)
+    for label, column in LAYOUT_FIELDS.items():
+        layout[label] = pd.Series(_layout_text(messages[column], hex_values=label == "ID"), dtype=object)
+
+    signals: Dict[object, list] = {}
+    columns = [_layout_text(named[column]) for column in SIGNAL_LAYOUT_COLUMNS]
+    for name, *values in zip(named["Msg Name"], *columns):
+        signals.setdefault(name, []).append("|".join(values))
+    layout["Signals"] = pd.Series(
+        ["\n".join(sorted(signals.get(name, ()))) for name in messages["Msg Name"]], dtype=object
+    )
+
+    fields = zip(*(layout[column] for column in list(LAYOUT_FIELDS) + ["Signals"]))
+    layout["Layout Hash"] = [hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest() for values in fields]
+    return layout
+
+
+def _signal_differences(signals: str, other_signals: str, file: str, other_file: str) -> str:
+    lines, other_lines = set(signals.splitlines()), set(other_signals.splitlines())
+    parts = []
+    for only, name in ((lines - other_lines, file), (other_lines - lines, other_file)):
+        if only:
+            parts.append(f"only in {name}: " + ", ".join(sorted(only)))
+    return "Signals (name|start bit|length|byte order) " + "; ".join(parts)
+
+
+def check_consistency(layouts: Dict[str, pd.DataFrame]) -> List[LayoutMismatch]:
+    """Mismatching pairs of messages shared between matrices, joined on message name.
+
+    ``layouts`` maps file names to message_layouts() tables.  Names whose
+    layout hashes agree in every matrix are dropped by one group-by over all
+    messages, so only the few differing messages are compared field by field.
+    """
+    tables = [layout.assign(File=name) for name, layout in layouts.items() if not layout.empty]
+    if not tables:
+        return []
+    table = pd.concat(tables, ignore_index=True)
+    differing = table.groupby("Msg Name")["Layout Hash"].transform("nunique") > 1
+
+    mismatches = []
+    for message, group in table[differing].groupby("Msg Name", sort=False):
+        records = group.to_dict("records")
+        for position, record in enumerate(records):
+            for other in records[position + 1:]:
+                if record["Layout Hash"] == other["Layout Hash"]:
+                    continue
+                fields = tuple(label for label in LAYOUT_FIELDS if record[label] != other[label])
+                details = [f"{label}: {record[label]} vs {other[label]}" for label in fields]
+                if record["Signals"] != other["Signals"]:
+                    fields += ("Signals",)
+                    details.append(
+                        _signal_differences(record["Signals"], other["Signals"], record["File"], other["File"])
+                    )
+                mismatches.append(
+                    LayoutMismatch(message, record["File"], other["File"], fields, "; ".join(details))
+                )
+    return mismatches
+
+
+@dataclass
+class MessageState:
+    """Fingerprint, row layout and row-local findings of one message."""
+
+    fingerprint: str
+    positions: Tuple[int, ...]
+    findings: List[Finding] = field(default_factory=list)
+
+
+@dataclass
+class ValidationBaseline:
+    """Per-message state revalidate() keeps for the next upload of a matrix."""
+
+    protocol: str
+    validator_version: str
+    messages: Dict[object, MessageState]
+
+
+@dataclass
+class FindingChanges:
+    new: List[Finding]
+    unchanged: List[Finding]
+    fixed: List[Finding]
+
+
+def matrix_lineage(file_name: str) -> str:
+    """Uploads of the same matrix share a lineage: same domain and device."""
+    file_attr = get_file_info(file_name)
+    if not file_attr:
+        return os.path.splitext(os.path.basename(file_name))[0]
+    return f"{file_attr['domain_name']}_{file_attr['device_name']}"
+
+
+def message_states(data_frame: pd.DataFrame) -> Dict[object, MessageState]:
+    """Fingerprint every message (all rows sharing a Msg Name) of a processed frame.
+
+    The fingerprint covers the cell values and the row layout relative to the
+    message's first row, so a message moved by rows inserted elsewhere keeps
+    its fingerprint.  Rows without a Msg Name form the ``None`` message.
+    """
+    if data_frame.empty:
+        return {}
+    codes, names = pd.factorize(data_frame["Msg Name"])
+    content = data_frame.drop(columns=["Msg Row"], errors="ignore").astype(object)
+    row_hashes = pd.util.hash_pandas_object(content, index=False).to_numpy().view(np.int64)
+    labels = data_frame.index.to_numpy(dtype=np.int64)
+    if "Msg Row" in data_frame.columns:
+        anchors = data_frame["Msg Row"].to_numpy(dtype=float)
+    else:
+        anchors = np.full(len(data_frame), np.nan)
+
+    # Rows grouped by message, keeping frame order inside each message.
+    order = np.argsort(codes, kind="stable")
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(codes[order])) + 1))
+    ends = np.append(starts[1:], len(order))
+    labels, anchors, codes = labels[order], anchors[order], codes[order]
+    has_anchor = ~np.isnan(anchors)
+    anchor_rows = np.where(has_anchor, anchors, np.inf)
+    first = np.minimum(
+        np.minimum.reduceat(labels, starts), np.minimum.reduceat(anchor_rows, starts)
+    ).astype(np.int64)
+    first = np.repeat(first, ends - starts)
+    records = np.column_stack(
+        (row_hashes[order], labels - first, np.where(has_anchor, anchor_rows - first, -1).astype(np.int64))
+    )
+
+    label_list = labels.tolist()
+    anchor_list = np.where(has_anchor, anchors, -1).astype(np.int64).tolist()
+    states = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        layout = set(label_list[start:end])
+        layout.update(row for row in anchor_list[start:end] if row >= 0)
+        code = codes[start]
+        states[names[code] if code >= 0 else None] = MessageState(
+            hashlib.sha1(records[start:end].tobytes()).hexdigest(), tuple(sorted(layout))
+        )
+    return states
+
+
+def revalidate(
+    data_frame: pd.DataFrame, protocol: str = "", baseline: Optional[ValidationBaseline] = None
+) -> Tuple[ValidationResult, ValidationBaseline]:
+    """Validate ``data_frame``, re-running row-local rules only on changed messages.
+
+    Messages whose fingerprint matches ``baseline`` reuse its findings, moved
+    to their new rows; cross-row rules run on the whole frame.  Without a
+    usable baseline this is a full validate_matrix run.
+    """
+    full_ctx = MatrixContext(data_frame, protocol)
+    states = message_states(data_frame)
+    previous = {}
+    if (
+        baseline is not None
+        and baseline.protocol == full_ctx.protocol
+        and baseline.validator_version == VALIDATOR_VERSION
+    ):
+        previous = baseline.messages
+    reused = {
+        key for key, state in states.items()
+        if key in previous and previous[key].fingerprint == state.fingerprint
+    }
+
+    changed = [key for key in states if key not in reused]
+    owner = {position: key for key in changed for position in states[key].positions}
+    changed_ctx = MatrixContext(data_frame[data_frame.index.isin(list(owner))], protocol)
+
+    cross_row = {}
+    skipped = []
+    stats = {}
+    for registered in RULES.values():
+        if registered.canfd_only and not full_ctx.is_canfd:
+            skipped.append(registered.rule_id)
+        elif registered.cross_row:
+            cross_row[registered.rule_id], stats[registered.rule_id] = run_rule(registered, full_ctx)
+        else:
+            found, stats[registered.rule_id] = run_rule(registered, changed_ctx)
+            for finding in found:
+                key = owner[finding.rows[0]] if finding.rows else finding.name
+                states[key].findings.append(finding)
+
+    for key in reused:
+        old, new = previous[key], states[key]
+        if old.positions == new.positions:
+            new.findings = old.findings
+            continue
+        moved = dict(zip(old.positions, new.positions))
+        new.findings = [
+            Finding(f.rule, f.error_type, f.name, f.column, tuple(moved[row] for row in f.rows),
+                    f.details, f.expected, f.severity)
+            for f in old.findings
+        ]
+
+    local: Dict[str, List[Finding]] = {}
+    for state in states.values():
+        for finding in state.findings:
+            local.setdefault(finding.rule, []).append(finding)
+    findings = []
+    for rule_id in RULES:
+        if rule_id in cross_row:
+            findings.extend(cross_row[rule_id])
+        else:
+            findings.extend(sorted(local.get(rule_id, ()), key=lambda f: f.rows[:1]))
+
+    result = ValidationResult(full_ctx.protocol, findings, tuple(RULES), tuple(skipped), stats)
+    return result, ValidationBaseline(full_ctx.protocol, VALIDATOR_VERSION, states)
+
+
+def _finding_key(finding: Finding) -> tuple:
+    return (finding.rule, finding.error_type, finding.name, finding.column,
+            finding.details, finding.expected, finding.severity)
+
+
+def compare_findings(previous: ValidationResult, current: ValidationResult) -> FindingChanges:
+    """Split findings into new, unchanged and fixed ones.
+
+    Rows are left out of the match so findings that only moved count as
+    unchanged.
+    """
+    remaining = Counter(_finding_key(finding) for finding in previous.findings)
+    new, unchanged = [], []
+    for finding in current.findings:
+        key = _finding_key(finding)
+        if remaining[key]:
+            remaining[key] -= 1
+            unchanged.append(finding)
+        else:
+            new.append(finding)
+    fixed = []
+    for finding in previous.findings:
+        key = _finding_key(finding)
+        if remaining[key]:
+            remaining[key] -= 1
+            fixed.append(finding)
+    return FindingChanges(new, unchanged, fixed)
+
+
+def _name_findings(rule_id: str, kind: str, column: str, groups, shorten: bool):
+    keys = list(groups)
+    series = pd.Series(keys, dtype=object).astype(str)
+    invalid = ~_flags(series.str.strip().str.fullmatch(NAME_PATTERN.pattern))
+    length = series.str.len()
+    too_long = _flags(length > 64)
+    needs_shortening = _flags((length > 36) & (length < 64)) if shorten else np.zeros(len(keys), dtype=bool)
+
+    # Group keys that read the same once stringified; only flagged names
+    # need their rows collected.
+    flagged: Dict[str, list] = {}
+    texts = series.tolist()
+    for position in np.flatnonzero(invalid | too_long | needs_shortening):
+        name = texts[position]
+        entry = flagged.setdefault(name, [position, ()])
+        entry[1] += tuple(groups[keys[position]])
+
+    findings = []
+    for name, (position, rows) in flagged.items():
+        if invalid[position]:
+            findings.append(
+                Finding(rule_id, f"Invalid {kind} Name", name, column, rows,
+                        "Contains prohibited characters", "Only A-Z, a-z, 0-9, _, - allowed")
+            )
+        if too_long[position]:
+            findings.append(
+                Finding(rule_id, f"Too Long {kind} Name", name, column, rows,
+                        f"Length: {len(name)} characters", "Max 64 characters", "warning")
+            )
+        if needs_shortening[position]:
+            findings.append(
+                Finding(rule_id, f"{kind} Name Needs Shortening", name, column, rows,
+                        f"Length: {len(name)} characters", "Recommended max 36 characters", "warning")
+            )
+    return findings
+
+
+@rule("message_name", "Message Names", "All message titles are correct!",
+      hint="Allowed characters: A-Z, a-z, 0-9, _, -", cross_row=True)
+def check_message_name(ctx: MatrixContext) -> List[Finding]:
+    return _name_findings("message_name", "Message", "Msg Name", ctx.message_groups, shorten=False)
+
+
+@rule("message_type", "Message Types", "All message types are correct!",
+      hint="NM, if Msg Name first 3 characters = 'NM_' and Diag, if Msg Name firsts 4 characters = 'Diag'")
+def check_message_type(ctx: MatrixContext) -> List[Finding]:
+    names = ctx.messages["Msg Name"]
+    mtypes = ctx.messages["Msg Type"]
+    text = names.astype(str)
+    invalid = ~mtypes.isin(["Normal", "Diag", "NM"])
+    diag = _flags(text.str.startswith("Diag")) & mtypes.ne("Diag")
+    nm = _flags(text.str.startswith("NM_")) & mtypes.ne("NM")
+    findings = []
+    for _, name, mtype, bad, not_diag, not_nm in _flagged(invalid | diag | nm, names, mtypes, invalid, diag, nm):
+        rows = ctx.message_rows(name)
+        if bad:
+            findings.append(
+                Finding("message_type", "Invalid Message Type", name, "Msg Type", rows,
+                        f"Type: {mtype}", "Must be Normal, Diag or NM")
+            )
+        if not_diag:
+            findings.append(
+                Finding("message_type", "Message Name-Type Mismatch", name, "Msg Type", rows,
+                        f"Type: {mtype}", "Should be Diag for messages starting with 'Diag'")
+            )
+        if not_nm:
+            findings.append(
+                Finding("message_type", "Message Name-Type Mismatch", name, "Msg Type", rows,
+                        f"Type: {mtype}", "Should be NM for messages starting with 'NM_'")
+            )
+    return findings
+
+
+@rule("message_id", "Messages IDs", "All message IDs are correct!",
+      hint="Diag if Message ID is in the range 0x700 to 7FF and NM if Message ID is in the range 0x500 to 5FF")
+def check_message_id(ctx: MatrixContext) -> List[Finding]:
+    raw_ids = ctx.messages["Msg ID"]
+    mtypes = ctx.messages["Msg Type"]
+    ids = _hex_numbers(raw_ids)
+    missing = ids.isna()
+    out_of_range = ~missing & ~ids.between(0x001, 0x7FF)
+    diag = ids.between(0x700, 0x7FF) & mtypes.ne("Diag")
+    nm = ids.between(0x500, 0x5FF) & mtypes.ne("NM")
+    findings = []
+    for _, name, raw_id, mid, mtype, unparsable, outside, not_diag, not_nm in _flagged(
+        missing | out_of_range | diag | nm,
+        ctx.messages["Msg Name"], raw_ids, ids, mtypes, missing, out_of_range, diag, nm,
+    ):
+        rows = ctx.message_rows(name)
+        if unparsable:
+            findings.append(
+                Finding("message_id", "Invalid Message ID", name, "Msg ID", rows,
+                        f"ID: {raw_id}", "Must be between 0x001 and 0x7FF")
+            )
+            continue
+        mid = int(mid)
+        if outside:
+            findings.append(
+                Finding("message_id", "Invalid Message ID", name, "Msg ID", rows,
+                        f"ID: {hex(mid)}", "Must be between 0x001 and 0x7FF")
+            )
+        if not_diag:
+            findings.append(
+                Finding("message_id", "Message ID-Type Mismatch", name, "Msg ID", rows,
+                        f"ID: {hex(mid)}, Type: {mtype}", "IDs 0x700-0x7FF should be Diag type")
+            )
+        if not_nm:
+            findings.append(
+                Finding("message_id", "Message ID-Type Mismatch", name, "Msg ID", rows,
+                        f"ID: {hex(mid)}, Type: {mtype}", "IDs 0x500-0x5FF should be NM type")
+            )
+    return findings
+
+
+@rule("message_send_type", "Messages Send Type", "All messages send types are correct!",
+      hint="Send Type should be 'Cycle', 'Event' or 'CE'")
+def check_message_send_type(ctx: MatrixContext) -> List[Finding]:
+    send_types = ctx.messages["Send Type"]
+    return [
+        Finding("message_send_type", "Invalid Send Type", name, "Send Type", ctx.message_rows(name),
+                f"Send Type: {stype}", "Must be Cycle, Event or CE")
+        for _, name, stype in _flagged(
+            ~send_types.isin(["Cycle", "Event", "CE"]), ctx.messages["Msg Name"], send_types
+        )
+    ]
+
+
+@rule("message_frame_format", "Messages Frame Format", "All messages frame formats are correct!",
+      hint="Frame format should be 'StandardCAN_FD' or 'StandardCAN'", canfd_only=True)
+def check_message_frame_format(ctx: MatrixContext) -> List[Finding]:
+    frame_formats = ctx.messages["Frame Format"]
+    return [
+        Finding("message_frame_format", "Invalid Frame Format", name, "Frame Format",
+                ctx.message_rows(name), f"Frame Format: {ff}", "Must be StandardCAN_FD or StandardCAN")
+        for _, name, ff in _flagged(
+            ~frame_formats.isin(["StandardCAN_FD", "StandardCAN"]), ctx.messages["Msg Name"], frame_formats
+        )
+    ]
+
+
+@rule("message_brs", "Messages BRS", "All BRS values are correct!",
+      hint="BRS=0 should be with StandardCAN, BRS=1 should be with StandardCAN_FD", canfd_only=True)
+def check_message_brs(ctx: MatrixContext) -> List[Finding]:
+    raw_brs = ctx.messages["BRS"]
+    frame_formats = ctx.messages["Frame Format"]
+    brs = _numbers(raw_brs)
+    invalid = ~brs.isin([0, 1])
+    brs_off = brs.eq(0) & frame_formats.ne("StandardCAN")
+    brs_on = brs.eq(1) & frame_formats.ne("StandardCAN_FD")
+    findings = []
+    for _, name, value, ff, bad, off_mismatch, on_mismatch in _flagged(
+        invalid | brs_off | brs_on, ctx.messages["Msg Name"], raw_brs, frame_formats, invalid, brs_off, brs_on
+    ):
+        rows = ctx.message_rows(name)
+        if bad:
+            findings.append(
+                Finding("message_brs", "Invalid BRS Value", name, "BRS", rows,
+                        f"BRS: {value}", "Must be 0 or 1")
+            )
+        if off_mismatch:
+            findings.append(
+                Finding("message_brs", "BRS-Frame Format Mismatch", name, "BRS", rows,
+                        f"BRS: {value}, Frame Format: {ff}", "BRS=0 should be with StandardCAN")
+            )
+        if on_mismatch:
+            findings.append(
+                Finding("message_brs", "BRS-Frame Format Mismatch", name, "BRS", rows,
+                        f"BRS: {value}, Frame Format: {ff}", "BRS=1 should be with StandardCAN_FD")
+            )
+    return findings
+
+
+@rule("message_length", "Messages Lenght", "All messages length are correct!",
+      hint="For CAN FD messages: StandardCAN_FD length must be 8 or 64 bytes, StandardCAN length must be 8 bytes")
+def check_message_length(ctx: MatrixContext) -> List[Finding]:
+    raw_lengths = ctx.messages["Msg Length"]
+    lengths = _numbers(raw_lengths)
+    names = ctx.messages["Msg Name"]
+    if not ctx.is_canfd:
+        return [
+            Finding("message_length", "Invalid Message Length", name, "Msg Length",
+                    ctx.message_rows(name), f"Length: {length}", "For CAN length must be 8")
+            for _, name, length in _flagged(~lengths.eq(8), names, raw_lengths)
+        ]
+
+    frame_formats = ctx.messages["Frame Format"]
+    is_fd = frame_formats.eq("StandardCAN_FD")
+    is_can = frame_formats.eq("StandardCAN")
+    invalid = (is_fd & ~lengths.isin([8, 64])) | (is_can & ~lengths.eq(8)) | ~(is_fd | is_can)
+    findings = []
+    for _, name, length, ff in _flagged(invalid, names, raw_lengths, frame_formats):
+        if ff == "StandardCAN_FD":
+            expected = "For StandardCAN_FD length must be 8 or 64"
+        elif ff == "StandardCAN":
+            expected = "For StandardCAN length must be 8"
+        else:
+            expected = "Frame Format must be StandardCAN_FD or StandardCAN"
+        findings.append(
+            Finding("message_length", "Invalid Message Length", name, "Msg Length",
+                    ctx.message_rows(name), f"Length: {length}, Frame Format: {ff}", expected)
+        )
+    return findings
+
+
+@rule("signal_name", "Signal Name", "All signals titles are correct!",
+      hint="Allowed characters: A-Z, a-z, 0-9, _, -. Please, try to make the Signal name shorter", cross_row=True)
+def check_signal_name(ctx: MatrixContext) -> List[Finding]:
+    return _name_findings("signal_name", "Signal", "Sig Name", ctx.signal_groups, shorten=True)
+
+
+@rule("signal_value_description", "Signal Value Description", "All Signal Values Description are correct!",
+      hint=(
+          "Allowed format examples:\n"
+          "0x0: No Error\n"
+          "0x0: <50% Alarm 0x1: <10% Alarm\n"
+          "0x0~0x3: Reserved\n"
+          "0x0: AC Plug&DC Plug Connected"
+      ))
+def check_signal_value_description(ctx: MatrixContext) -> List[Finding]:
+    values = ctx.df["Signal Value Description"]
+    missing = values.isna()
+    text = values.astype(object).where(~missing).astype(str).str.strip()
+
+    # The text between the 0x.. tokens must use the allowed characters only;
+    # blank pieces are ignored.  Pieces are exploded to one row each and
+    # folded back per cell.
+    pieces = text[~missing].str.replace(VALUE_DESCRIPTION_SPLIT.pattern, "\x00", regex=True)
+    pieces = pieces.str.split("\x00").explode().astype(str)
+    piece_ok = _flags(pieces.str.strip().eq("")) | _flags(pieces.str.fullmatch(VALUE_DESCRIPTION_CHARS.pattern))
+    bad_chars = ~pd.Series(piece_ok, index=pieces.index).groupby(level=0).all()
+    bad_chars = bad_chars.reindex(values.index, fill_value=False)
+    bad_format = ~missing & ~bad_chars & ~_flags(text.str.fullmatch(VALUE_DESCRIPTION_PATTERN.pattern))
+
+    findings = []
+    for row, sig_name, str_val, empty, invalid_chars in _flagged(
+        missing | bad_chars | bad_format, ctx.df["Sig Name"], text, missing, bad_chars
+    ):
+        if empty:
+            findings.append(
+                Finding("signal_value_description", "Missing Signal Value Description", sig_name,
+                        "Signal Value Description", (row,), "Value is empty",
+                        "Signal value description is required")
+            )
+        elif invalid_chars:
+            findings.append(
+                Finding("signal_value_description", "Invalid Characters in Signal Value Description",
+                        sig_name, "Signal Value Description", (row,), f"Value: {str_val}",
+                        "Allowed characters are: A-Z, a-z, 0-9, spaces and ,.:+_/-<>%()~&")
+            )
+        else:
+            findings.append(
+                Finding("signal_value_description", "Invalid Signal Value Description", sig_name,
+                        "Signal Value Description", (row,), f"Value: {str_val}",
+                        "Must match pattern like '0x0: No Error' or '0x0~0x3: Reserved'")
+            )
+    return findings
+
+
+@rule("signal_description", "Signal Description", "All Signal Description are correct!",
+      hint="Allowed characters: A-Z, a-z, 0-9, spaces, commas, periods, and semicolons")
+def check_signal_description(ctx: MatrixContext) -> List[Finding]:
+    values = ctx.df["Description"]
+    missing = values.isna()
+    text = values.astype(object).where(~missing).astype(str)
+    invalid = ~missing & ~_flags(text.str.fullmatch(DESCRIPTION_PATTERN.pattern))
+    findings = []
+    for row, sig_name, str_val, empty in _flagged(missing | invalid, ctx.df["Sig Name"], text, missing):
+        if empty:
+            findings.append(
+                Finding("signal_description", "Missing Signal Description", sig_name, "Description",
+                        (row,), "Value is empty", "Signal description is required", "info")
+            )
+        else:
+            findings.append(
+                Finding("signal_description", "Invalid Signal Description", sig_name, "Description",
+                        (row,), f"Value: {str_val}", "Contains invalid characters")
+            )
+    return findings
+
+
+@rule("byte_order", "Byte Order", "All Signal Byte Orders are correct!",
+      hint="Byte Order in valid value 'Motorola MSB'")
+def check_byte_order(ctx: MatrixContext) -> List[Finding]:
+    byte_order = ctx.df["Byte Order"]
+    return [
+        Finding("byte_order", "Invalid Byte Order", sig_name, "Byte Order", (row,),
+                f"Byte Order: {byte}", "Must be 'Motorola MSB'")
+        for row, sig_name, byte in _flagged(byte_order.ne("Motorola MSB"), ctx.df["Sig Name"], byte_order)
+    ]
+
+
+def _out_of_range(series: pd.Series, low: int, high: int) -> pd.Series:
+    """Cells that are not a whole number in ``low..high``."""
+    values = _numbers(series)
+    return ~(values.between(low, high) & values.mod(1).eq(0))
+
+
+@rule("start_byte", "Start Byte", "All Start Byte are correct!",
+      hint="Start Byte is only a number, in the range from 0 to 7")
+def check_start_byte(ctx: MatrixContext) -> List[Finding]:
+    start_byte = ctx.df["Start Byte"]
+    return [
+        Finding("start_byte", "Invalid Start Byte", sig_name, "Start Byte", (row,),
+                f"Start Byte: {byte}", "Must be between 0 and 7")
+        for row, sig_name, byte in _flagged(_out_of_range(start_byte, 0, 7), ctx.df["Sig Name"], start_byte)
+    ]
+
+
+@rule("start_bit", "Start Bit", "All Start Bit are correct!",
+      hint="Start Bit is only a number, in the range from 0 to 63")
+def check_start_bit(ctx: MatrixContext) -> List[Finding]:
+    start_bit = ctx.df["Start Bit"]
+    return [
+        Finding("start_bit", "Invalid Start Bit", sig_name, "Start Bit", (row,),
+                f"Start Bit: {bit}", "Must be between 0 and 63")
+        for row, sig_name, bit in _flagged(_out_of_range(start_bit, 0, 63), ctx.df["Sig Name"], start_bit)
+    ]
+
+
+@rule("signal_send_type", "Signal Send Type", "All Signal Send Types are correct!",
+      hint="\n".join(
+          f"- If Msg Send Type == '{msg_type}': Signal Send Type must be in {allowed}"
+          for msg_type, allowed in SIGNAL_SEND_TYPE_RULES.items()
+      ))
+def check_signal_send_type(ctx: MatrixContext) -> List[Finding]:
+    sig_types = ctx.df["Signal Send Type"]
+    msg_types = ctx.df["Send Type"]
+    invalid = np.zeros(len(ctx.df), dtype=bool)
+    for msg_type, allowed in SIGNAL_SEND_TYPE_RULES.items():
+        invalid |= _flags(msg_types.eq(msg_type)) & ~_flags(sig_types.isin(allowed))
+    return [
+        Finding("signal_send_type", "Invalid Signal Send Type", sig_name, "Signal Send Type",
+                (row,), f"Signal Type: {sig_type}, Message Type: {msg_type}",
+                f"Allowed types: {', '.join(SIGNAL_SEND_TYPE_RULES[msg_type])}")
+        for row, sig_name, sig_type, msg_type in _flagged(invalid, ctx.df["Sig Name"], sig_types, msg_types)
+    ]
+
+
+def _numeric_field_findings(ctx: MatrixContext, rule_id: str, column: str) -> List[Finding]:
+    values = ctx.df[column]
+    missing = values.isna()
+    wrong_type = ~missing & ~_is_number(values)
+    findings = []
+    for row, sig_name, value, empty in _flagged(missing | wrong_type, ctx.df["Sig Name"], values, missing):
+        if empty:
+            findings.append(
+                Finding(rule_id, f"Missing {column}", sig_name, column, (row,),
+                        "Value is empty", f"{column} is required")
+            )
+        else:
+            findings.append(
+                Finding(rule_id, f"Invalid {column} Type", sig_name, column, (row,),
+                        f"Type: {type(value).__name__}, Value: {value}", "Must be int or float")
+            )
+    return findings
+
+
+@rule("resolution", "Resolution", "All Resolutions are correct!",
+      hint="Resolution is only int or float and must be in matrix")
+def check_resolution(ctx: MatrixContext) -> List[Finding]:
+    return _numeric_field_findings(ctx, "resolution", "Resolution")
+
+
+@rule("offset", "Offset", "All Signals Offset are correct!",
+      hint="Offset must be int or float and must be in matrix")
+def check_offset(ctx: MatrixContext) -> List[Finding]:
+    return _numeric_field_findings(ctx, "offset", "Offset")
+
+
+def _limit_findings(ctx: MatrixContext, rule_id: str, label: str, phys_column: str,
+                    hex_column: str, tolerance: Optional[float] = None) -> List[Finding]:
+    df = ctx.df
+    phys, hex_raw, res, offset = df[phys_column], df[hex_column], df["Resolution"], df["Offset"]
+    present = phys.notna() & hex_raw.notna() & res.notna()
+    hex_values = _hex_numbers(hex_raw)
+    bad_format = present & hex_values.isna()
+
+    physical = _numbers(phys)
+    calculated = hex_values * _numbers(res) + _numbers(offset)
+    diff = (calculated - physical).abs()
+    # math.isclose(rel_tol=1e-9) semantics, kept symmetric.
+    close = calculated.eq(physical) | (diff <= 1e-9 * np.maximum(calculated.abs(), physical.abs()))
+    mismatch = present & ~bad_format & ~close
+    if tolerance is not None:
+        # NaN differences come from text cells and are reported as format errors.
+        mismatch &= (diff >= tolerance) | diff.isna()
+
+    findings = []
+    short = label[:3]
+    for row, sig_name, phys_val, hex_val, res_val, offset_val in _flagged(
+        bad_format | mismatch, df["Sig Name"], phys, hex_raw, res, offset
+    ):
+        # Details are rebuilt from the raw cells so they read as before.
+        try:
+            calculated_phys = _hex_to_int(hex_val) * res_val + offset_val
+        except (ValueError, TypeError) as e:
+            findings.append(
+                Finding(rule_id, f"Invalid {label} Value Format", sig_name, phys_column, (row,),
+                        f"{short} (Hex): {hex_val}, Error: {str(e)}",
+                        "Hex value should be convertible to integer")
+            )
+            continue
+        findings.append(
+            Finding(rule_id, f"Invalid {label} Value Calculation", sig_name, phys_column, (row,),
+                    f"{short} (Physical): {phys_val}, {short} (Hex): {hex_val}, Calculated: {calculated_phys}",
+                    "Physical should equal (Hex * Resolution) + Offset")
+        )
+    return findings
+
+
+@rule("minimum", "Minimum", "All minimum values match the formula: Physical = (Hex * Resolution) + Offset",
+      hint="Physical value should equal (Hex * Resolution) + Offset")
+def check_minimum(ctx: MatrixContext) -> List[Finding]:
+    return _limit_findings(ctx, "minimum", "Minimum", "Min", "Min Hex")
+
+
+@rule("maximum", "Maximum", "All maximum values match the formula: Physical = (Hex * Resolution) + Offset",
+      hint=(
+          "Physical value should equal (Hex * Resolution) + Offset. The maximum Phys/Hex value must be "
+          "greater than or equal to the last value in the signal value description."
+      ))
+def check_maximum(ctx: MatrixContext) -> List[Finding]:
+    df = ctx.df
+    hex_column = "Max Hex" if "Max Hex" in df.columns else "Invalid"
+    values = df["Signal Value Description"]
+    # Last value of the description: on the last line, the text before the
+    # first ":" and after the last "~", read as hex.
+    text = values.astype(object).where(values.notna()).astype(str).str.strip()
+    last_value = _map_unique(text.str.extract(LAST_DESCRIPTION_VALUE, expand=False), _base16)
+    too_small = values.notna() & _numbers(df["Max"]).lt(last_value)
+
+    findings = [
+        Finding("maximum", "Phys/Hex max value greater than max signal value description", sig_name,
+                "Max", (row,),
+                f"Max (Physical): {max_phys}, Max (Hex): {max_hex}, Signal Value Description: {int(num)}",
+                "The maximum Phys/Hex value must be greater than or equal to the last value "
+                "in the signal value description.")
+        for row, sig_name, max_phys, max_hex, num in _flagged(
+            too_small, df["Sig Name"], df["Max"], df[hex_column], last_value
+        )
+    ]
+    findings.extend(_limit_findings(ctx, "maximum", "Maximum", "Max", hex_column, tolerance=1))
+    return findings
+
+
+@rule("bit_length", "Signal Values Against Bit Length", "All signal values are within bit length limits!",
+      hint=BIT_LENGTH_EXPECTED)
+def check_bit_length(ctx: MatrixContext) -> List[Finding]:
+    df = ctx.df
+    bits = _hex_numbers(df["Length"])
+    limit = np.power(2.0, bits.where(bits >= 0)) - 1
+    over_max = _numbers(df["Max"]) > limit
+    over_init = _hex_numbers(df["Initinal"]) > limit
+    over_invalid = _hex_numbers(df["Invalid"]) > limit
+
+    findings = []
+    for row, sig_name, length, max_val, init_raw, inval_raw, *over in _flagged(
+        over_max | over_init | over_invalid,
+        df["Sig Name"], df["Length"], df["Max"], df["Initinal"], df["Invalid"],
+        over_max, over_init, over_invalid,
+    ):
+        bits_value = _optional_int(length)
+        max_allowed = (1 << bits_value) - 1
+        checks = (
+            ("Max", max_val),
+            ("Initinal", _optional_int(init_raw)),
+            ("Invalid", _optional_int(inval_raw)),
+        )
+        for (label, value), exceeded in zip(checks, over):
+            if exceeded:
+                findings.append(
+                    Finding("bit_length", f"{label} value exceeding bit length limits", sig_name, label,
+                            (row,), f"{label} Value: {value}, Bit Length: {bits_value}, Max Allowed: {max_allowed}",
+                            BIT_LENGTH_EXPECTED)
+                )
+    return findings
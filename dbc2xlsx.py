@@ -5,17 +5,95 @@ import traceback
 import argparse
 import pprint
 import os
+import sys
+import io
+import re
+import glob
+import zipfile
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from openpyxl import load_workbook
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
 from collections import OrderedDict
 
 
+SIG_SEND_TYPE_MAP = {
+    0: "Cyclic",
+    1: "OnChange",
+    2: "OnWrite",
+    3: "IfActive",
+    4: "OnChangeWithRepetition",
+    5: "OnWriteWithRepetition",
+    6: "IfActiveWithRepetition",
+    7: "NoSigSendType",
+    8: "OnChangeAndIfActive",
+    9: "OnChangeAndIfActiveWithRepetition",
+    10: "CA",
+    11: "CE",
+    12: "Event",
+}
+
+DEFAULT_COLUMNS = [
+    "Message Name",
+    "Message Type",
+    "Message ID",
+    "Send Type",
+    "Cycle Time",
+    "Protocol",
+    "CAN FD",
+    "Message Length",
+    "Signal Name",
+    "Signal Description",
+    "Byte Order",
+    "Start Byte",
+    "Start Bit",
+    "Send Type",
+    "Bit Length",
+    "Data Type",
+    "Resolution",
+    "Offset",
+    "Min Value",
+    "Max Value",
+    "Min Raw",
+    "Max Raw",
+    "Initial Value",
+    "Invalid Value",
+    "Error Value",
+    "Unit",
+    "Value Description",
+    "GenMsgCycleTimeFast",
+    "GenMsgNrOfRepetition",
+    "GenMsgDelayTime",
+]
+
+# Number of positional (non-ECU) columns filled from the DBC model
+FIXED_COLUMN_COUNT = 30
+
+
+def _attr_value(attributes, name):
+    attr = attributes.get(name) if attributes else None
+    return attr.value if hasattr(attr, "value") else None
+
+
+def _raw_hex(values: np.ndarray, offsets: np.ndarray, factors: np.ndarray) -> list:
+    """Physical -> raw hex strings, computed over whole columns at once."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = np.trunc((values - offsets) / factors)
+    raw = np.where(factors == 0, 0, raw)
+    return [
+        "" if np.isnan(value) else f"0x{int(value):X}" for value in raw.tolist()
+    ]
+
+
 class DbcRead:
     def __init__(self, dbc_path: str):
         self.dbc_path = dbc_path
+        self.db = None
 
     def CreateDB(self):
-        db = cantools.database.load_file(self.dbc_path)
+        db = self.load()
 
         result = {}
 
@@ -91,28 +169,141 @@ class DbcRead:
             return "\n".join(lines)
         return str(choices)
 
-    def copy_format(self, source_path: str, target_path: str) -> None:
-        """Copy styles from source.xlsx in target.xlsx."""
-        try:
-            source_wb = load_workbook(source_path)
-            target_wb = load_workbook(target_path)
+    def _build_frame(
+        self,
+        db: cantools.database.Database,
+        ecu_nodes: List[str],
+        non_ecu_columns: List[str],
+        columns: List[str],
+    ) -> pd.DataFrame:
+        """Fill column arrays (message row + signal rows) straight from the DBC model."""
+        messages = db.messages
+        n_rows = sum(1 + len(message.signals) for message in messages)
+        fixed = [np.full(n_rows, "", dtype=object) for _ in range(FIXED_COLUMN_COUNT)]
+        ecu_index = {node: idx for idx, node in enumerate(ecu_nodes)}
+        ecu_matrix = np.full((n_rows, len(ecu_nodes)), "", dtype=object)
 
-            source_sheet_name = source_wb.sheetnames[0]
-            target_sheet_name = target_wb.sheetnames[0]
+        msg_rows, sig_rows = [], []
+        msg_values = [[] for _ in range(8)]
+        sig_values = [[] for _ in range(FIXED_COLUMN_COUNT)]
+        minimums, maximums, offsets, factors = [], [], [], []
 
-            source_sheet = source_wb[source_sheet_name]
-            target_sheet = target_wb[target_sheet_name]
+        row = 0
+        for message in messages:
+            msg_attr = message.dbc.attributes if message.dbc else {}
+            protocol = (
+                "StandardCAN" if message.protocol == "CAN" else "StandardCAN_FD"
+            )
+            msg_rows.append(row)
+            msg_values[0].append(message.name)
+            msg_values[1].append(
+                "NM"
+                if message.name.startswith("NM_")
+                else "Diag" if message.name.startswith("Diag") else "Normal"
+            )
+            msg_values[2].append(f"0x{int(message.frame_id):X}")
+            msg_values[3].append(message.send_type)
+            msg_values[4].append(message.cycle_time)
+            msg_values[5].append(protocol)
+            msg_values[6].append("1" if protocol == "StandardCAN_FD" else "0")
+            msg_values[7].append(message.length)
 
-            for row in source_sheet.iter_rows():
-                for cell in row:
-                    target_cell = target_sheet[cell.coordinate]
+            sender_idx = [ecu_index[s] for s in message.senders if s in ecu_index]
+            ecu_matrix[row, :] = "R"
+            cycle_fast = _attr_value(msg_attr, "GenMsgCycleTimeFast")
+            nr_rep = _attr_value(msg_attr, "GenMsgNrOfRepetition")
+            delay = _attr_value(msg_attr, "GenMsgDelayTime")
 
-                    target_cell.number_format = cell.number_format
+            for signal in message.signals:
+                row += 1
+                sig_rows.append(row)
+                sig_attr = signal.dbc.attributes if signal.dbc else {}
+                sig_values[8].append(signal.name)
+                sig_values[9].append(signal.comment)
+                sig_values[10].append(
+                    "Motorola MSB" if signal.byte_order == "big_endian" else "Intel"
+                )
+                sig_values[11].append(signal.start // 8)
+                sig_values[12].append(signal.start)
+                sig_values[13].append(
+                    SIG_SEND_TYPE_MAP.get(_attr_value(sig_attr, "GenSigSendType"), "")
+                )
+                sig_values[14].append(signal.length)
+                sig_values[15].append("Signed" if signal.is_signed else "Unsigned")
+                sig_values[16].append(signal.conversion.scale)
+                sig_values[17].append(signal.conversion.offset)
+                sig_values[18].append(signal.minimum)
+                sig_values[19].append(signal.maximum)
+                sig_values[22].append(
+                    f"0x{int(signal.raw_initial):X}"
+                    if pd.notna(signal.raw_initial)
+                    else ""
+                )
+                sig_values[23].append(
+                    f"0x{int(signal.raw_invalid):X}"
+                    if pd.notna(signal.raw_invalid)
+                    else ""
+                )
+                sig_values[25].append(signal.unit)
+                sig_values[26].append(self._format_value_description(signal.choices))
+                sig_values[27].append(cycle_fast)
+                sig_values[28].append(nr_rep)
+                sig_values[29].append(delay)
 
-            target_wb.save(target_path)
-            print(f"Formating successfully copy from {source_path} in {target_path}")
-        except Exception as e:
-            print(f"Error durring copy formats: {str(e)}")
+                minimums.append(signal.minimum)
+                maximums.append(signal.maximum)
+                offsets.append(signal.conversion.offset)
+                factors.append(signal.conversion.scale)
+
+                receivers = [ecu_index[r] for r in signal.receivers if r in ecu_index]
+                ecu_matrix[row, receivers] = "R"
+            ecu_matrix[msg_rows[-1] : row + 1, sender_idx] = "S"
+            row += 1
+
+        msg_rows = np.asarray(msg_rows, dtype=np.intp)
+        sig_rows = np.asarray(sig_rows, dtype=np.intp)
+        for col, values in enumerate(msg_values):
+            fixed[col][msg_rows] = values
+
+        offsets = np.asarray(offsets, dtype=float)
+        factors = np.asarray(factors, dtype=float)
+        sig_values[20] = _raw_hex(np.asarray(minimums, dtype=float), offsets, factors)
+        sig_values[21] = _raw_hex(np.asarray(maximums, dtype=float), offsets, factors)
+        sig_values[24] = ["0x0"] * len(sig_rows)
+        for col in range(8, FIXED_COLUMN_COUNT):
+            fixed[col][sig_rows] = sig_values[col]
+
+        data = {}
+        for pos in range(len(non_ecu_columns)):
+            data[pos] = (
+                fixed[pos] if pos < FIXED_COLUMN_COUNT else np.full(n_rows, "", object)
+            )
+        for idx in range(len(ecu_nodes)):
+            data[len(non_ecu_columns) + idx] = ecu_matrix[:, idx]
+
+        df = pd.DataFrame(data)
+        df.columns = columns
+        return df
+
+    def load(self) -> cantools.database.Database:
+        """Parse the DBC once per reader."""
+        if self.db is None:
+            self.db = cantools.database.load_file(self.dbc_path)
+        return self.db
+
+    def sheet_title(self) -> str:
+        """Bus name of the DBC, falling back to the file name."""
+        db = self.load()
+        if db.buses and db.buses[0].name:
+            return db.buses[0].name
+        return os.path.splitext(os.path.basename(self.dbc_path))[0]
+
+    def to_dataframe(self, base_columns: Sequence[str]) -> pd.DataFrame:
+        db = self.load()
+        ecu_nodes = [node.name for node in db.nodes]
+        non_ecu_columns = [col for col in base_columns if col not in ecu_nodes]
+        columns = non_ecu_columns + ecu_nodes
+        return self._build_frame(db, ecu_nodes, non_ecu_columns, columns)
 
     def convert(self, output_path: str = "output.xlsx") -> bool:
         """Main method convert (message row + signal rows, with style copy)"""
@@ -121,183 +312,13 @@ class DbcRead:
             print(f"Current working directory: {os.getcwd()}")
             print(f"DBC file path: {self.dbc_path}")
             print(f"DBC file exists: {os.path.exists(self.dbc_path)}")
-            lib, ecu = self.CreateDB()
-            ecu_nodes = [node.name for node in ecu]
-
-            test_xlsx_path = None
-            possible_paths = [
-                "test.xlsx",
-                "pages/test.xlsx",
-                os.path.join(os.path.dirname(__file__), "test.xlsx"),
-                os.path.join(os.path.dirname(__file__), "pages", "test.xlsx"),
-            ]
-
-            for path in possible_paths:
-                if os.path.exists(path):
-                    test_xlsx_path = path
-                    break
-
-            if not test_xlsx_path:
+
+            schema = get_template_schema()
+            if not schema.path:
                 print("Warning: test.xlsx not found, using default columns")
-                base_columns = [
-                    "Message Name",
-                    "Message Type",
-                    "Message ID",
-                    "Send Type",
-                    "Cycle Time",
-                    "Protocol",
-                    "CAN FD",
-                    "Message Length",
-                    "Signal Name",
-                    "Signal Description",
-                    "Byte Order",
-                    "Start Byte",
-                    "Start Bit",
-                    "Send Type",
-                    "Bit Length",
-                    "Data Type",
-                    "Resolution",
-                    "Offset",
-                    "Min Value",
-                    "Max Value",
-                    "Min Raw",
-                    "Max Raw",
-                    "Initial Value",
-                    "Invalid Value",
-                    "Error Value",
-                    "Unit",
-                    "Value Description",
-                    "GenMsgCycleTimeFast",
-                    "GenMsgNrOfRepetition",
-                    "GenMsgDelayTime",
-                ]
-                test_sheet_name = "Sheet1"
-            else:
-                test_xl = pd.ExcelFile(test_xlsx_path)
-                test_sheet_name = test_xl.sheet_names[0]
-                test_df = pd.read_excel(test_xl, sheet_name=test_sheet_name)
-                base_columns = list(map(str, test_df.columns))
-
-            non_ecu_columns = []
-            for col in base_columns:
-                if col not in ecu_nodes:
-                    non_ecu_columns.append(col)
-            columns = non_ecu_columns + ecu_nodes
-
-            rows = []
-            for msg_name, msg_data in lib.items():
-                msg_row = {col: "" for col in columns}
-                msg_row[columns[0]] = msg_name
-                msg_row[columns[1]] = (
-                    "NM"
-                    if str(msg_name).startswith("NM_")
-                    else "Diag" if str(msg_name).startswith("Diag") else "Normal"
-                )
-                msg_row[columns[2]] = f"0x{int(msg_data['Msg_id']):X}"
-                msg_row[columns[3]] = msg_data.get("Send_type", "")
-                msg_row[columns[4]] = msg_data["Cycle_time"]
-                msg_row[columns[5]] = (
-                    "StandardCAN" if msg_data["Protocol"] == "CAN" else "StandardCAN_FD"
-                )
-                msg_row[columns[6]] = (
-                    str(1) if msg_row[columns[5]] == "StandardCAN_FD" else str(0)
-                )
-                msg_row[columns[7]] = msg_data["Msg_length"]
-
-                for ecu_node in ecu_nodes:
-                    if ecu_node in columns:
-                        msg_row[ecu_node] = (
-                            "S" if ecu_node in msg_data["Senders"] else "R"
-                        )
-                rows.append(msg_row)
-
-                for signal in msg_data["Signals"]:
-                    sig_row = {col: "" for col in columns}
-                    sig_row[columns[8]] = signal["Sgn_name"]
-                    sig_row[columns[9]] = signal["Comment"]
-                    sig_row[columns[10]] = (
-                        "Motorola MSB"
-                        if signal["Byte_oreder"] == "big_endian"
-                        else "Intel"
-                    )
-                    sig_row[columns[11]] = signal["Start_bit"] // 8
-                    sig_row[columns[12]] = signal["Start_bit"]
-                    send_map = {
-                        0: "Cyclic",
-                        1: "OnChange",
-                        2: "OnWrite",
-                        3: "IfActive",
-                        4: "OnChangeWithRepetition",
-                        5: "OnWriteWithRepetition",
-                        6: "IfActiveWithRepetition",
-                        7: "NoSigSendType",
-                        8: "OnChangeAndIfActive",
-                        9: "OnChangeAndIfActiveWithRepetition",
-                        10: "CA",
-                        11: "CE",
-                        12: "Event",
-                    }
-                    gen_sig_send_type = (
-                        signal["Sgn_Send_Type"].value
-                        if hasattr(signal["Sgn_Send_Type"], "value")
-                        else None
-                    )
-                    sig_row[columns[13]] = send_map.get(gen_sig_send_type, "")
-                    sig_row[columns[14]] = signal["Sgn_lenght"]
-                    sig_row[columns[15]] = (
-                        "Unsigned" if signal["Is_signed"] == False else "Signed"
-                    )
-                    sig_row[columns[16]] = signal["Factor"]
-                    sig_row[columns[17]] = signal["Offset"]
-                    sig_row[columns[18]] = signal["Minimum"]
-                    sig_row[columns[19]] = signal["Maximum"]
-                    sig_row[columns[20]] = (
-                        f"0x{int((signal['Minimum'] - signal['Offset']) / signal['Factor']):X}"
-                        if signal["Factor"] != 0
-                        else "0x0"
-                    )
-                    sig_row[columns[21]] = (
-                        f"0x{int((signal['Maximum'] - signal['Offset']) / signal['Factor']):X}"
-                        if signal["Factor"] != 0
-                        else "0x0"
-                    )
-                    sig_row[columns[22]] = (
-                        f"0x{int(signal['Initinal']):X}"
-                        if pd.notna(signal["Initinal"])
-                        else ""
-                    )
-                    sig_row[columns[23]] = (
-                        f"0x{int(signal['Invalid']):X}"
-                        if pd.notna(signal["Invalid"])
-                        else ""
-                    )
-                    sig_row[columns[24]] = "0x0"
-                    sig_row[columns[25]] = signal["Unit"]
-
-                    sig_row[columns[26]] = self._format_value_description(
-                        signal["Value_description"]
-                    )
-                    sig_row[columns[27]] = msg_data["GenMsgCycleTimeFast"]
-                    sig_row[columns[28]] = msg_data["GenMsgNrOfRepetition"]
-                    sig_row[columns[29]] = msg_data["GenMsgDelayTime"]
-
-                    for ecu_node in ecu_nodes:
-                        if ecu_node in columns:
-                            if ecu_node in msg_data["Senders"]:
-                                sig_row[ecu_node] = "S"
-                            elif ecu_node in signal["Receivers"]:
-                                sig_row[ecu_node] = "R"
-                            else:
-                                sig_row[ecu_node] = ""
-                    rows.append(sig_row)
-
-            df = pd.DataFrame(rows, columns=columns)
-            df.to_excel(
-                output_path, sheet_name=test_sheet_name, index=False, engine="openpyxl"
-            )
 
-            if test_xlsx_path:
-                self.copy_format(test_xlsx_path, output_path)
+            df = self.to_dataframe(schema.columns)
+            write_sheets(output_path, [(schema.sheet_name, df)], schema.number_formats)
 
             print(f"Excel file successfully created: {output_path}")
             return True
@@ -308,8 +329,186 @@ class DbcRead:
             return False
 
 
-if __name__ == "__main__":
-    converter = DbcRead(
-        "C:\\projects\\Convert2DBC\\ATOM_CAN_Matrix_BD_V8.0.0_20250625.dbc"
+@dataclass(frozen=True)
+class TemplateSchema:
+    """Column layout and cell number formats of the formatting template."""
+
+    path: Optional[str]
+    mtime: Optional[float]
+    sheet_name: str
+    columns: Tuple[str, ...]
+    number_formats: Tuple[Tuple[str, str], ...]
+
+
+DEFAULT_SCHEMA = TemplateSchema(None, None, "Sheet1", tuple(DEFAULT_COLUMNS), ())
+
+_schema_cache: Dict[str, TemplateSchema] = {}
+_schema_lock = threading.Lock()
+
+
+def find_template() -> Optional[str]:
+    """Locate the formatting template (test.xlsx), or None."""
+    possible_paths = [
+        "test.xlsx",
+        "pages/test.xlsx",
+        os.path.join(os.path.dirname(__file__), "test.xlsx"),
+        os.path.join(os.path.dirname(__file__), "pages", "test.xlsx"),
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _read_schema(template_path: str, mtime: float) -> TemplateSchema:
+    source_wb = load_workbook(template_path)
+    source_sheet = source_wb[source_wb.sheetnames[0]]
+
+    header = [cell.value for cell in next(source_sheet.iter_rows(max_row=1), ())]
+    while header and header[-1] is None:
+        header.pop()
+    columns = tuple(
+        str(value) if value is not None else f"Unnamed: {idx}"
+        for idx, value in enumerate(header)
+    )
+    number_formats = tuple(
+        (cell.coordinate, cell.number_format)
+        for row in source_sheet.iter_rows()
+        for cell in row
+        if cell.number_format != "General"
+    )
+    return TemplateSchema(
+        template_path, mtime, source_sheet.title, columns, number_formats
     )
-    converter.convert("output.xlsx")
+
+
+def get_template_schema(template_path: Optional[str] = None) -> TemplateSchema:
+    """Template schema, read once per process and re-read when the file mtime changes."""
+    template_path = template_path or find_template()
+    if not template_path:
+        return DEFAULT_SCHEMA
+    key = os.path.abspath(template_path)
+    mtime = os.path.getmtime(key)
+    with _schema_lock:
+        schema = _schema_cache.get(key)
+        if schema is None or schema.mtime != mtime:
+            schema = _read_schema(template_path, mtime)
+            _schema_cache[key] = schema
+    return schema
+
+
+def write_sheets(
+    target,
+    frames: List[Tuple[str, pd.DataFrame]],
+    number_formats: Tuple[Tuple[str, str], ...],
+) -> None:
+    """Write (sheet name, frame) pairs into one workbook and apply template formats."""
+    with pd.ExcelWriter(target, engine="openpyxl") as writer:
+        for sheet_name, df in frames:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+            sheet = writer.sheets[sheet_name]
+            for coordinate, number_format in number_formats:
+                sheet[coordinate].number_format = number_format
+
+
+def _unique_name(name: str, used: set, max_len: int = 31) -> str:
+    name = re.sub(r"[\\/*?:\[\]]", "_", name)[:max_len] or "Sheet"
+    candidate, idx = name, 1
+    while candidate.lower() in used:
+        suffix = f"_{idx}"
+        candidate = name[: max_len - len(suffix)] + suffix
+        idx += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _convert_worker(dbc_path: str, base_columns: Sequence[str]) -> Tuple[str, pd.DataFrame]:
+    reader = DbcRead(dbc_path)
+    df = reader.to_dataframe(base_columns)
+    return reader.sheet_title(), df
+
+
+def convert_many(
+    dbc_paths: List[str],
+    output_path: str,
+    as_zip: bool = False,
+    workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """Convert several DBCs in worker processes.
+
+    Writes one workbook with a sheet per bus, or (``as_zip``) a zip archive
+    with one workbook per DBC. The template is parsed once and shared by all
+    outputs. Returns ``{dbc_path: error}`` for the files that failed.
+    """
+    schema = get_template_schema()
+
+    frames, errors = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_convert_worker, path, schema.columns): path
+            for path in dbc_paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                frames[path] = future.result()
+                print(f"Converted: {path}")
+            except Exception as e:
+                errors[path] = str(e)
+                print(f"Error converting {path}: {str(e)}")
+
+    if not frames:
+        # Nothing to write: an empty workbook is invalid and an empty zip is useless.
+        print(f"Batch finished: no DBC converted, {len(errors)} failed; {output_path} not written")
+        return errors
+
+    used = set()
+    if as_zip:
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in dbc_paths:
+                if path not in frames:
+                    continue
+                stem = os.path.splitext(os.path.basename(path))[0]
+                buffer = io.BytesIO()
+                write_sheets(
+                    buffer, [(schema.sheet_name, frames[path][1])], schema.number_formats
+                )
+                archive.writestr(f"{_unique_name(stem, used, 200)}.xlsx", buffer.getvalue())
+    else:
+        write_sheets(
+            output_path,
+            [
+                (_unique_name(frames[path][0], used), frames[path][1])
+                for path in dbc_paths
+                if path in frames
+            ],
+            schema.number_formats,
+        )
+    print(f"Batch finished: {len(frames)} converted, {len(errors)} failed -> {output_path}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert DBC files to Excel")
+    parser.add_argument("dbc", nargs="+", help="Input DBC file(s) or glob patterns")
+    parser.add_argument("-o", "--output", default="output.xlsx", help="Output .xlsx or .zip")
+    parser.add_argument(
+        "--zip", action="store_true", help="Write a zip with one workbook per DBC"
+    )
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+
+    dbc_paths = []
+    for pattern in args.dbc:
+        matches = sorted(glob.glob(pattern))
+        dbc_paths.extend(matches if matches else [pattern])
+
+    if len(dbc_paths) == 1 and not args.zip:
+        return 0 if DbcRead(dbc_paths[0]).convert(args.output) else 1
+
+    errors = convert_many(dbc_paths, args.output, as_zip=args.zip, workers=args.workers)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,23 @@
 import canmatrix.formats
+import numpy as np
 import pandas as pd
 import argparse
-import pprint
-import re
-from typing import List, Dict, Any
+import os
+import sys
+import glob
+import json
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, IO, Iterable, Iterator, Optional, Tuple
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 from pydantic import BaseModel, FilePath, ValidationError
 from typing import Dict, Union, List
 
+from lin_validation import PID_TABLE
+
 
 MATRIX_COLUMNS = [
     "Msg Name\n报文名称",
@@ -65,7 +74,7 @@ def read_file_ldf(file_path: str) -> pd.DataFrame:
 
         data = {}
 
-        with open(file=validated_path, mode="r+", encoding="utf-8") as file:
+        with open(file=validated_path, mode="r", encoding="utf-8") as file:
             data = file.read()
 
         return data
@@ -78,9 +87,200 @@ def read_file_ldf(file_path: str) -> pd.DataFrame:
         return pd.DataFrame(columns=MATRIX_COLUMNS)
 
 
-def extract_info(data: str) -> Dict[str, Union[str, float]]:
+def _strip_comments(line, in_block: bool):
+    """Return the code part of a line (str or bytes) and the block-comment state."""
+    if isinstance(line, bytes):
+        line_comment, block_open, block_close = b"//", b"/*", b"*/"
+    else:
+        line_comment, block_open, block_close = "//", "/*", "*/"
+    code = line[:0]
+    while line:
+        if in_block:
+            end = line.find(block_close)
+            if end < 0:
+                return code, True
+            line = line[end + 2 :]
+            in_block = False
+            continue
+        start = line.find(block_open)
+        comment = line.find(line_comment)
+        if comment >= 0 and (start < 0 or comment < start):
+            return code + line[:comment], False
+        if start < 0:
+            return code + line, False
+        code += line[:start]
+        line = line[start + 2 :]
+        in_block = True
+    return code, in_block
+
+
+def scan_sections(lines: Iterable) -> Dict[str, Tuple[int, int, int, int]]:
+    """Single tokenizer pass over LDF lines (without line terminators).
+
+    Returns ``{section: (first_line, last_line, start_offset, end_offset)}`` for
+    every top-level block (``Nodes``, ``Signals``, ``Frames``...) plus the
+    ``LIN_description_file`` header statements. Offsets are in the units of
+    the lines (characters for str, bytes for bytes); comments are ignored
+    when counting braces.
+    """
+    spans = {}
+    depth = 0
+    in_block = False
+    current = None
+    header = None
+    offset = 0
+    line_no = -1
+
+    for line_no, line in enumerate(lines):
+        code, in_block = _strip_comments(line, in_block)
+        if isinstance(code, bytes):
+            open_brace, close_brace, header_stmt = b"{", b"}", b"LIN_description_file;"
+        else:
+            open_brace, close_brace, header_stmt = "{", "}", "LIN_description_file;"
+        opens, closes = code.count(open_brace), code.count(close_brace)
+
+        if depth == 0 and current is None:
+            if opens:
+                name = code.split(open_brace)[0].strip()
+                if isinstance(name, bytes):
+                    name = name.decode("ascii", "replace")
+                if header is not None:
+                    spans["LIN_description_file"] = (
+                        header[0],
+                        line_no - 1,
+                        header[1],
+                        offset - 1,
+                    )
+                    header = None
+                current = (name, line_no, offset)
+            elif code.strip() == header_stmt:
+                header = (line_no, offset)
+
+        depth += opens - closes
+        if current is not None and depth <= 0:
+            spans.setdefault(
+                current[0], (current[1], line_no, current[2], offset + len(line))
+            )
+            current = None
+            depth = 0
+        offset += len(line) + 1
+
+    if header is not None:
+        spans["LIN_description_file"] = (header[0], line_no, header[1], offset - 1)
+    if current is not None:
+        spans.setdefault(current[0], (current[1], line_no, current[2], offset - 1))
+    return spans
+
+
+class LdfSectionIndex:
+    """Line and offset spans of each top-level section of an LDF text."""
+
+    def __init__(self, data: str):
+        self.data = data
+        self._lines = data.split("\n")
+        self.spans = scan_sections(self._lines)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.spans
+
+    def lines(self, name: str) -> List[str]:
+        """Lines of a section (including its header and closing brace)."""
+        if name not in self.spans:
+            return []
+        first, last = self.spans[name][:2]
+        return self._lines[first : last + 1]
+
+    def text(self, name: str) -> str:
+        if name not in self.spans:
+            return ""
+        start, end = self.spans[name][2:]
+        return self.data[start:end]
+
+
+class LazyLdf:
+    """Read-only, memory-mapped LDF document.
+
+    The section index is built on first access straight from the mapped
+    bytes, and only the sections that are asked for are decoded. Exposes
+    the same ``lines``/``text`` interface as ``LdfSectionIndex`` so it can
+    be passed to the ``extract_*`` functions as ``index``.
+    """
+
+    def __init__(self, path: str, encoding: str = "utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self._file = open(path, "rb")
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            self._buffer = b""
+        self._spans = None
+        self._decoded = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+    def _iter_lines(self):
+        start, size = 0, len(self._buffer)
+        while start < size:
+            end = self._buffer.find(b"\n", start)
+            if end < 0:
+                end = size
+            yield self._buffer[start:end]
+            start = end + 1
+
+    @property
+    def spans(self) -> Dict[str, Tuple[int, int, int, int]]:
+        if self._spans is None:
+            self._spans = scan_sections(self._iter_lines())
+        return self._spans
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.spans
+
+    def text(self, name: str) -> str:
+        if name not in self.spans:
+            return ""
+        if name not in self._decoded:
+            start, end = self.spans[name][2:]
+            self._decoded[name] = self._buffer[start:end].decode(self.encoding)
+        return self._decoded[name]
+
+    def lines(self, name: str) -> List[str]:
+        text = self.text(name)
+        return text.split("\n") if text else []
+
+    def extract(self, part: str) -> Any:
+        """Run a single extractor (a key of ``extract_all``) on its section."""
+        return EXTRACTORS[part](None, self)
+
+
+SectionSource = Union[LdfSectionIndex, LazyLdf]
+
+
+def _section_lines(
+    data: Optional[str], name: str, index: Optional[SectionSource], strip: bool = True
+) -> List[str]:
+    if index is None:
+        index = LdfSectionIndex(data)
+    lines = index.lines(name)
+    return [line.strip() for line in lines] if strip else lines
+
+
+def extract_info(
+    data: Optional[str], index: Optional[SectionSource] = None
+) -> Dict[str, Union[str, float]]:
     try:
-        lines = data.split("\n")
+        lines = _section_lines(data, "LIN_description_file", index, strip=False)
         for i, line in enumerate(lines):
             if "LIN_description_file;" in line:
                 info_lines = lines[i + 1 : i + 5]
@@ -99,9 +299,11 @@ def extract_info(data: str) -> Dict[str, Union[str, float]]:
         return {}
 
 
-def extract_nodes(data: str) -> Dict[str, Union[str, float, List[str]]]:
+def extract_nodes(
+    data: Optional[str], index: Optional[SectionSource] = None
+) -> Dict[str, Union[str, float, List[str]]]:
     try:
-        lines = [line.strip() for line in data.split("\n")]
+        lines = _section_lines(data, "Nodes", index)
         nodes_dict = {
             "Master": {"name": "", "parameters": [], "time_units": "ms"},
             "Slaves": [],
@@ -147,9 +349,11 @@ def extract_nodes(data: str) -> Dict[str, Union[str, float, List[str]]]:
         }
 
 
-def extract_signals(data: str) -> Dict[str, Dict[str, Union[str, int, List[str]]]]:
+def extract_signals(
+    data: Optional[str], index: Optional[SectionSource] = None
+) -> Dict[str, Dict[str, Union[str, int, List[str]]]]:
     try:
-        lines = [line.strip() for line in data.split("\n")]
+        lines = _section_lines(data, "Signals", index)
         signals_dict = {}
         in_signals_section = False
 
@@ -209,10 +413,10 @@ def extract_signals(data: str) -> Dict[str, Dict[str, Union[str, int, List[str]]
 
 
 def extract_frames(
-    data: str,
+    data: Optional[str], index: Optional[SectionSource] = None
 ) -> Dict[str, Dict[str, Union[int, str, List[Dict[str, Union[str, int]]]]]]:
     try:
-        lines = [line.strip() for line in data.split("\n")]
+        lines = _section_lines(data, "Frames", index)
         frames_dict = {}
         in_frames_section = False
         current_frame = None
@@ -224,7 +428,9 @@ def extract_frames(
 
             if in_frames_section:
                 if "}" in line:
-                    break
+                    # closes the current frame; the slice ends with the section
+                    current_frame = None
+                    continue
 
                 if not line:
                     continue
@@ -267,10 +473,10 @@ def extract_frames(
 
 
 def extract_node_attributes(
-    data: str,
+    data: Optional[str], index: Optional[SectionSource] = None
 ) -> Dict[str, Dict[str, Union[str, int, float, List[str]]]]:
     try:
-        lines = [line.strip() for line in data.split("\n")]
+        lines = _section_lines(data, "Node_attributes", index)
         node_attrs = {}
         brace_count = 0
         in_node_section = False
@@ -351,12 +557,11 @@ def extract_node_attributes(
         return {}
 
 
-from typing import Dict, List, Union
-
-
-def extract_schedule_tables(data: str) -> Dict[str, List[Dict[str, Union[str, int]]]]:
+def extract_schedule_tables(
+    data: Optional[str], index: Optional[SectionSource] = None
+) -> Dict[str, List[Dict[str, Union[str, int]]]]:
     try:
-        lines = [line.strip() for line in data.split("\n")]
+        lines = _section_lines(data, "Schedule_tables", index)
         schedules = {}
         in_schedule_section = False
         current_schedule = None
@@ -386,7 +591,7 @@ def extract_schedule_tables(data: str) -> Dict[str, List[Dict[str, Union[str, in
                     parts = line.split()
                     if len(parts) >= 4:
                         frame = parts[0]
-                        delay = int(parts[2])
+                        delay = int(float(parts[2]))
                         schedules[current_schedule].append(
                             {"frame": frame, "delay": delay, "unit": "ms"}
                         )
@@ -399,10 +604,10 @@ def extract_schedule_tables(data: str) -> Dict[str, List[Dict[str, Union[str, in
 
 
 def extract_signal_encoding_types(
-    data: str,
+    data: Optional[str], index: Optional[SectionSource] = None
 ) -> Dict[str, Dict[str, List[Dict[str, Union[str, int]]]]]:
     try:
-        lines = [line.strip() for line in data.split("\n")]
+        lines = _section_lines(data, "Signal_encoding_types", index)
         encodings = {}
         in_encoding_section = False
         current_signal = None
@@ -431,25 +636,21 @@ def extract_signal_encoding_types(
                 if not current_signal:
                     continue
 
-                if "logical_value," in line:
-                    parts = [p.strip().strip('"') for p in line.split(",")]
-                    if len(parts) >= 3:
-                        value = int(parts[1])
-                        description = parts[2].rstrip(";").strip()
-                        encodings[current_signal]["logical_values"].append(
-                            {"value": value, "description": description}
-                        )
+                parts = [p.strip().strip('"') for p in line.rstrip(";").split(",")]
+                if parts[0] == "logical_value" and len(parts) >= 3:
+                    encodings[current_signal]["logical_values"].append(
+                        {"value": int(parts[1], 0), "description": ",".join(parts[2:])}
+                    )
 
-                elif "physical_value," in line:
-                    parts = [p.strip().strip('"') for p in line.split(",")]
-                    if len(parts) >= 6:
-                        encodings[current_signal]["physical_values"] = {
-                            "min": int(parts[1]),
-                            "max": int(parts[2]),
-                            "scale": float(parts[3]),
-                            "offset": float(parts[4]),
-                            "unit": parts[5].rstrip(";").strip(),
-                        }
+                # The unit is optional; only the first physical range is kept.
+                elif parts[0] == "physical_value" and len(parts) >= 5:
+                    encodings[current_signal]["physical_values"].setdefault("min", int(parts[1], 0))
+                    encodings[current_signal]["physical_values"].setdefault("max", int(parts[2], 0))
+                    encodings[current_signal]["physical_values"].setdefault("scale", float(parts[3]))
+                    encodings[current_signal]["physical_values"].setdefault("offset", float(parts[4]))
+                    encodings[current_signal]["physical_values"].setdefault(
+                        "unit", parts[5] if len(parts) > 5 else ""
+                    )
 
         return encodings
 
@@ -458,176 +659,336 @@ def extract_signal_encoding_types(
         return {}
 
 
-def ldf_dicts_to_xlsx(
-    info_dict: Dict[str, Any],
-    master_slave_dict: Dict[str, Any],
+def extract_signal_representation(
+    data: Optional[str], index: Optional[SectionSource] = None
+) -> Dict[str, str]:
+    """Encoding type name of every signal listed in ``Signal_representation``."""
+    try:
+        lines = _section_lines(data, "Signal_representation", index)
+        representation = {}
+        for line in lines[1:]:
+            if ":" not in line:
+                continue
+            encoding, signals = line.rstrip(";").split(":", 1)
+            for signal in signals.split(","):
+                if signal.strip():
+                    representation[signal.strip()] = encoding.strip()
+        return representation
+
+    except Exception as e:
+        print(f"Error extracting signal representation: {e}")
+        return {}
+
+
+INFO_SHEET_COLUMNS = [
+    "LIN Protocol Version\nLIN协议版本",
+    "LIN Baudrate (kbit/s)",
+    "Time Base  (ms) \n基时",
+    "Jitter (ms)",
+]
+MATRIX_NODE_COLUMNS = ["BCM", "ALM1", "ALM2"]
+SCHEDULE_SHEET_COLUMNS = ["Schedule Name", "Frame", "Delay", "Unit"]
+
+# Shared header styles: created once, reused by every header cell
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top", wrap_text=True)
+
+
+def _header_cells(sheet, columns: List[str]) -> List[WriteOnlyCell]:
+    cells = []
+    for column in columns:
+        cell = WriteOnlyCell(sheet, value=column)
+        cell.font = HEADER_FONT
+        cell.border = HEADER_BORDER
+        cell.alignment = HEADER_ALIGNMENT
+        cells.append(cell)
+    return cells
+
+
+def _node_role(node: str, publisher: str, subscribers: List[str]) -> str:
+    if publisher == node:
+        return "S"
+    return "R" if node in subscribers else ""
+
+
+def iter_matrix_rows(
     signals_dict: Dict[str, Any],
     frames_dict: Dict[str, Any],
-    node_attrs_dict: Dict[str, Any],
-    schedules_dict: Dict[str, Any],
     signal_values_dict: Dict[str, Any],
-    output_path: str = "output_ldf.xlsx",
-):
-    info_columns = [
-        "LIN Protocol Version\nLIN协议版本",
-        "LIN Baudrate (kbit/s)",
-        "Time Base  (ms) \n基时",
-        "Jitter (ms)",
-    ]
-    info_row = [
-        info_dict.get("LIN_protocol_version", ""),
-        info_dict.get("LIN_speed", ""),
-        master_slave_dict.get("Master", {}).get("parameters", [None, None])[0],
-        master_slave_dict.get("Master", {}).get("parameters", [None, None])[1],
-    ]
-    df_info = pd.DataFrame([info_row], columns=info_columns)
-
-    matrix_columns = [
-        "Msg Name\n报文名称",
-        "Msg ID(hex)\n报文标识符",
-        "Protected ID (hex)\n保护标识符",
-        "Msg Send Type\n报文发送类型",
-        "Checksum mode\n校验方式",
-        "Msg Length(Byte)\n报文长度",
-        "Signal Name\n信号名称",
-        "Signal Description\n信号描述",
-        "Response Error",
-        "Start Byte\n起始字节",
-        "Start Bit\n起始位",
-        "Bit Length(Bit)\n信号长度",
-        "Resolution\n精度",
-        "Offset\n偏移量",
-        "Signal Min. Value(phys)\n物理最小值",
-        "Signal Max. Value(phys)\n物理最大值",
-        "Signal Min. Value(Hex)\n总线最小值",
-        "Signal Max. Value(Hex)\n总线最大值",
-        "Unit\n单位",
-        "Initial Value(Hex)\n初始值",
-        "Invalid Value(Hex)\n无效值",
-        "Signal Value Description(hex)\n信号值描述",
-        "Remark\n备注",
-        "BCM",
-        "ALM1",
-        "ALM2",
-    ]
-    matrix_rows = []
+    nodes: List[str] = MATRIX_NODE_COLUMNS,
+    signal_representation: Optional[Dict[str, str]] = None,
+) -> Iterator[List[Any]]:
+    """Yield Matrix sheet rows frame by frame, with one role column per node.
+
+    ``signal_values_dict`` is keyed by encoding type; ``signal_representation``
+    maps each signal to its encoding, and a signal missing from it is looked
+    up under its own name.
+    """
+    signal_representation = signal_representation or {}
     for frame_name, frame in frames_dict.items():
         msg_id = frame.get("frame_id", "")
+        # The LDF has no protected ID; it follows from the frame ID.
+        protected_id = f"0x{PID_TABLE[msg_id]:02X}" if isinstance(msg_id, int) and 0 <= msg_id <= 0x3F else ""
         msg_len = frame.get("lenght", "")
         publisher = frame.get("publisher", "")
         for sig in frame.get("signals", []):
             sig_name = sig["signal_name"]
             sig_props = signals_dict.get(sig_name, {})
-            value_desc = ""
-            if sig_name in signal_values_dict:
-                lv = signal_values_dict[sig_name].get("logical_values", [])
-                value_desc = "; ".join(f"{v['value']}={v['description']}" for v in lv)
-            bcm = (
-                "S"
-                if publisher == "BCM"
-                else ("R" if "BCM" in sig_props.get("subscribers", []) else "")
-            )
-            alm1 = (
-                "S"
-                if publisher == "ALM1"
-                else ("R" if "ALM1" in sig_props.get("subscribers", []) else "")
-            )
-            alm2 = (
-                "S"
-                if publisher == "ALM2"
-                else ("R" if "ALM2" in sig_props.get("subscribers", []) else "")
+            encoding = signal_values_dict.get(signal_representation.get(sig_name, sig_name), {})
+            physical = encoding.get("physical_values", {})
+            scale = physical.get("scale", 1.0)
+            offset = physical.get("offset", 0.0)
+            raw_min, raw_max = physical.get("min"), physical.get("max")
+            # Same layout as the Excel matrix, so xlsx2ldf can read it back.
+            value_desc = "\n".join(
+                f"0x{v['value']:X}: {v['description']}" for v in encoding.get("logical_values", [])
             )
-            matrix_rows.append(
-                [
-                    frame_name,
-                    f"0x{msg_id:X}" if isinstance(msg_id, int) else msg_id,
-                    "",
-                    "UF",
-                    "Enhanced",
-                    msg_len,
-                    sig_name,
-                    sig_props.get("comment", ""),
-                    (
-                        sig_props.get("publishers", [""])[0]
-                        if "response_error" in sig_props
-                        else ""
-                    ),
-                    "",
-                    sig.get("start_bit", ""),
-                    sig_props.get("size", ""),
-                    (
-                        sig_props.get("physical_values", {}).get("scale", 1.0)
-                        if "physical_values" in sig_props
-                        else 1.0
-                    ),
-                    (
-                        sig_props.get("physical_values", {}).get("offset", 0.0)
-                        if "physical_values" in sig_props
-                        else 0.0
-                    ),
-                    sig_props.get("physical_values", {}).get("min", ""),
-                    sig_props.get("physical_values", {}).get("max", ""),
-                    sig_props.get("physical_values", {}).get("min", ""),
-                    sig_props.get("physical_values", {}).get("max", ""),
-                    sig_props.get("physical_values", {}).get("unit", ""),
-                    sig_props.get("init_value", ""),
-                    "",
-                    value_desc,
-                    "",
-                    bcm,
-                    alm1,
-                    alm2,
-                ]
-            )
-    df_matrix = pd.DataFrame(matrix_rows, columns=matrix_columns)
-
-    schedule_columns = ["Schedule Name", "Frame", "Delay", "Unit"]
-    schedule_rows = []
+            subscribers = sig_props.get("subscribers", [])
+            yield [
+                frame_name,
+                f"0x{msg_id:X}" if isinstance(msg_id, int) else msg_id,
+                protected_id,
+                "UF",
+                "Enhanced",
+                msg_len,
+                sig_name,
+                sig_props.get("comment", ""),
+                (
+                    sig_props.get("publishers", [""])[0]
+                    if "response_error" in sig_props
+                    else ""
+                ),
+                sig["start_bit"] // 8 if isinstance(sig.get("start_bit"), int) else "",
+                sig.get("start_bit", ""),
+                sig_props.get("size", ""),
+                scale,
+                offset,
+                raw_min * scale + offset if raw_min is not None else "",
+                raw_max * scale + offset if raw_max is not None else "",
+                f"0x{raw_min:X}" if raw_min is not None else "",
+                f"0x{raw_max:X}" if raw_max is not None else "",
+                physical.get("unit", ""),
+                sig_props.get("init_value", ""),
+                "",
+                value_desc,
+                "",
+            ] + [_node_role(node, publisher, subscribers) for node in nodes]
+
+
+def iter_schedule_rows(schedules_dict: Dict[str, Any]) -> Iterator[List[Any]]:
     for sched_name, sched_list in schedules_dict.items():
         for item in sched_list:
-            schedule_rows.append(
-                [
-                    sched_name,
-                    item.get("frame", ""),
-                    item.get("delay", ""),
-                    item.get("unit", ""),
-                ]
-            )
-    df_schedule = pd.DataFrame(schedule_rows, columns=schedule_columns)
-
-    with pd.ExcelWriter(output_path) as writer:
-        df_info.to_excel(writer, sheet_name="Info", index=False)
-        df_matrix.to_excel(writer, sheet_name="Matrix", index=False)
-        df_schedule.to_excel(writer, sheet_name="LIN Schedule", index=False)
+            yield [
+                sched_name,
+                item.get("frame", ""),
+                item.get("delay", ""),
+                item.get("unit", ""),
+            ]
 
 
-def main():
-    data = read_file_ldf("ATOM_LIN_Matrix_BCM-ALM_V4.0.0-20250121.ldf")
-
-    print(extract_info(data=data))
+def ldf_dicts_to_xlsx(
+    info_dict: Dict[str, Any],
+    master_slave_dict: Dict[str, Any],
+    signals_dict: Dict[str, Any],
+    frames_dict: Dict[str, Any],
+    node_attrs_dict: Dict[str, Any],
+    schedules_dict: Dict[str, Any],
+    signal_values_dict: Dict[str, Any],
+    output_path: Union[str, IO] = "output_ldf.xlsx",
+    signal_representation: Optional[Dict[str, str]] = None,
+):
+    """Stream Info, Matrix and LIN Schedule into a write-only workbook.
 
-    print(extract_nodes(data=data))
+    Rows are appended as the extractor dictionaries are walked, so memory
+    stays bounded by one frame rather than the whole LDF.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
 
-    pprint.pprint(extract_signals(data=data))
+    info_sheet = workbook.create_sheet("Info")
+    info_sheet.append(_header_cells(info_sheet, INFO_SHEET_COLUMNS))
+    master_parameters = master_slave_dict.get("Master", {}).get(
+        "parameters", [None, None]
+    )
+    info_sheet.append(
+        [
+            info_dict.get("LIN_protocol_version", ""),
+            info_dict.get("LIN_speed", ""),
+            master_parameters[0],
+            master_parameters[1],
+        ]
+    )
 
-    pprint.pprint(extract_frames(data=data))
+    matrix_sheet = workbook.create_sheet("Matrix")
+    matrix_sheet.append(
+        _header_cells(matrix_sheet, MATRIX_COLUMNS + MATRIX_NODE_COLUMNS)
+    )
+    for row in iter_matrix_rows(
+        signals_dict, frames_dict, signal_values_dict, signal_representation=signal_representation
+    ):
+        matrix_sheet.append(row)
+
+    schedule_sheet = workbook.create_sheet("LIN Schedule")
+    schedule_sheet.append(_header_cells(schedule_sheet, SCHEDULE_SHEET_COLUMNS))
+    for row in iter_schedule_rows(schedules_dict):
+        schedule_sheet.append(row)
+
+    workbook.save(output_path)
+
+
+def ldf_matrix_frame(data: str) -> pd.DataFrame:
+    """Matrix sheet of an LDF as read_excel would return it after conversion.
+
+    Nodes come from the LDF itself and blank cells are NaN, so the frame can
+    go through the same processing and rules as an Excel LIN matrix.
+    """
+    index = LdfSectionIndex(data)
+    frames = extract_frames(data, index)
+    if not frames:
+        raise ValueError("No frames found in LDF")
+    nodes_dict = extract_nodes(data, index)
+    nodes = [nodes_dict.get("Master", {}).get("name")] + nodes_dict.get("Slaves", [])
+    nodes = [node for node in nodes if node]
+    rows = iter_matrix_rows(
+        extract_signals(data, index),
+        frames,
+        extract_signal_encoding_types(data, index),
+        nodes,
+        extract_signal_representation(data, index),
+    )
+    frame = pd.DataFrame(list(rows), columns=MATRIX_COLUMNS + nodes)
+    return frame.replace("", np.nan)
+
+
+EXTRACTORS = {
+    "info": extract_info,
+    "nodes": extract_nodes,
+    "signals": extract_signals,
+    "frames": extract_frames,
+    "node_attributes": extract_node_attributes,
+    "schedule_tables": extract_schedule_tables,
+    "signal_encoding_types": extract_signal_encoding_types,
+    "signal_representation": extract_signal_representation,
+}
+
+
+def extract_all(data: str) -> Dict[str, Dict[str, Any]]:
+    """Index the LDF once and run every extractor on its own section."""
+    index = LdfSectionIndex(data)
+    return {part: extractor(data, index) for part, extractor in EXTRACTORS.items()}
+
+
+def scan_ldf_folder(folder: str, part: str, pattern: str = "**/*.ldf"):
+    """Yield ``(path, extracted part)`` for every LDF under ``folder``.
+
+    Each file is memory-mapped and only the requested section is decoded.
+    """
+    for path in sorted(glob.glob(os.path.join(folder, pattern), recursive=True)):
+        try:
+            with LazyLdf(path) as ldf:
+                yield path, ldf.extract(part)
+        except OSError as e:
+            print(f"Error reading LDF file {path}: {e}")
+
+
+def collect_ldf_inputs(patterns: List[str]) -> List[str]:
+    """Expand directories and glob patterns into a sorted list of LDF files."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(glob.glob(os.path.join(pattern, "**", "*.ldf"), recursive=True))
+        else:
+            paths.extend(glob.glob(pattern))
+    return sorted(dict.fromkeys(paths))
+
+
+def convert_ldf_file(
+    ldf_path: str, output_dir: str = ".", dicts_only: bool = False
+) -> Dict[str, Any]:
+    """Convert one LDF to Excel, or dump its parsed dictionaries as JSON."""
+    stem = os.path.splitext(os.path.basename(ldf_path))[0]
+    output_path = os.path.join(output_dir, stem + (".json" if dicts_only else ".xlsx"))
+    try:
+        data = read_file_ldf(ldf_path)
+        if not isinstance(data, str):
+            return {"input": ldf_path, "status": "failed", "error": "Unreadable LDF"}
+        parsed = extract_all(data)
+        if dicts_only:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(parsed, f, indent=2, ensure_ascii=False)
+        else:
+            ldf_dicts_to_xlsx(
+                parsed["info"],
+                parsed["nodes"],
+                parsed["signals"],
+                parsed["frames"],
+                parsed["node_attributes"],
+                parsed["schedule_tables"],
+                parsed["signal_encoding_types"],
+                output_path=output_path,
+                signal_representation=parsed["signal_representation"],
+            )
+        return {
+            "input": ldf_path,
+            "output": output_path,
+            "status": "ok",
+            "frames": len(parsed["frames"]),
+            "signals": len(parsed["signals"]),
+        }
+    except Exception as e:
+        return {"input": ldf_path, "status": "failed", "error": str(e)}
+
+
+def convert_ldf_files(
+    ldf_paths: List[str],
+    output_dir: str = ".",
+    dicts_only: bool = False,
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Convert many LDF files in a process pool."""
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(convert_ldf_file, path, output_dir, dicts_only)
+            for path in ldf_paths
+        ]
+        results = []
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            if result["status"] == "ok":
+                print(f"Converted: {result['input']} -> {result['output']}")
+            else:
+                print(f"Error converting {result['input']}: {result['error']}")
+    return results
 
-    pprint.pprint(extract_node_attributes(data=data))
 
-    pprint.pprint(extract_schedule_tables(data=data))
+def main():
+    parser = argparse.ArgumentParser(description="Convert LDF files to Excel")
+    parser.add_argument("ldf", nargs="+", help="LDF files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default=".", help="Output directory")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Only dump the parsed dictionaries as JSON, without creating Excel",
+    )
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
 
-    pprint.pprint(extract_signal_encoding_types(data=data))
+    ldf_paths = collect_ldf_inputs(args.ldf)
+    if not ldf_paths:
+        parser.error("No LDF files found")
 
-    ldf_dicts_to_xlsx(
-        extract_info(data=data),
-        extract_nodes(data=data),
-        extract_signals(data=data),
-        extract_frames(data=data),
-        extract_node_attributes(data=data),
-        extract_schedule_tables(data=data),
-        extract_signal_encoding_types(data=data),
-    )
+    results = convert_ldf_files(ldf_paths, args.output_dir, args.json, args.workers)
+    failed = sum(1 for result in results if result["status"] != "ok")
+    print(f"Finished: {len(results) - failed} converted, {failed} failed")
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,629 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from can_validation import Finding, Rule, ValidationResult, run_rule
+
+
+# Bump when a rule changes so cached results from older rules are dropped.
+VALIDATOR_VERSION = "5"
+
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+$")
+MAX_NAME_LENGTH = 32
+
+SEND_TYPES = ["UF", "EF", "SF", "DF"]
+CHECKSUM_MODES = ["classic", "enhanced"]
+MESSAGE_LENGTHS = [1, 2, 4, 8]
+
+
+def _protected_id(frame_id: int) -> int:
+    bits = [(frame_id >> i) & 1 for i in range(6)]
+    p0 = bits[0] ^ bits[1] ^ bits[2] ^ bits[4]
+    p1 = 1 - (bits[1] ^ bits[3] ^ bits[4] ^ bits[5])
+    return frame_id | (p0 << 6) | (p1 << 7)
+
+
+# Protected ID of every 6-bit frame ID: ID0-5 + P0 (bit 6) + P1 (bit 7).
+PID_TABLE = np.array([_protected_id(frame_id) for frame_id in range(64)], dtype=np.int64)
+
+
+def protected_ids(frame_ids: pd.Series) -> pd.Series:
+    """PID_TABLE lookup over a column of frame IDs; <NA> outside 0x00-0x3F."""
+    frame_ids = frame_ids.astype("Int64")
+    valid = frame_ids.between(0, 0x3F).fillna(False).to_numpy(bool)
+    pids = pd.Series(pd.NA, index=frame_ids.index, dtype="Int64")
+    pids[valid] = PID_TABLE[frame_ids[valid].to_numpy(np.int64)]
+    return pids
+
+
+RULES: Dict[str, Rule] = {}
+
+
+def rule(rule_id: str, title: str, success: str, hint: str = ""):
+    """Register a LIN check in RULES; registration order is the tab order."""
+
+    def register(check):
+        RULES[rule_id] = Rule(rule_id, title, success, check, hint)
+        return check
+
+    return register
+
+
+LDF_EXTENSION = ".ldf"
+
+
+def source_name(source) -> str:
+    return getattr(source, "name", None) or str(source)
+
+
+def is_ldf(source) -> bool:
+    return source_name(source).lower().endswith(LDF_EXTENSION)
+
+
+def get_engine(file_name: str) -> str:
+    if file_name.endswith(".xls"):
+        return "xlrd"
+    elif file_name.endswith((".xlsx", ".xlsm")):
+        return "openpyxl"
+    else:
+        raise ValueError(f"Unsupported Excel file extension: {file_name}")
+
+
+def load_xlsx(file_path) -> Union[pd.DataFrame, Dict]:
+    """Matrix sheet of a path or file-like upload; a list gives {name: frame}."""
+    try:
+        if isinstance(file_path, list):
+            finally_df = {}
+            for file in file_path:
+                data_frame = pd.read_excel(
+                    file, sheet_name="Matrix", keep_default_na=True, engine="openpyxl"
+                )
+                name = getattr(file, "name", None)
+                finally_df[name if name is not None else file.split("\\")[-1]] = data_frame
+            return finally_df
+        engine = get_engine(source_name(file_path))
+        return pd.read_excel(
+            file_path, sheet_name="Matrix", keep_default_na=True, engine=engine
+        )
+    except Exception as e:
+        return f"Undefined type of file: {e}"
+
+
+def load_ldf(source) -> Union[pd.DataFrame, str]:
+    """Matrix-shaped frame of an LDF path or file-like upload; a message on failure."""
+    # ldf2xlsx imports PID_TABLE from this module, so import it on first use.
+    from ldf2xlsx import ldf_matrix_frame
+
+    try:
+        if hasattr(source, "getvalue"):
+            raw = source.getvalue()
+        else:
+            with open(source, "rb") as f:
+                raw = f.read()
+        return ldf_matrix_frame(raw.decode("utf-8"))
+    except Exception as e:
+        return f"Invalid LDF file: {e}"
+
+
+def load_matrix(source) -> Union[pd.DataFrame, str]:
+    """Matrix frame of an Excel LIN matrix or an LDF, picked by file extension."""
+    return load_ldf(source) if is_ldf(source) else load_xlsx(source)
+
+
+def create_correct_df(df: pd.DataFrame) -> pd.DataFrame:
+    # Identify bus users (nodes that send or receive messages)
+    bus_users = [
+        col
+        for col in df.columns
+        if any(val in ["S", "R"] for val in df[col].dropna().unique())
+        and col != "Unit\n单位"
+    ]
+
+    senders = []
+    receivers = []
+
+    for _, row in df.iterrows():
+        row_senders = []
+        row_receivers = []
+
+        for bus_user in bus_users:
+            if bus_user in df.columns:
+                if pd.notna(row[bus_user]) and row[bus_user] == "S":
+                    row_senders.append(bus_user)
+                elif pd.notna(row[bus_user]) and row[bus_user] == "R":
+                    row_receivers.append(bus_user)
+
+        senders.append(",".join(row_senders) if row_senders else "Vector__XXX")
+        receivers.append(",".join(row_receivers) if row_receivers else "Vector__XXX")
+
+    new_df_data = {
+        "Msg ID": df["Msg ID(hex)\n报文标识符"].ffill(),
+        "Msg Name": df["Msg Name\n报文名称"].ffill(),
+        "Protected ID": df["Protected ID (hex)\n保护标识符"].ffill(),
+        "Send Type": df["Msg Send Type\n报文发送类型"].ffill(),
+        "Checksum Mode": df["Checksum mode\n校验方式"].ffill(),
+        "Msg Length": df["Msg Length(Byte)\n报文长度"].ffill(),
+        "Sig Name": df["Signal Name\n信号名称"],
+        "Description": df["Signal Description\n信号描述"],
+        "Response Error": df["Response Error"],
+        "Start Byte": df["Start Byte\n起始字节"],
+        "Start Bit": df["Start Bit\n起始位"],
+        "Length": df["Bit Length(Bit)\n信号长度"],
+        "Resolution": df["Resolution\n精度"],
+        "Offset": df["Offset\n偏移量"],
+        "Min": df["Signal Min. Value(phys)\n物理最小值"],
+        "Max": df["Signal Max. Value(phys)\n物理最大值"],
+        "Min Hex": df["Signal Min. Value(Hex)\n总线最小值"],
+        "Max Hex": df["Signal Max. Value(Hex)\n总线最大值"],
+        "Unit": df["Unit\n单位"],
+        "Initinal": df["Initial Value(Hex)\n初始值"],
+        "Invalid": df["Invalid Value(Hex)\n无效值"],
+        "Signal Value Description": df["Signal Value Description(hex)\n信号值描述"],
+        "Remark": df["Remark\n备注"],
+        "Receiver": receivers,
+        "Senders": senders,
+    }
+
+    new_df = pd.DataFrame(new_df_data)
+
+    new_df["Unit"] = new_df["Unit"].astype(str)
+    new_df["Unit"] = new_df["Unit"].str.replace("Ω", "Ohm", regex=False)
+    new_df["Unit"] = new_df["Unit"].str.replace("℃", "degC", regex=False)
+
+    new_df = new_df.dropna(subset=["Sig Name"])
+
+    new_df["Is Signed"] = False
+
+    return new_df
+
+
+def _parse_int(value) -> Optional[int]:
+    """Hex ("0x..") or decimal cell as int; None when it does not parse."""
+    try:
+        if isinstance(value, str) and value.startswith("0x"):
+            return int(value, 16)
+        return int(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def parse_int_column(values: pd.Series, parse=_parse_int) -> pd.Series:
+    """``parse`` over a column as nullable Int64, once per distinct value."""
+    codes, uniques = pd.factorize(values)
+    parsed = pd.array([parse(value) for value in uniques] + [None], dtype="Int64")
+    # factorize gives -1 for missing cells, which picks the trailing None.
+    return pd.Series(parsed[codes], index=values.index)
+
+
+def _text_mask(values: pd.Series) -> pd.Series:
+    """True where a cell holds text rather than a number or a blank."""
+    if values.dtype != object:
+        return pd.Series(pd.api.types.is_string_dtype(values.dtype) & values.notna(), index=values.index)
+    return values.map(type).eq(str)
+
+
+def _numeric_column(values: pd.Series) -> pd.Series:
+    """Numeric cells as float; text and blanks are NaN, like the old range checks."""
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.astype(float)
+    return pd.to_numeric(values.mask(_text_mask(values)), errors="coerce").astype(float)
+
+
+def _whole(values: pd.Series, low: int, high: int) -> pd.Series:
+    """``value in range(low, high + 1)`` over a float column."""
+    return values.between(low, high) & values.mod(1).eq(0)
+
+
+class LinContext:
+    """Lookups shared by every LIN rule, built once from the processed frame.
+
+    Message-level values keep the old ``dict(zip(...))`` semantics: the last
+    row of a message wins.  Typed columns are parsed on first use and shared
+    by every rule that reads them.  The frame itself is never modified.
+    """
+
+    def __init__(self, data_frame: pd.DataFrame):
+        self.df = data_frame
+        named = data_frame[data_frame["Msg Name"].notna()]
+        self.messages = named.drop_duplicates("Msg Name", keep="last")
+        self.message_groups = named.groupby("Msg Name", sort=False).groups
+        self._typed: Dict[Tuple[str, str], pd.Series] = {}
+
+    def message_rows(self, name) -> Tuple[int, ...]:
+        return tuple(self.message_groups.get(name, ()))
+
+    def message_column(self, column: str) -> Iterable[Tuple[str, object]]:
+        return zip(self.messages["Msg Name"], self.messages[column])
+
+    def signal_column(self, column: str, mask=None) -> Iterable[Tuple[int, str, object]]:
+        """(row, signal name, value) of every row, or of the rows in ``mask``."""
+        df = self.df if mask is None else self.df[np.asarray(mask, bool)]
+        return zip(df.index, df["Sig Name"], df[column])
+
+    def _typed_column(self, kind: str, column: str, frame: pd.DataFrame, convert) -> pd.Series:
+        key = (kind, column)
+        if key not in self._typed:
+            self._typed[key] = convert(frame[column])
+        return self._typed[key]
+
+    def message_ints(self, column: str) -> pd.Series:
+        """Message-level hex/decimal column as Int64, <NA> where it does not parse."""
+        return self._typed_column("message_ints", column, self.messages, parse_int_column)
+
+    def signal_ints(self, column: str) -> pd.Series:
+        """Signal-level hex/decimal column as Int64, <NA> where it does not parse."""
+        return self._typed_column("signal_ints", column, self.df, parse_int_column)
+
+    def message_numbers(self, column: str) -> pd.Series:
+        return self._typed_column("message_numbers", column, self.messages, _numeric_column)
+
+    def signal_numbers(self, column: str) -> pd.Series:
+        return self._typed_column("signal_numbers", column, self.df, _numeric_column)
+
+
+def validate_matrix(data_frame: pd.DataFrame) -> ValidationResult:
+    """Run every registered LIN rule once over ``data_frame``."""
+    ctx = LinContext(data_frame)
+    findings = []
+    stats = {}
+    for registered in RULES.values():
+        found, stats[registered.rule_id] = run_rule(registered, ctx)
+        findings.extend(found)
+    return ValidationResult("LIN", findings, tuple(RULES), (), stats)
+
+
+def validate_file(source) -> ValidationResult:
+    """Load, process and validate one LIN matrix or LDF without Streamlit."""
+    data_frame = load_matrix(source)
+    if isinstance(data_frame, str):
+        raise ValueError(data_frame)
+    return validate_matrix(create_correct_df(data_frame))
+
+
+def _name_findings(rule_id: str, kind: str, column: str, groups) -> List[Finding]:
+    names: Dict[str, Tuple[int, ...]] = {}
+    for name, rows in groups.items():
+        names[str(name)] = names.get(str(name), ()) + tuple(rows)
+
+    findings = []
+    for name, rows in names.items():
+        if not NAME_PATTERN.fullmatch(name.strip()):
+            findings.append(
+                Finding(rule_id, f"Invalid {kind} Name", name, column, rows,
+                        "Contains prohibited characters", "Only A-Z, a-z, 0-9, _, - allowed")
+            )
+        if len(name) > MAX_NAME_LENGTH:
+            findings.append(
+                Finding(rule_id, f"Too Long {kind} Name", name, column, rows,
+                        f"Length: {len(name)} characters", f"Max {MAX_NAME_LENGTH} characters", "warning")
+            )
+    return findings
+
+
+@rule("message_name", "Message Names", "All message titles are correct!",
+      hint="Allowed characters: A-Z, a-z, 0-9, _, -")
+def check_message_name(ctx: LinContext) -> List[Finding]:
+    return _name_findings("message_name", "Message", "Msg Name", ctx.message_groups)
+
+
+@rule("protected_id", "Protected IDs", "All protected IDs are correct and parity bits are valid!",
+      hint=(
+          "Protected ID should be: Frame ID (bits 0-5) + P0 (bit 6) + P1 (bit 7)\n"
+          "P0 = ID0 ⊕ ID1 ⊕ ID2 ⊕ ID4, P1 = ¬(ID1 ⊕ ID3 ⊕ ID4 ⊕ ID5)"
+      ))
+def check_protected_id(ctx: LinContext) -> List[Finding]:
+    findings = []
+    messages = ctx.messages
+    pids = ctx.message_ints("Protected ID")
+    frame_ids = ctx.message_ints("Msg ID")
+
+    # Expected PID from the frame ID, and the PID its own ID bits imply.
+    in_range = pids.between(0x00, 0xFF).fillna(False)
+    expected = protected_ids(frame_ids.where(in_range))
+    implied = protected_ids(pids.where(in_range) & 0x3F)
+    checked = expected.notna()
+    wrong_pid = (checked & (pids != expected)).fillna(False).to_numpy(bool)
+    wrong_parity = (checked & (pids != implied)).fillna(False).to_numpy(bool)
+    unparsed = pids.isna().to_numpy(bool)
+    out_of_range = ~unparsed & ~in_range.to_numpy(bool)
+
+    names = messages["Msg Name"].tolist()
+    raw_pids = messages["Protected ID"].tolist()
+    pid_values, frame_values, expected_values, implied_values = (
+        column.to_numpy(np.int64, na_value=-1) for column in (pids, frame_ids, expected, implied)
+    )
+    for i in np.flatnonzero(unparsed | out_of_range | wrong_pid | wrong_parity):
+        name = names[i]
+        rows = ctx.message_rows(name)
+        if unparsed[i]:
+            findings.append(
+                Finding("protected_id", "Protected ID Parsing Error", name, "Protected ID", rows,
+                        f"Protected ID: {raw_pids[i]}", "Protected IDs should be valid hex or decimal values")
+            )
+            continue
+
+        pid = int(pid_values[i])
+        if out_of_range[i]:
+            findings.append(
+                Finding("protected_id", "Protected ID Out of Range", name, "Protected ID", rows,
+                        f"Protected ID: 0x{pid:02X}", "Must be between 0x00 and 0xFF")
+            )
+            continue
+
+        calculated_pid = int(expected_values[i])
+        if wrong_pid[i]:
+            findings.append(
+                Finding("protected_id", "Protected ID Calculation Error", name, "Protected ID", rows,
+                        f"Received: 0x{pid:02X}, Expected: 0x{calculated_pid:02X}",
+                        f"Frame ID (0x{int(frame_values[i]):02X}) + P0 ({calculated_pid >> 6 & 1}) "
+                        f"+ P1 ({calculated_pid >> 7})")
+            )
+
+        if wrong_parity[i]:
+            own_pid = int(implied_values[i])
+            findings.append(
+                Finding("protected_id", "Protected ID Parity Error", name, "Protected ID", rows,
+                        f"Received P0,P1: {pid >> 6 & 1}{pid >> 7}, Expected: {own_pid >> 6 & 1}{own_pid >> 7}",
+                        "P0 = ID0 ⊕ ID1 ⊕ ID2 ⊕ ID4, P1 = ¬(ID1 ⊕ ID3 ⊕ ID4 ⊕ ID5)")
+            )
+    return findings
+
+
+@rule("message_id", "Messages IDs", "All message IDs are correct!",
+      hint=(
+          "LIN IDs must be between 0x00 and 0x3D; 0x3E and 0x3F are reserved. "
+          "Unconditional Frames use 0x00-0x3B, Diagnostic Frames 0x3C (Master Request) "
+          "or 0x3D (Slave Response)"
+      ))
+def check_message_id(ctx: LinContext) -> List[Finding]:
+    findings = []
+    messages = ctx.messages
+    msg_ids = ctx.message_ints("Msg ID")
+    send_types = messages["Send Type"]
+
+    unparsed = msg_ids.isna().to_numpy(bool)
+    out_of_range = ~msg_ids.between(0x00, 0x3D).fillna(True).to_numpy(bool)
+    forbidden = msg_ids.isin([0x3E, 0x3F]).fillna(False).to_numpy(bool)
+    bad_uf = (send_types.eq("UF") & ~msg_ids.between(0x00, 0x3B)).fillna(False).to_numpy(bool)
+    bad_df = (send_types.eq("DF") & ~msg_ids.between(0x3C, 0x3D)).fillna(False).to_numpy(bool)
+
+    names = messages["Msg Name"].tolist()
+    raw_ids = messages["Msg ID"].tolist()
+    id_values = msg_ids.to_numpy(np.int64, na_value=-1)
+    for i in np.flatnonzero(unparsed | out_of_range | forbidden | bad_uf | bad_df):
+        name = names[i]
+        rows = ctx.message_rows(name)
+        if unparsed[i]:
+            findings.append(
+                Finding("message_id", "Message ID Parsing Error", name, "Msg ID", rows,
+                        f"ID: {raw_ids[i]}", "Message IDs should be valid hex or decimal values")
+            )
+            continue
+
+        msg_id = int(id_values[i])
+        if out_of_range[i]:
+            findings.append(
+                Finding("message_id", "Message ID Out of Range", name, "Msg ID", rows,
+                        f"ID: 0x{msg_id:02X}", "Must be between 0x00 and 0x3D")
+            )
+
+        if forbidden[i]:
+            findings.append(
+                Finding("message_id", "Forbidden Message ID", name, "Msg ID", rows,
+                        f"ID: 0x{msg_id:02X}", "IDs 0x3E and 0x3F are reserved")
+            )
+
+        if bad_uf[i]:
+            findings.append(
+                Finding("message_id", "Invalid ID for Unconditional Frame", name, "Msg ID", rows,
+                        f"ID: 0x{msg_id:02X}, Type: UF", "Unconditional Frames must use IDs 0x00-0x3B")
+            )
+
+        if bad_df[i]:
+            findings.append(
+                Finding("message_id", "Invalid ID for Diagnostic Frame", name, "Msg ID", rows,
+                        f"ID: 0x{msg_id:02X}, Type: DF", "Diagnostic Frames must use IDs 0x3C or 0x3D")
+            )
+    return findings
+
+
+@rule("message_send_type", "Messages Send Type", "All messages send types are correct!",
+      hint="Send Type should be: UF (Unconditional), EF (Event), SF (Sporadic), DF (Diagnostic)")
+def check_message_send_type(ctx: LinContext) -> List[Finding]:
+    return [
+        Finding("message_send_type", "Invalid Send Type", name, "Send Type", ctx.message_rows(name),
+                f"Type: {send_type}", "Must be UF (Unconditional), EF (Event), SF (Sporadic), or DF (Diagnostic)")
+        for name, send_type in ctx.message_column("Send Type")
+        if send_type not in SEND_TYPES
+    ]
+
+
+@rule("message_length", "Messages Lenght", "All message lengths are correct (1, 2, 4, or 8 bytes)!",
+      hint="LIN message length must be 1, 2, 4, or 8 bytes")
+def check_message_length(ctx: LinContext) -> List[Finding]:
+    invalid = ~ctx.message_numbers("Msg Length").isin(MESSAGE_LENGTHS)
+    return [
+        Finding("message_length", "Invalid Message Length", name, "Msg Length", ctx.message_rows(name),
+                f"Length: {length} bytes", "Must be 1, 2, 4, or 8 bytes")
+        for name, length in zip(ctx.messages["Msg Name"][invalid], ctx.messages["Msg Length"][invalid])
+    ]
+
+
+@rule("signal_name", "Signal Name", "All signal names are correct!",
+      hint="Allowed characters: A-Z, a-z, 0-9, _, -")
+def check_signal_name(ctx: LinContext) -> List[Finding]:
+    return _name_findings("signal_name", "Signal", "Sig Name", ctx.df.groupby("Sig Name", sort=False).groups)
+
+
+@rule("signal_description", "Signal Description", "All signal descriptions are present!")
+def check_signal_description(ctx: LinContext) -> List[Finding]:
+    return [
+        Finding("signal_description", "Missing Signal Description", sig_name, "Description", (row,),
+                "Value is empty", "Signal description is required")
+        for row, sig_name, val in ctx.signal_column("Description")
+        if pd.isna(val) or str(val).strip() == ""
+    ]
+
+
+@rule("response_error", "Response Error", "All response error values are valid!",
+      hint="Response Error should be numeric or empty")
+def check_response_error(ctx: LinContext) -> List[Finding]:
+    if "Response Error" not in ctx.df.columns:
+        return []
+    return [
+        Finding("response_error", "Invalid Response Error Value", sig_name, "Response Error", (row,),
+                f"Value: {val}", "Should be numeric or empty", "warning")
+        for row, sig_name, val in ctx.signal_column("Response Error")
+        if pd.notna(val) and str(val).strip() != "" and not str(val).isdigit()
+    ]
+
+
+@rule("signal_positioning", "Signal Positioning", "All signal positions are valid!",
+      hint="Signal must fit within the 8-byte frame (bits 0-63) and be 1-16 bits long")
+def check_signal_positioning(ctx: LinContext) -> List[Finding]:
+    findings = []
+    df = ctx.df
+    bits = ctx.signal_numbers("Start Bit")
+    lengths = ctx.signal_numbers("Length")
+    bad_byte = ~_whole(ctx.signal_numbers("Start Byte"), 0, 7).to_numpy(bool)
+    bad_bit = ~_whole(bits, 0, 63).to_numpy(bool)
+    bad_length = ~lengths.between(1, 16).to_numpy(bool)
+    overflow = (bits + lengths - 1 > 63).to_numpy(bool)
+
+    flagged = bad_byte | bad_bit | bad_length | overflow
+    for i, row, sig_name, byte, bit, length in zip(
+        np.flatnonzero(flagged), df.index[flagged], df["Sig Name"][flagged],
+        df["Start Byte"][flagged], df["Start Bit"][flagged], df["Length"][flagged],
+    ):
+        errors = []
+
+        if bad_byte[i]:
+            errors.append(f"Invalid start byte: {byte} (must be 0-7)")
+
+        if bad_bit[i]:
+            errors.append(f"Invalid start bit: {bit} (must be 0-63)")
+
+        if bad_length[i]:
+            errors.append(f"Invalid length: {length} (must be 1-16 bits)")
+
+        if overflow[i]:
+            errors.append(f"Signal crosses frame boundary (ends at bit {bit + length - 1})")
+
+        if errors:
+            findings.append(
+                Finding("signal_positioning", "Signal Positioning Error", sig_name, "Start Bit", (row,),
+                        "; ".join(errors),
+                        "Signal must fit within the 8-byte frame (bits 0-63) and be 1-16 bits long")
+            )
+    return findings
+
+
+@rule("start_byte", "Start Byte", "All start bytes are correct (0-7)!",
+      hint="Start byte must be between 0 and 7 for LIN")
+def check_start_byte(ctx: LinContext) -> List[Finding]:
+    invalid = ~_whole(ctx.signal_numbers("Start Byte"), 0, 7)
+    return [
+        Finding("start_byte", "Invalid Start Byte", sig_name, "Start Byte", (row,),
+                f"Start Byte: {byte}", "Must be between 0 and 7")
+        for row, sig_name, byte in ctx.signal_column("Start Byte", invalid)
+    ]
+
+
+@rule("start_bit", "Start Bit", "All start bits are correct (0-63)!",
+      hint="Start bit must be between 0 and 63 for LIN")
+def check_start_bit(ctx: LinContext) -> List[Finding]:
+    invalid = ~_whole(ctx.signal_numbers("Start Bit"), 0, 63)
+    return [
+        Finding("start_bit", "Invalid Start Bit", sig_name, "Start Bit", (row,),
+                f"Start Bit: {bit}", "Must be between 0 and 63")
+        for row, sig_name, bit in ctx.signal_column("Start Bit", invalid)
+    ]
+
+
+@rule("checksum_mode", "Checksum Mode", "All checksum modes are correct!",
+      hint="Checksum mode should be 'Classic' or 'Enhanced' for LIN; Diagnostic Frames must use Classic")
+def check_checksum_mode(ctx: LinContext) -> List[Finding]:
+    findings = []
+    send_types = dict(ctx.message_column("Send Type"))
+    for name, mode in ctx.message_column("Checksum Mode"):
+        rows = ctx.message_rows(name)
+        mode_str = str(mode).strip().lower()
+        if mode_str not in CHECKSUM_MODES:
+            findings.append(
+                Finding("checksum_mode", "Invalid Checksum Mode", name, "Checksum Mode", rows,
+                        f"Mode: {mode}", "Must be 'Classic' or 'Enhanced'")
+            )
+
+        if send_types.get(name) == "DF" and mode_str != "classic":
+            findings.append(
+                Finding("checksum_mode", "Invalid Checksum for Diagnostic Frame", name, "Checksum Mode", rows,
+                        f"Mode: {mode}, Type: DF", "Diagnostic Frames must use Classic checksum")
+            )
+    return findings
+
+
+@rule("signal_length", "Signal Length", "All signal lengths are correct (1-16 bits)!",
+      hint="Signal length must be between 1 and 16 bits for LIN")
+def check_signal_length(ctx: LinContext) -> List[Finding]:
+    invalid = ~ctx.signal_numbers("Length").between(1, 16)
+    return [
+        Finding("signal_length", "Invalid Signal Length", sig_name, "Length", (row,),
+                f"Length: {length}", "Must be between 1 and 16 bits")
+        for row, sig_name, length in ctx.signal_column("Length", invalid)
+    ]
+
+
+@rule("initial_invalid", "Initianal-Invalid Value", "All initial and invalid values are valid!",
+      hint="Values should be in hex (0xXX) or decimal format")
+def check_initial_invalid(ctx: LinContext) -> List[Finding]:
+    findings = []
+    df = ctx.df
+    bad_init = (_text_mask(df["Initinal"]) & ctx.signal_ints("Initinal").isna()).to_numpy(bool)
+    bad_invalid = (_text_mask(df["Invalid"]) & ctx.signal_ints("Invalid").isna()).to_numpy(bool)
+    flagged = bad_init | bad_invalid
+    for i, row, sig_name, init_val, inval_val in zip(
+        np.flatnonzero(flagged), df.index[flagged], df["Sig Name"][flagged],
+        df["Initinal"][flagged], df["Invalid"][flagged],
+    ):
+        errors = []
+        if bad_init[i]:
+            errors.append(f"Invalid initial value: {init_val}")
+        if bad_invalid[i]:
+            errors.append(f"Invalid invalid value: {inval_val}")
+        if errors:
+            findings.append(
+                Finding("initial_invalid", "Initial/Invalid Value Error", sig_name, "Initinal", (row,),
+                        "; ".join(errors), "Values should be in hex (0xXX) or decimal format")
+            )
+    return findings
+
+
+@rule("min_max", "Minimum-Maximum", "All min/max value pairs are valid!",
+      hint="Minimum value must be less than or equal to maximum value")
+def check_min_max(ctx: LinContext) -> List[Finding]:
+    findings = []
+    df = ctx.df
+    present = (df["Min"].notna() & df["Max"].notna()).to_numpy(bool)
+    # Unlike the range checks, numeric text counts here, as float() accepted it.
+    mins = pd.to_numeric(df["Min"], errors="coerce").astype(float)
+    maxs = pd.to_numeric(df["Max"], errors="coerce").astype(float)
+    bad_format = present & (mins.isna() | maxs.isna()).to_numpy(bool)
+    mismatch = present & (mins > maxs).to_numpy(bool)
+    flagged = bad_format | mismatch
+    for i, row, sig_name, min_raw, max_raw in zip(
+        np.flatnonzero(flagged), df.index[flagged], df["Sig Name"][flagged], df["Min"][flagged], df["Max"][flagged]
+    ):
+        if bad_format[i]:
+            findings.append(
+                Finding("min_max", "Invalid Min/Max Value Format", sig_name, "Min", (row,),
+                        f"Min: {min_raw}, Max: {max_raw}", "Values should be numeric")
+            )
+        else:
+            findings.append(
+                Finding("min_max", "Min/Max Value Mismatch", sig_name, "Min", (row,),
+                        f"Min: {mins.iat[i]}, Max: {maxs.iat[i]}",
+                        "Minimum value must be less than or equal to maximum value")
+            )
+    return findings
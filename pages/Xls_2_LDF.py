@@ -1,11 +1,12 @@
 import streamlit as st
 import pandas as pd
-from xlsx2ldf import ExcelToLDFConverter
+from xlsx2ldf import ExcelToLDFConverter, load_lin_workbook, protected_id_mismatches, LIN_SHEETS
+import io
 import os
 from datetime import datetime
 import re
 import logging
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # st.set_page_config(
 #     page_title="Excel to LDF Converter",
@@ -107,20 +108,22 @@ def display_validation_results(errors: List[str], warnings: List[str]):
                 )
 
 
-def validate_input_data(uploaded_file) -> Tuple[List[str], List[str]]:
+def validate_input_data(
+    uploaded_file, sheets: Optional[Dict[str, pd.DataFrame]] = None
+) -> Tuple[List[str], List[str]]:
     """Validate the Excel file before conversion"""
     errors = []
     warnings = []
 
     try:
-        required_sheets = ["Matrix", "Info", "LIN Schedule"]
-        with pd.ExcelFile(uploaded_file) as xls:
-            missing_sheets = [s for s in required_sheets if s not in xls.sheet_names]
-            if missing_sheets:
-                errors.append(f"Missing required sheets: {', '.join(missing_sheets)}")
-                return errors, warnings
-
-        df_info = pd.read_excel(uploaded_file, sheet_name="Info")
+        if sheets is None:
+            sheets = load_lin_workbook(uploaded_file)
+        missing_sheets = [s for s in LIN_SHEETS if s not in sheets]
+        if missing_sheets:
+            errors.append(f"Missing required sheets: {', '.join(missing_sheets)}")
+            return errors, warnings
+
+        df_info = sheets["Info"]
         if len(df_info.columns) < 4:
             errors.append(
                 "Info sheet must have at least 4 columns with configuration data"
@@ -142,7 +145,7 @@ def validate_input_data(uploaded_file) -> Tuple[List[str], List[str]]:
         except (ValueError, TypeError):
             errors.append("Invalid baudrate value in Info sheet")
 
-        df_matrix = pd.read_excel(uploaded_file, sheet_name="Matrix")
+        df_matrix = sheets["Matrix"]
         required_matrix_columns = [
             "Msg ID(hex)\n报文标识符",
             "Msg Name\n报文名称",
@@ -162,6 +165,8 @@ def validate_input_data(uploaded_file) -> Tuple[List[str], List[str]]:
             )
             return errors, warnings
 
+        warnings.extend(protected_id_mismatches(df_matrix))
+
         seen_ids = set()
         for msg_id in df_matrix["Msg ID(hex)\n报文标识符"].dropna().unique():
             try:
@@ -246,7 +251,7 @@ def validate_input_data(uploaded_file) -> Tuple[List[str], List[str]]:
                 errors.append(f"Error validating frame {hex(frame_id_val)}: {str(e)}")
 
         try:
-            df_schedule = pd.read_excel(uploaded_file, sheet_name="LIN Schedule")
+            df_schedule = sheets["LIN Schedule"]
             if not df_schedule.empty:
                 for col in df_schedule.columns:
                     if pd.isna(df_schedule[col].iloc[0]):
@@ -319,7 +324,8 @@ def main():
 
         if uploaded_file is not None:
             try:
-                df = pd.read_excel(uploaded_file, sheet_name="Matrix")
+                sheets = load_lin_workbook(uploaded_file)
+                df = sheets["Matrix"]
                 st.subheader("Data Preview")
                 st.dataframe(
                     df.head().style.set_properties(
@@ -331,7 +337,7 @@ def main():
                     )
                 )
 
-                errors, warnings = validate_input_data(uploaded_file)
+                errors, warnings = validate_input_data(uploaded_file, sheets)
                 display_validation_results(errors, warnings)
 
                 # if errors:
@@ -374,22 +380,21 @@ def main():
             if st.button("Convert to LDF", key="convert_button"):
                 with st.spinner("Converting to LDF... Please wait"):
                     try:
-                        converter = ExcelToLDFConverter(uploaded_file)
-                        if converter.convert(custom_filename):
+                        converter = ExcelToLDFConverter(uploaded_file, sheets)
+                        ldf_buffer = io.BytesIO()
+                        if converter.convert(ldf_buffer):
                             st.markdown(
                                 f'<div class="success-box">Conversion completed successfully!</div>',
                                 unsafe_allow_html=True,
                             )
 
-                            with open(custom_filename, "rb") as f:
-                                bytes_data = f.read()
-                                st.download_button(
-                                    label="Download LDF File",
-                                    data=bytes_data,
-                                    file_name=custom_filename,
-                                    mime="application/octet-stream",
-                                    key="download_button",
-                                )
+                            st.download_button(
+                                label="Download LDF File",
+                                data=ldf_buffer.getvalue(),
+                                file_name=custom_filename,
+                                mime="application/octet-stream",
+                                key="download_button",
+                            )
                         else:
                             st.error("Conversion failed. Please check the input data.")
 
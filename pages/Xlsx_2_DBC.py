@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from xlsx2dbc import ExcelToDBCConverter
 import os
+import hashlib
 from datetime import datetime
 import re
 from sqlalchemy import text
@@ -129,12 +130,32 @@ def display_warnings(warnings):
                 )
 
 
-def validate_input_data(uploaded_file):
+# Bump when a check changes so cached results from older checks are dropped.
+VALIDATOR_VERSION = "1"
+
+CACHE_TTL = 3600
+CACHE_MAX_ENTRIES = 16
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner="Checking matrix...")
+def load_and_validate(content_hash: str, validator_version: str, _uploaded_file):
+    """Matrix sheet plus validation errors and warnings for one upload.
+
+    Keyed on the upload content hash, so pressing Convert or editing the
+    version field does not re-read and re-check the workbook.
+    """
+    df = pd.read_excel(_uploaded_file, sheet_name="Matrix")
+    errors, warnings = validate_input_data(_uploaded_file, df)
+    return df, errors, warnings
+
+
+def validate_input_data(uploaded_file, df=None):
     errors = []
     warnings = []
 
     try:
-        df = pd.read_excel(uploaded_file, sheet_name="Matrix")
+        if df is None:
+            df = pd.read_excel(uploaded_file, sheet_name="Matrix")
 
         required_columns = [
             "Msg ID\n报文标识符",
@@ -263,7 +284,10 @@ def main():
 
         if uploaded_file is not None:
             try:
-                df = pd.read_excel(uploaded_file, sheet_name="Matrix")
+                content_hash = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+                df, errors, warnings = load_and_validate(
+                    content_hash, VALIDATOR_VERSION, uploaded_file
+                )
                 st.subheader("Data Preview")
                 st.dataframe(
                     df.head().style.set_properties(
@@ -275,7 +299,6 @@ def main():
                     )
                 )
 
-                errors, warnings = validate_input_data(uploaded_file)
                 display_errors(errors)
                 display_warnings(warnings)
 
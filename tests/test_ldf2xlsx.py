@@ -0,0 +1,61 @@
+import pandas as pd
+
+from ldf2xlsx import ldf_matrix_frame
+
+
+LDF = """LIN_description_file;
+LIN_protocol_version = "2.1";
+LIN_language_version = "2.1";
+LIN_speed = 19.2 kbps;
+
+Nodes {
+    Master: BCM, 5.0 ms, 0.1 ms;
+    Slaves: ALM1;
+}
+
+Signals {
+    LampLevel: 8, 0, BCM, ALM1;
+    LampMode: 2, 0, BCM, ALM1;
+}
+
+Frames {
+    LampCmd: 16, BCM, 2 {
+        LampLevel, 0;
+        LampMode, 8;
+    }
+}
+
+Signal_encoding_types {
+    Enc_Percent {
+        physical_value, 0, 200, 0.5, -10, "%";
+    }
+    Enc_Mode {
+        logical_value, 0, "Off";
+        logical_value, 1, "On";
+        physical_value, 0, 3, 1, 0;
+    }
+}
+
+Signal_representation {
+    Enc_Percent: LampLevel;
+    Enc_Mode: LampMode;
+}
+"""
+
+
+def test_physical_encoding_fills_min_max():
+    frame = ldf_matrix_frame(LDF).set_index("Signal Name\n信号名称")
+
+    level = frame.loc["LampLevel"]
+    assert level["Resolution\n精度"] == 0.5
+    assert level["Offset\n偏移量"] == -10
+    assert level["Signal Min. Value(phys)\n物理最小值"] == -10
+    assert level["Signal Max. Value(phys)\n物理最大值"] == 90
+    assert level["Signal Min. Value(Hex)\n总线最小值"] == "0x0"
+    assert level["Signal Max. Value(Hex)\n总线最大值"] == "0xC8"
+    assert level["Unit\n单位"] == "%"
+
+    mode = frame.loc["LampMode"]
+    assert mode["Signal Max. Value(phys)\n物理最大值"] == 3
+    assert mode["Signal Value Description(hex)\n信号值描述"] == "0x0: Off\n0x1: On"
+    assert pd.isna(mode["Unit\n单位"])
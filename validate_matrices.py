@@ -0,0 +1,207 @@
+"""Validate CAN/CANFD/LIN matrices and LIN LDFs without the web app.
+
+Usage:
+    python validate_matrices.py matrices/ --json report.json --junit report.xml
+    python validate_matrices.py "ATOM_LIN_Matrix_*.xlsx" --type lin -j 4
+    python validate_matrices.py supplier_ldfs/
+    python validate_matrices.py matrices/ --profile profiles/
+
+The JSON report carries per-rule wall time and rows scanned; ``--profile``
+additionally writes a cProfile dump per matrix for snakeviz/pstats.
+
+Exits with 1 when any matrix has error findings or cannot be loaded.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import IO, Any, Dict, List, Optional
+
+import can_validation
+import lin_validation
+
+MATRIX_EXTENSIONS = (".xlsx", ".xlsm", ".xls", lin_validation.LDF_EXTENSION)
+LIN_PREFIX = "ATOM_LIN_Matrix_"
+
+
+def collect_matrix_inputs(patterns: List[str]) -> List[str]:
+    """Expand directories and glob patterns into a sorted list of matrix files."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for extension in MATRIX_EXTENSIONS:
+                paths.extend(glob.glob(os.path.join(pattern, "**", "*" + extension), recursive=True))
+        else:
+            paths.extend(glob.glob(pattern))
+    # Skip Excel lock files such as "~$matrix.xlsx".
+    paths = [path for path in paths if not os.path.basename(path).startswith("~$")]
+    return sorted(dict.fromkeys(paths))
+
+
+def matrix_kind(path: str, kind: str = "auto") -> str:
+    """Matrix type of ``path``; ``auto`` picks "lin" for LDFs and the ATOM_LIN_Matrix_ prefix, else "can"."""
+    if kind != "auto":
+        return kind
+    if lin_validation.is_ldf(path) or os.path.basename(path).startswith(LIN_PREFIX):
+        return "lin"
+    return "can"
+
+
+def profile_path(profile_dir: Optional[str], path: str) -> Optional[str]:
+    """``<profile_dir>/<matrix stem>.prof``, or None when profiling is off."""
+    if not profile_dir:
+        return None
+    return os.path.join(profile_dir, os.path.splitext(os.path.basename(path))[0] + ".prof")
+
+
+def validate_matrix_file(path: str, kind: str = "auto", profile_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Validate one matrix; the result is a plain dict so it crosses processes cheaply."""
+    kind = matrix_kind(path, kind)
+    module = lin_validation if kind == "lin" else can_validation
+    try:
+        with can_validation.profiled(profile_path(profile_dir, path)):
+            result = module.validate_file(path)
+    except Exception as e:
+        return {"input": path, "kind": kind, "status": "failed", "error": str(e)}
+
+    errors = len(result.errors())
+    return {
+        "input": path,
+        "kind": kind,
+        "protocol": result.protocol,
+        "status": "error" if errors else "ok",
+        "errors": errors,
+        "warnings": len(result.findings) - errors,
+        "validation_seconds": round(result.total_seconds(), 6),
+        "rules": [
+            rule_entry(module.RULES[rule_id], count, result.stats.get(rule_id))
+            for rule_id, count in result.counts().items()
+        ],
+        "skipped": list(result.skipped),
+        "findings": [asdict(finding) for finding in result.findings],
+    }
+
+
+def rule_entry(rule: can_validation.Rule, findings: int, stats: Optional[can_validation.RuleStats]) -> Dict[str, Any]:
+    """JSON entry of one rule; skipped rules have no timing."""
+    entry = {"rule": rule.rule_id, "title": rule.title, "findings": findings}
+    if stats is not None:
+        entry["seconds"] = round(stats.seconds, 6)
+        entry["rows"] = stats.rows
+    return entry
+
+
+def validate_matrix_files(
+    paths: List[str],
+    kind: str = "auto",
+    workers: Optional[int] = None,
+    log: IO = sys.stdout,
+    profile_dir: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Validate many matrices in a process pool, in input order."""
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(validate_matrix_file, path, kind, profile_dir) for path in paths]
+        results = []
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            if result["status"] == "failed":
+                print(f"Error loading {result['input']}: {result['error']}", file=log)
+            else:
+                print(
+                    f"{result['status'].upper():5s} {result['input']} "
+                    f"({result['protocol']}): {result['errors']} errors, {result['warnings']} warnings "
+                    f"in {result['validation_seconds'] * 1000:.0f} ms",
+                    file=log,
+                )
+    return results
+
+
+def write_json(results: List[Dict[str, Any]], output_path: str) -> None:
+    report = json.dumps({"matrices": results}, indent=2, ensure_ascii=False)
+    if output_path == "-":
+        print(report)
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+def junit_tree(results: List[Dict[str, Any]]) -> ET.ElementTree:
+    """One testsuite per matrix and one testcase per rule.
+
+    Error findings fail their rule's testcase, rules that do not apply to the
+    matrix protocol are skipped and an unreadable matrix is a single error.
+    """
+    root = ET.Element("testsuites", name="matrix-validation")
+    for result in results:
+        suite = ET.SubElement(root, "testsuite", name=result["input"])
+        if result["status"] == "failed":
+            case = ET.SubElement(suite, "testcase", classname=result["input"], name="load")
+            ET.SubElement(case, "error", message=result["error"])
+            suite.set("tests", "1")
+            suite.set("errors", "1")
+            continue
+
+        failures = 0
+        for rule in result["rules"]:
+            case = ET.SubElement(suite, "testcase", classname=result["input"], name=rule["title"])
+            if rule["rule"] in result["skipped"]:
+                ET.SubElement(case, "skipped", message=f"Not applicable for {result['protocol']}")
+                continue
+            errors = [
+                f for f in result["findings"] if f["rule"] == rule["rule"] and f["severity"] == "error"
+            ]
+            if errors:
+                failures += 1
+                failure = ET.SubElement(case, "failure", message=f"{len(errors)} errors")
+                failure.text = "\n".join(
+                    f"{f['error_type']}: {f['name']} - {f['details']} (expected: {f['expected']})"
+                    for f in errors
+                )
+        suite.set("tests", str(len(result["rules"])))
+        suite.set("failures", str(failures))
+        suite.set("skipped", str(len(result["skipped"])))
+    return ET.ElementTree(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate CAN/CANFD/LIN matrices")
+    parser.add_argument("matrices", nargs="+", help="Matrix files, directories or glob patterns")
+    parser.add_argument(
+        "--type",
+        choices=["auto", "can", "lin"],
+        default="auto",
+        help="Matrix type; auto treats .ldf files and the ATOM_LIN_Matrix_ file name prefix as LIN",
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write a JSON report ('-' for stdout)")
+    parser.add_argument("--junit", metavar="PATH", help="Write a JUnit XML report")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--profile", metavar="DIR", help="Write a cProfile dump per matrix into DIR")
+    args = parser.parse_args()
+
+    paths = collect_matrix_inputs(args.matrices)
+    if not paths:
+        parser.error("No matrix files found")
+
+    # Keep stdout clean for the JSON report when it goes there.
+    log = sys.stderr if args.json == "-" else sys.stdout
+    results = validate_matrix_files(paths, args.type, args.workers, log, args.profile)
+    if args.json:
+        write_json(results, args.json)
+    if args.junit:
+        junit_tree(results).write(args.junit, encoding="utf-8", xml_declaration=True)
+
+    failed = sum(1 for result in results if result["status"] != "ok")
+    print(f"Finished: {len(results) - failed} passed, {failed} failed", file=log)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
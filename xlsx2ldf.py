@@ -1,7 +1,7 @@
 from ldfparser.schedule import ScheduleTable, LinFrameEntry
 from ldfparser.lin import LinVersion
 from ldfparser.node import LinNode
-from ldfparser.frame import LinUnconditionalFrame
+from ldfparser.frame import LinFrame, LinUnconditionalFrame
 from ldfparser.encoding import PhysicalValue, LogicalValue
 from ldfparser import (
     LDF,
@@ -13,15 +13,67 @@ from ldfparser import (
     LinDiagnosticFrame,
     LinSignalEncodingType,
     LinProductId,
-    save_ldf,
 )
+import numpy as np
 import pandas as pd
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Union, IO
 import re
+import io
+import sys
+import glob
+import json
+import time
 import argparse
+import functools
+import jinja2
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 import os
 import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+from lin_validation import parse_int_column, protected_ids
+
+
+LDF_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ldf.jinja2")
+
+
+LIN_SHEETS = ["Matrix", "Info", "LIN Schedule"]
+
+
+def load_lin_workbook(excel_path, engine: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """Read Matrix, Info and LIN Schedule in one workbook pass.
+
+    Sheets missing from the workbook are left out of the result.
+    """
+    with pd.ExcelFile(excel_path, engine=engine) as xls:
+        present = [sheet for sheet in LIN_SHEETS if sheet in xls.sheet_names]
+        if not present:
+            return {}
+        return pd.read_excel(xls, sheet_name=present, keep_default_na=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_ldf_template(template_path: str = LDF_TEMPLATE_PATH) -> jinja2.Template:
+    """Compile the LDF Jinja template once per process."""
+    with open(template_path, "r", encoding="utf-8") as file:
+        return jinja2.Template(file.read())
+
+
+def write_ldf(
+    ldf: LDF, target: Union[str, IO], template_path: str = LDF_TEMPLATE_PATH
+) -> None:
+    """Stream-render an LDF into a file path or an open text/binary buffer."""
+    chunks = get_ldf_template(template_path).generate(ldf=ldf)
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "w", encoding="utf-8") as ldf_file:
+            for chunk in chunks:
+                ldf_file.write(chunk)
+    elif isinstance(target, (io.RawIOBase, io.BufferedIOBase)):
+        for chunk in chunks:
+            target.write(chunk.encode("utf-8"))
+    else:
+        for chunk in chunks:
+            target.write(chunk)
 
 
 class ValueDescriptionParser:
@@ -72,6 +124,40 @@ class ValueDescriptionParser:
             return None
 
 
+def _parse_hex(value) -> Optional[int]:
+    """Matrix hex cell ("0x3C", "3C", or 60 read as a number) as int; None when it does not parse."""
+    try:
+        if isinstance(value, str):
+            return int(value.strip(), 16)
+        return int(str(int(value)), 16)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def protected_id_mismatches(df_matrix: pd.DataFrame) -> List[str]:
+    """One message per frame whose Protected ID (hex) disagrees with PID_TABLE.
+
+    The LDF carries no protected IDs, so this is only reported, never written.
+    Blank Protected ID cells are not reported.
+    """
+    if "Protected ID (hex)\n保护标识符" not in df_matrix.columns:
+        return []
+    frames = pd.DataFrame(
+        {
+            "name": df_matrix["Msg Name\n报文名称"].ffill(),
+            "frame_id": df_matrix["Msg ID(hex)\n报文标识符"].ffill(),
+            "pid": df_matrix["Protected ID (hex)\n保护标识符"].ffill(),
+        }
+    ).drop_duplicates("name")
+    given = parse_int_column(frames["pid"], _parse_hex)
+    expected = protected_ids(parse_int_column(frames["frame_id"], _parse_hex))
+    wrong = (given.notna() & expected.notna() & (given != expected)).fillna(False)
+    return [
+        f"Protected ID of frame {name} is 0x{pid:02X}, expected 0x{pid_expected:02X}"
+        for name, pid, pid_expected in zip(frames["name"][wrong], given[wrong], expected[wrong])
+    ]
+
+
 class ExcelToLDFConverter:
 
     def _get_engine(self, file_path: str) -> str:
@@ -90,35 +176,23 @@ class ExcelToLDFConverter:
             else:
                 raise ValueError(f"Unsupported Excel file extension: {file_path}")
 
-    def __init__(self, excel_path: str):
+    def __init__(
+        self, excel_path: str, sheets: Optional[Dict[str, pd.DataFrame]] = None
+    ):
         self.excel_path = excel_path
         self.ldf = LDF()
         self.engine = self._get_engine(self.excel_path)
+        self._encoding_types: Dict[tuple, LinSignalEncodingType] = {}
 
-        df = pd.read_excel(
-            self.excel_path,
-            sheet_name="Matrix",
-            keep_default_na=True,
-            engine=self.engine,
-        )
+        if sheets is None:
+            sheets = load_lin_workbook(self.excel_path, engine=self.engine)
+        self.df_matrix = sheets["Matrix"]
+        self.df_info = sheets["Info"]
+        self.df_schedule = sheets["LIN Schedule"]
+        df = self.df_matrix
 
-        self.df_info = pd.read_excel(
-            self.excel_path, sheet_name="Info", keep_default_na=True, engine=self.engine
-        )
-
-        self.df_schedule = pd.read_excel(
-            self.excel_path,
-            sheet_name="LIN Schedule",
-            keep_default_na=True,
-            engine=self.engine,
-        )
-
-        self.bus_users = [
-            col
-            for col in df.columns
-            if any(val in ["S", "R"] for val in df[col].dropna().unique())
-            and col != "Unit\n单位"
-        ]
+        roles = df.drop(columns=["Unit\n单位"], errors="ignore").isin(["S", "R"])
+        self.bus_users = [col for col, used in roles.any().items() if used]
 
         self.ldf_version = LinVersion(
             str(self.df_info.iloc[1, 0]).strip(".")[0],
@@ -137,7 +211,11 @@ class ExcelToLDFConverter:
             response_tolerance=None,
         )
 
-        for i, user in enumerate(self.bus_users[1:]):
+        slave_names = self.bus_users[1:]
+        configurable_frames = self._slave_configurable_frames(df, slave_names)
+        response_errors = self._slave_response_error_rows(df, slave_names)
+
+        for i, user in enumerate(slave_names):
             slave = LinSlave(name=user)
             slave.lin_protocol = self.df_info.iloc[6, 2]
             slave.configured_nad = self.df_info.iloc[i + 6, 1]
@@ -147,29 +225,13 @@ class ExcelToLDFConverter:
             slave.n_as_timeout = 1.0
             slave.n_cr_timeout = 1.0
 
-            response_signal_row = df[
-                (df[slave.name] == "S") & (df["Response Error"] == "Yes")
-            ]
-
-            config_frames_df = df[
-                ((df[slave.name] == "S") | (df[slave.name] == "R"))
-                & (df["Msg Name\n报文名称"].notna())
-            ]
-
-            configurable_frames = {}
-            for _, row in config_frames_df.iterrows():
-                frame_name = str(row["Msg Name\n报文名称"]).strip()
-                frame_id = str(row["Msg ID(hex)\n报文标识符"]).strip()
-                configurable_frames[frame_id] = frame_name
-
-            slave.configurable_frames = configurable_frames
-            if not response_signal_row.empty:
+            slave.configurable_frames = configurable_frames.get(slave.name, {})
+            if slave.name in response_errors:
+                response_signal_row = response_errors[slave.name]
                 signal_name = LinSignal(
-                    name=response_signal_row.iloc[0]["Signal Name\n信号名称"],
-                    width=response_signal_row.iloc[0]["Bit Length(Bit)\n信号长度"],
-                    init_value=int(
-                        response_signal_row.iloc[0]["Initial Value(Hex)\n初始值"], 16
-                    ),
+                    name=response_signal_row["Signal Name\n信号名称"],
+                    width=response_signal_row["Bit Length(Bit)\n信号长度"],
+                    init_value=int(response_signal_row["Initial Value(Hex)\n初始值"], 16),
                 )
                 slave.response_error = signal_name
 
@@ -178,37 +240,47 @@ class ExcelToLDFConverter:
         self.ldf._master = self.master
         self.ldf._channel = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    def _load_excel_data(self) -> pd.DataFrame:
-        df = pd.read_excel(
-            self.excel_path,
-            sheet_name="Matrix",
-            keep_default_na=True,
-            engine=self.engine,
-        )
-
-        df_schedule = pd.read_excel(
-            self.excel_path,
-            sheet_name="LIN Schedule",
-            keep_default_na=True,
-            engine=self.engine,
+    @staticmethod
+    def _slave_configurable_frames(
+        df: pd.DataFrame, slave_names: List[str]
+    ) -> Dict[str, Dict[str, str]]:
+        """Node -> {frame ID: frame name} for every frame a slave sends or receives."""
+        named = df[df["Msg Name\n报文名称"].notna()]
+        roles = named.melt(
+            id_vars=["Msg ID(hex)\n报文标识符", "Msg Name\n报文名称"],
+            value_vars=slave_names,
+            var_name="node",
+            value_name="role",
         )
+        roles = roles[roles["role"].isin(["S", "R"])]
+        frame_ids = roles["Msg ID(hex)\n报文标识符"].astype(str).str.strip()
+        frame_names = roles["Msg Name\n报文名称"].astype(str).str.strip()
+        return {
+            node: dict(zip(frame_ids[group.index], frame_names[group.index]))
+            for node, group in roles.groupby("node", sort=False)
+        }
 
-        senders = []
-        receivers = []
-
-        for _, row in df.iterrows():
-            row_senders = []
-            row_receivers = []
+    @staticmethod
+    def _slave_response_error_rows(
+        df: pd.DataFrame, slave_names: List[str]
+    ) -> Dict[str, pd.Series]:
+        """Node -> first matrix row it sends with ``Response Error == "Yes"``."""
+        candidates = df[df["Response Error"] == "Yes"]
+        sent = candidates[slave_names].eq("S")
+        return {
+            node: candidates.loc[sent[node].idxmax()]
+            for node in slave_names
+            if sent[node].any()
+        }
 
-            for bus_users in self.bus_users:
-                if bus_users in df.columns:
-                    if pd.notna(row[bus_users]) and row[bus_users] == "S":
-                        row_senders.append(bus_users)
-                    elif pd.notna(row[bus_users]) and row[bus_users] == "R":
-                        row_receivers.append(bus_users)
+    def _load_excel_data(self) -> pd.DataFrame:
+        df = self.df_matrix
+        df_schedule = self.df_schedule
 
-            senders.append(",".join(row_senders) if row_senders else None)
-            receivers.append(",".join(row_receivers) if row_receivers else None)
+        users = [user for user in self.bus_users if user in df.columns]
+        roles = df[users]
+        senders = self._join_roles(roles.eq("S"), users)
+        receivers = self._join_roles(roles.eq("R"), users)
 
         new_df = pd.DataFrame(
             {
@@ -246,6 +318,14 @@ class ExcelToLDFConverter:
 
         return new_df, df_schedule
 
+    @staticmethod
+    def _join_roles(mask: pd.DataFrame, users: List[str]) -> List[Optional[str]]:
+        """Comma-joined node names per row where ``mask`` is set, or None."""
+        if not users:
+            return [None] * len(mask)
+        joined = mask.to_numpy().dot(np.array([f"{user}," for user in users], object))
+        return [value.rstrip(",") or None for value in joined.tolist()]
+
     def get_file_info(self, file_name: str):
         file_start = "ATOM_CAN_Matrix_"
         file_start1 = "ATOM_CANFD_Matrix_"
@@ -302,6 +382,37 @@ class ExcelToLDFConverter:
             "protocol": protocol,
         }
 
+    def _intern_encoding_type(
+        self, name: str, logical_values: tuple, physical_value: tuple
+    ) -> LinSignalEncodingType:
+        """Return the encoding type with these converters, creating it on first use.
+
+        Signals with identical logical values and physical range/scale/offset/unit
+        share one encoding type, named after the first signal that uses it.
+        """
+        key = (logical_values, physical_value)
+        encoding_type = self._encoding_types.get(key)
+        if encoding_type is None:
+            phy_min, phy_max, scale, offset, unit = physical_value
+            converters = [
+                LogicalValue(phy_value=value, info=info)
+                for value, info in logical_values
+            ]
+            converters.append(
+                PhysicalValue(
+                    phy_min=phy_min,
+                    phy_max=phy_max,
+                    scale=scale,
+                    offset=offset,
+                    unit=unit,
+                )
+            )
+            encoding_type = LinSignalEncodingType(name=name, converters=converters)
+            encoding_type._signals = []
+            self._encoding_types[key] = encoding_type
+            self.ldf._signal_encoding_types[encoding_type.name] = encoding_type
+        return encoding_type
+
     def _create_signals(self, row: pd.Series) -> LinSignal:
         try:
             comment = (
@@ -326,38 +437,25 @@ class ExcelToLDFConverter:
                 comment=comment,
             )
 
-            converters = []
-
-            if value_description:
-                for key, val in value_description.items():
-                    converters.append(LogicalValue(phy_value=key, info=val))
-
-            converters.append(
-                PhysicalValue(
-                    phy_min=int(row["Min Hex"], 16),
-                    phy_max=int(row["Max Hex"], 16),
-                    scale=float(row["Resolution"]),
-                    offset=float(row["Offset"]),
-                    unit=str(row["Unit"]) if str(row["Unit"]) != "nan" else None,
-                )
+            logical_values = tuple(value_description.items()) if value_description else ()
+            physical_value = (
+                int(row["Min Hex"], 16),
+                int(row["Max Hex"], 16),
+                float(row["Resolution"]),
+                float(row["Offset"]),
+                str(row["Unit"]) if str(row["Unit"]) != "nan" else None,
             )
-
-            encoding_type = LinSignalEncodingType(
-                name=signal.name, converters=converters
+            encoding_type = self._intern_encoding_type(
+                signal.name, logical_values, physical_value
             )
-
-            encoding_type._signals = [signal]
+            encoding_type._signals.append(signal)
 
             signal.encoding_type = encoding_type
 
             signal.publisher = LinNode(row["Senders"])
             signal.subscribers = [LinNode(row["Receivers"])]
 
-            if signal.encoding_type:
-                self.ldf._signal_encoding_types[signal.encoding_type.name] = (
-                    signal.encoding_type
-                )
-                self.ldf._signal_representations[signal] = signal.encoding_type
+            self.ldf._signal_representations[signal] = encoding_type
 
             return signal
 
@@ -380,68 +478,81 @@ class ExcelToLDFConverter:
             print(f"Error creating node attr: {str(e)}")
             return False
 
-    def _create_schedule_tables(self, df_schedule: pd.DataFrame):
+    def _build_frame_index(self) -> Dict[int, LinFrame]:
+        """Frame ID -> frame over unconditional and diagnostic frames (first wins)."""
+        frame_index = {}
+        for frame in list(self.ldf._unconditional_frames.values()) + list(
+            self.ldf._diagnostic_frames.values()
+        ):
+            frame_index.setdefault(frame.frame_id, frame)
+        return frame_index
+
+    def _parse_schedule_entries(
+        self,
+        schedule_name: str,
+        block: pd.DataFrame,
+        frame_index: Dict[int, LinFrame],
+    ) -> List[LinFrameEntry]:
+        """Vectorized parse of one slot/msg/delay column triplet."""
+        msg_ids = block.iloc[:, 1]
+        delays = block.iloc[:, 2]
+
+        present = msg_ids.notna()
+        msg_ids = msg_ids[present].astype(str).str.strip()
+        delays = delays[present]
+
+        valid_id = msg_ids.str.fullmatch(r"(0[xX])?[0-9a-fA-F]+")
+        delay_values = pd.to_numeric(delays, errors="coerce")
+        valid_delay = delays.isna() | delay_values.notna()
+
+        for idx in msg_ids.index[~(valid_id & valid_delay)]:
+            print(
+                f"Invalid message ID or delay in row {idx} of schedule "
+                f"'{schedule_name}': {msg_ids[idx]!r}, {delays[idx]!r}"
+            )
+
+        keep = valid_id & valid_delay
+        frames = msg_ids[keep].map(lambda value: int(value, 16)).map(frame_index)
+        delay_values = delay_values[keep].fillna(0.0) / 1000
+
+        entries = []
+        for frame, delay in zip(frames.tolist(), delay_values.tolist()):
+            if frame is None or (isinstance(frame, float) and pd.isna(frame)):
+                continue
+            entry_frame = LinFrameEntry()
+            entry_frame.frame = frame
+            entry_frame.delay = delay
+            entries.append(entry_frame)
+        return entries
+
+    def _create_schedule_tables(
+        self,
+        df_schedule: pd.DataFrame,
+        frame_index: Optional[Dict[int, LinFrame]] = None,
+    ):
         try:
-            schedule_columns = []
+            if frame_index is None:
+                frame_index = self._build_frame_index()
 
-            for col_name, column in df_schedule.items():
-                first_value = column.iloc[0]
+            first_row = df_schedule.iloc[0]
+            seen = set()
 
+            for pos, first_value in enumerate(first_row.tolist()):
                 if pd.isna(first_value) or not isinstance(first_value, str):
                     continue
-                else:
-                    schedule_columns.append(first_value)
-
-            for schedule_name in schedule_columns:
-                matching_cols = [
-                    col
-                    for col in df_schedule.columns
-                    if str(df_schedule[col].iloc[0]) == schedule_name
-                ]
-
-                if not matching_cols:
-                    print(f"No matching column found for schedule '{schedule_name}'")
+                schedule_name = first_value
+                if schedule_name in seen:
                     continue
+                seen.add(schedule_name)
 
-                slot_col = matching_cols[0]
-                msg_col = df_schedule.columns[df_schedule.columns.get_loc(slot_col) + 1]
-                delay_col = df_schedule.columns[
-                    df_schedule.columns.get_loc(slot_col) + 2
-                ]
-
-                entries = []
-
-                for _, row in (
-                    df_schedule[[slot_col, msg_col, delay_col]].iloc[2:].iterrows()
-                ):
-                    if pd.isna(row[msg_col]):
-                        continue
-
-                    try:
-                        msg_id = int(str(row[msg_col]).strip(), 16)
-                        delay = (
-                            float(row[delay_col]) if pd.notna(row[delay_col]) else 0.0
-                        )
-
-                        all_frames = {
-                            **self.ldf._unconditional_frames,
-                            **self.ldf._diagnostic_frames,
-                        }
-
-                        frame = next(
-                            (f for f in all_frames.values() if f.frame_id == msg_id),
-                            None,
-                        )
-
-                        if frame and frame != None:
-                            entry_frame = LinFrameEntry()
-                            entry_frame.frame = frame
-                            entry_frame.delay = delay / 1000
-                            entries.append(entry_frame)
-
-                    except ValueError as e:
-                        print(f"Invalid message ID or delay in row {_}: {e}")
-                        continue
+                if pos + 2 >= len(df_schedule.columns):
+                    print(f"Schedule '{schedule_name}' has no message/delay columns")
+                    continue
+
+                block = df_schedule.iloc[2:, pos : pos + 3]
+                entries = self._parse_schedule_entries(
+                    schedule_name, block, frame_index
+                )
 
                 if entries:
                     schedule_table = ScheduleTable(name=schedule_name)
@@ -539,7 +650,7 @@ class ExcelToLDFConverter:
             print(f"Error creating default diagnostic frames: {str(e)}")
             return False
 
-    def convert(self, output_path: str = "out.ldf") -> bool:
+    def convert(self, output_path: Union[str, IO] = "out.ldf") -> bool:
         try:
             df, df_sch = self._load_excel_data()
             grouped = df.groupby(["Msg ID", "Msg name"])
@@ -552,35 +663,151 @@ class ExcelToLDFConverter:
                 self._create_frames(frm_id, frm_name, group)
 
             self._create_default_diagnostic_frames()
+            self.frame_index = self._build_frame_index()
 
             if not df_sch.empty:
-                self._create_schedule_tables(df_sch)
+                self._create_schedule_tables(df_sch, self.frame_index)
             else:
                 print("No schedule information found")
 
             self._create_node()
 
-            save_ldf(self.ldf, output_path, "./ldf.jinja2")
+            write_ldf(self.ldf, output_path)
 
-            print(f"LDF-file successfully created: {output_path}")
+            if isinstance(output_path, (str, os.PathLike)):
+                print(f"LDF-file successfully created: {output_path}")
+            else:
+                print("LDF successfully rendered to buffer")
             return True
         except Exception as e:
             print(f"Error during conversion: {str(e)}")
             return False
 
 
+def collect_excel_inputs(patterns: List[str]) -> List[str]:
+    """Expand directories and glob patterns into a sorted list of Excel files."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                os.path.join(pattern, name)
+                for name in os.listdir(pattern)
+                if name.lower().endswith((".xls", ".xlsx", ".xlsm"))
+            ]
+        else:
+            matches = glob.glob(pattern)
+        paths.extend(
+            path for path in matches if not os.path.basename(path).startswith("~$")
+        )
+    return sorted(dict.fromkeys(paths))
+
+
+def _convert_cluster(excel_path: str, output_path: str) -> Dict[str, object]:
+    start = time.perf_counter()
+    result = {"input": excel_path, "output": output_path}
+    try:
+        converter = ExcelToLDFConverter(excel_path)
+        ok = converter.convert(output_path)
+        result.update(
+            status="ok" if ok else "failed",
+            frames=len(converter.ldf._unconditional_frames),
+            signals=len(converter.ldf._signals),
+            encoding_types=len(converter.ldf._signal_encoding_types),
+            schedule_tables=len(converter.ldf._schedule_tables),
+        )
+        if not ok:
+            result["error"] = "Conversion failed"
+        result["warnings"] = protected_id_mismatches(converter.df_matrix)
+    except Exception as e:
+        result.update(status="failed", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def convert_batch(
+    excel_paths: List[str],
+    output_dir: str = ".",
+    workers: Optional[int] = None,
+    report_path: Optional[str] = None,
+) -> Dict[str, object]:
+    """Convert each LIN cluster workbook in its own worker process.
+
+    Returns (and optionally writes as JSON) a report with per-cluster timing,
+    frame/signal counts and failures.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _convert_cluster,
+                path,
+                os.path.join(
+                    output_dir, os.path.splitext(os.path.basename(path))[0] + ".ldf"
+                ),
+            )
+            for path in excel_paths
+        ]
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            print(f"[{result['status']}] {result['input']} ({result['seconds']} s)")
+            for warning in result.get("warnings", []):
+                print(f"  warning: {warning}")
+
+    report = {
+        "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "converted": sum(1 for r in results if r["status"] == "ok"),
+        "failed": sum(1 for r in results if r["status"] != "ok"),
+        "clusters": results,
+    }
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
+
+
 def main():
     parser = argparse.ArgumentParser(description="Convert Excel-files to LDF-files")
-    parser.add_argument("--input", required=True, help="Path to Excel-file")
-    parser.add_argument("--output", required="output.ldf", help="Output name LDF-file")
+    parser.add_argument("--input", help="Path to Excel-file")
+    parser.add_argument("--output", default="output.ldf", help="Output name LDF-file")
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="PATH",
+        help="Directories or glob patterns of LIN matrices, one LDF per cluster",
+    )
+    parser.add_argument("--output-dir", default=".", help="Output directory for --batch")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--report", help="Write a JSON batch report to this path")
     args = parser.parse_args()
 
+    if args.batch:
+        excel_paths = collect_excel_inputs(args.batch)
+        if not excel_paths:
+            parser.error("No Excel files matched --batch")
+        report = convert_batch(excel_paths, args.output_dir, args.workers, args.report)
+        print(
+            f"Batch finished: {report['converted']} converted, "
+            f"{report['failed']} failed in {report['total_seconds']} s"
+        )
+        return 1 if report["failed"] else 0
+
+    if not args.input:
+        parser.error("--input or --batch is required")
+
     converter = ExcelToLDFConverter(args.input)
-    if converter.convert(args.output):
+    ok = converter.convert(args.output)
+    for warning in protected_id_mismatches(converter.df_matrix):
+        print(f"  warning: {warning}")
+    if ok:
         print("Conversion completed successfully")
-    else:
-        print("Conversion failed")
+        return 0
+    print("Conversion failed")
+    return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,733 @@
+"""Patch highlights into an existing .xlsx at the zip-part level.
+
+Loading a whole matrix with openpyxl only to recolour a few hundred cells
+costs far more than the validation itself.  ``export_highlights`` copies
+every part it does not need verbatim, rewrites the style index of the
+flagged cells in one worksheet, writes that sheet's comments and appends a
+CheckResult sheet as a new part.
+"""
+import html
+import posixpath
+import re
+import zipfile
+from dataclasses import dataclass, field
+from typing import IO, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+WORKSHEET_REL = REL_NS + "/worksheet"
+COMMENTS_REL = REL_NS + "/comments"
+VML_REL = REL_NS + "/vmlDrawing"
+CALC_CHAIN_REL = REL_NS + "/calcChain"
+WORKSHEET_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+COMMENTS_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.comments+xml"
+VML_TYPE = "application/vnd.openxmlformats-officedocument.vmlDrawing"
+
+COMMENT_AUTHOR = "Validation Tool"
+CHECK_RESULT_SHEET = "CheckResult"
+CHECK_RESULT_COLUMNS = ["Serial number", "Warning site", "Warning description", "Expected", "Location"]
+CHECK_RESULT_BANNER = "【Warning】All warning cells"
+PERFORMANCE_BANNER = "【Performance】Validation rule timing"
+PERFORMANCE_COLUMNS = ["Rule", "Wall time (ms)", "Rows scanned", "Findings"]
+
+ERROR_FILL = '<fill><patternFill patternType="solid"><fgColor rgb="FFFF0000"/><bgColor rgb="FFFF0000"/></patternFill></fill>'
+HEADER_FILL = '<fill><patternFill patternType="solid"><fgColor rgb="0000CCFF"/><bgColor rgb="0000CCFF"/></patternFill></fill>'
+THIN_BORDER = '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border>'
+HEADER_FONT = '<font><b/><i/><sz val="13"/><color rgb="FF000000"/><name val="宋体"/></font>'
+BODY_FONT = '<font><sz val="12"/><color rgb="FF000000"/><name val="宋体"/></font>'
+LINK_FONT = '<font><u/><color rgb="FF0563C1"/></font>'
+CENTER = '<alignment horizontal="center" vertical="center"/>'
+
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_CELL = re.compile(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+_ROW = re.compile(r"<row\b([^>]*?)(?:/>|>(.*?)</row>)", re.S)
+_REF = re.compile(r"([A-Z]+)(\d+)")
+_RELATIONSHIP = re.compile(r"<Relationship\b[^>]*?/>", re.S)
+
+Source = Union[str, IO[bytes]]
+# (rule title, wall time in ms, rows scanned, findings) per validation rule.
+PerformanceRow = Tuple[str, float, int, int]
+
+
+@dataclass
+class CheckEntry:
+    """One CheckResult line and the highlighted cells it points at."""
+
+    site: str
+    description: str
+    expected: str
+    locations: List[Tuple[int, int]] = field(default_factory=list)
+
+
+def _text(value) -> str:
+    return _ILLEGAL_XML.sub("", "" if value is None else str(value))
+
+
+def _attr(tag: str, name: str) -> Optional[str]:
+    match = re.search(rf'\s{re.escape(name)}="([^"]*)"', tag)
+    return html.unescape(match.group(1)) if match else None
+
+
+def _set_attr(tag: str, name: str, value) -> str:
+    """Set ``name`` on the opening tag at the start of ``tag``."""
+    end = tag.index(">")
+    head, rest = tag[:end], tag[end:]
+    pattern = re.compile(rf'\s{re.escape(name)}="[^"]*"')
+    if pattern.search(head):
+        head = pattern.sub(f' {name}="{value}"', head, count=1)
+    else:
+        closing = "/" if head.endswith("/") else ""
+        head = head[: len(head) - len(closing)] + f' {name}="{value}"' + closing
+    return head + rest
+
+
+def _drop_attr(tag: str, name: str) -> str:
+    end = tag.index(">")
+    return re.sub(rf'\s{re.escape(name)}="[^"]*"', "", tag[:end], count=1) + tag[end:]
+
+
+def _relationship_id(tag: str) -> Optional[str]:
+    match = re.search(r'\s\w+:id="([^"]*)"', tag)
+    return match.group(1) if match else None
+
+
+def _resolve(base_part: str, target: str) -> str:
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base_part), target))
+
+
+def _rels_path(part: str) -> str:
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, "_rels", name + ".rels")
+
+
+def _relationships(xml: str) -> List[str]:
+    return _RELATIONSHIP.findall(xml)
+
+
+def _next_rel_id(rels: Iterable[str]) -> str:
+    numbers = [int(m.group(1)) for rel in rels for m in [re.search(r'Id="rId(\d+)"', rel)] if m]
+    return f"rId{max(numbers, default=0) + 1}"
+
+
+def _free_part(names: Iterable[str], pattern: str) -> str:
+    taken = set(names)
+    index = 1
+    while pattern.format(index) in taken:
+        index += 1
+    return pattern.format(index)
+
+
+class _Styles:
+    """Append-only view over the fonts, fills, borders and cellXfs of styles.xml."""
+
+    SECTIONS = (("fonts", "font"), ("fills", "fill"), ("borders", "border"), ("cellXfs", "xf"))
+
+    def __init__(self, xml: str):
+        self.xml = xml
+        self.items: Dict[str, List[str]] = {}
+        self._added: Dict[Tuple[str, str], int] = {}
+        self._highlight: Dict[int, int] = {}
+        for section, child in self.SECTIONS:
+            match = re.search(rf"<{section}\b[^>]*?(?:/>|>(.*?)</{section}>)", xml, re.S)
+            body = (match.group(1) or "") if match else ""
+            self.items[section] = re.findall(rf"<{child}\b[^>]*?(?:/>|>.*?</{child}>)", body, re.S)
+
+    def add(self, section: str, element: str) -> int:
+        key = (section, element)
+        if key not in self._added:
+            self.items[section].append(element)
+            self._added[key] = len(self.items[section]) - 1
+        return self._added[key]
+
+    def xf(self, font: str, fill: Optional[str] = None, border: Optional[str] = None, alignment: str = "") -> int:
+        attrs = [
+            'numFmtId="0"',
+            f'fontId="{self.add("fonts", font)}"',
+            f'fillId="{self.add("fills", fill) if fill else 0}"',
+            f'borderId="{self.add("borders", border) if border else 0}"',
+            'xfId="0"',
+            'applyFont="1"',
+        ]
+        if fill:
+            attrs.append('applyFill="1"')
+        if border:
+            attrs.append('applyBorder="1"')
+        if alignment:
+            attrs.append('applyAlignment="1"')
+            return self.add("cellXfs", f"<xf {' '.join(attrs)}>{alignment}</xf>")
+        return self.add("cellXfs", f"<xf {' '.join(attrs)}/>")
+
+    def highlighted(self, style_id: int) -> int:
+        """Copy of cell style ``style_id`` with a red fill and white bold font."""
+        if style_id in self._highlight:
+            return self._highlight[style_id]
+        xfs = self.items["cellXfs"]
+        base = xfs[style_id] if style_id < len(xfs) else xfs[0]
+        fonts = self.items["fonts"]
+        font_id = int(_attr(base, "fontId") or 0)
+        font = fonts[font_id] if font_id < len(fonts) else "<font/>"
+        font = re.sub(r"<b\b[^>]*/>|<color\b[^>]*/>", "", font)
+        if font.endswith("/>"):
+            font = font[:-2] + "></font>"
+        head_end = font.index(">") + 1
+        font = font[:head_end] + '<b/><color rgb="FFFFFFFF"/>' + font[head_end:]
+
+        xf = base
+        for name, value in (
+            ("fontId", self.add("fonts", font)),
+            ("fillId", self.add("fills", ERROR_FILL)),
+            ("applyFont", 1),
+            ("applyFill", 1),
+        ):
+            xf = _set_attr(xf, name, value)
+        new_id = self.add("cellXfs", xf)
+        self._highlight[style_id] = new_id
+        return new_id
+
+    def render(self) -> str:
+        xml = self.xml
+        for section, _ in self.SECTIONS:
+            items = self.items[section]
+            match = re.search(rf"<{section}\b([^>]*?)(?:/>|>(.*?)</{section}>)", xml, re.S)
+            attrs = re.sub(r'\scount="[^"]*"', "", match.group(1)).rstrip("/")
+            block = f'<{section} count="{len(items)}"{attrs}>{"".join(items)}</{section}>'
+            xml = xml[: match.start()] + block + xml[match.end():]
+        return xml
+
+
+def _patch_row_cells(row_tag: str, body: str, row: int, cols: Dict[int, None], styles: _Styles) -> str:
+    """Re-style the wanted cells of one row, adding cells that do not exist."""
+    pending = dict.fromkeys(sorted(cols))
+    row_style = int(_attr(row_tag, "s") or 0) if _attr(row_tag, "customFormat") in ("1", "true") else 0
+    pieces = []
+    last = 0
+    col = 0
+    for match in _CELL.finditer(body):
+        ref = _attr(match.group(0), "r")
+        col = column_index_from_string(_REF.match(ref).group(1)) if ref else col + 1
+        for missing in [c for c in pending if c < col]:
+            pieces.append(f'<c r="{get_column_letter(missing)}{row}" s="{styles.highlighted(row_style)}"/>')
+            del pending[missing]
+        if col in pending:
+            cell = match.group(0)
+            if not ref:
+                cell = _set_attr(cell, "r", f"{get_column_letter(col)}{row}")
+            pieces.append(body[last: match.start()])
+            pieces.append(_set_attr(cell, "s", styles.highlighted(int(_attr(cell, "s") or 0))))
+            last = match.end()
+            del pending[col]
+        else:
+            pieces.append(body[last: match.end()])
+            last = match.end()
+    pieces.append(body[last:])
+    for missing in pending:
+        pieces.append(f'<c r="{get_column_letter(missing)}{row}" s="{styles.highlighted(row_style)}"/>')
+    row_tag = _drop_attr(f"<row{row_tag}>", "spans")
+    if row_tag.endswith("/>"):
+        row_tag = row_tag[:-2] + ">"
+    return row_tag + "".join(pieces) + "</row>"
+
+
+def _patch_sheet_data(xml: str, cells: Iterable[Tuple[int, int]], styles: _Styles) -> str:
+    targets: Dict[int, Dict[int, None]] = {}
+    for row, col in cells:
+        targets.setdefault(row, {})[col] = None
+
+    match = re.search(r"<sheetData\b[^>]*?(?:/>|>(.*)</sheetData>)", xml, re.S)
+    body = match.group(1) or ""
+    pieces = []
+    last = 0
+    row = 0
+    remaining = sorted(targets)
+    for row_match in _ROW.finditer(body):
+        row_tag = row_match.group(1)
+        ref = _attr(row_tag, "r")
+        row = int(ref) if ref else row + 1
+        while remaining and remaining[0] < row:
+            missing = remaining.pop(0)
+            pieces.append(body[last: row_match.start()])
+            last = row_match.start()
+            pieces.append(_patch_row_cells(f' r="{missing}"', "", missing, targets[missing], styles))
+        if remaining and remaining[0] == row:
+            remaining.pop(0)
+            pieces.append(body[last: row_match.start()])
+            if not ref:
+                row_tag += f' r="{row}"'
+            pieces.append(_patch_row_cells(row_tag, row_match.group(2) or "", row, targets[row], styles))
+            last = row_match.end()
+    pieces.append(body[last:])
+    for missing in remaining:
+        pieces.append(_patch_row_cells(f' r="{missing}"', "", missing, targets[missing], styles))
+
+    head = xml[: match.start()]
+    sheet_data = f"<sheetData>{''.join(pieces)}</sheetData>"
+    return head + sheet_data + xml[match.end():]
+
+
+_AFTER_LEGACY_DRAWING = (
+    "legacyDrawingHF", "drawingHF", "picture", "oleObjects", "controls",
+    "webPublishItems", "tableParts", "extLst",
+)
+
+
+def _set_legacy_drawing(xml: str, rel_id: str) -> str:
+    element = f'<legacyDrawing r:id="{rel_id}"/>'
+    if 'xmlns:r="' not in xml[: xml.index(">", xml.index("<worksheet"))]:
+        xml = xml.replace("<worksheet", f'<worksheet xmlns:r="{REL_NS}"', 1)
+    existing = re.search(r"<legacyDrawing\b[^>]*/>", xml)
+    if existing:
+        return xml[: existing.start()] + element + xml[existing.end():]
+    positions = [m.start() for tag in _AFTER_LEGACY_DRAWING for m in [re.search(rf"<{tag}\b", xml)] if m]
+    at = min(positions) if positions else xml.rindex("</worksheet>")
+    return xml[:at] + element + xml[at:]
+
+
+def _comments_xml(comments: Dict[Tuple[int, int], str], existing: Optional[str]) -> str:
+    root = f'<comments xmlns="{MAIN_NS}">'
+    authors: List[str] = []
+    kept: List[Tuple[Tuple[int, int], str]] = []
+    if existing:
+        root = re.search(r"<comments\b[^>]*>", existing).group(0)
+        authors = re.findall(r"<author>(.*?)</author>", existing, re.S)
+        for comment in re.findall(r"<comment\b.*?</comment>", existing, re.S):
+            row_col = _REF.match(_attr(comment, "ref") or "")
+            if row_col:
+                key = (int(row_col.group(2)), column_index_from_string(row_col.group(1)))
+                if key not in comments:
+                    kept.append((key, comment))
+    author = escape(COMMENT_AUTHOR)
+    if author not in authors:
+        authors.append(author)
+    author_id = authors.index(author)
+
+    entries = kept + [
+        (
+            (row, col),
+            f'<comment ref="{get_column_letter(col)}{row}" authorId="{author_id}">'
+            f'<text><t xml:space="preserve">{escape(_text(text))}</t></text></comment>',
+        )
+        for (row, col), text in comments.items()
+    ]
+    entries.sort(key=lambda item: item[0])
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f"{root}<authors>{''.join(f'<author>{a}</author>' for a in authors)}</authors>"
+        f"<commentList>{''.join(comment for _, comment in entries)}</commentList></comments>"
+    )
+
+
+def _vml_xml(cells: List[Tuple[int, int]], block: int) -> Tuple[str, int]:
+    """Legacy VML shapes Excel needs to display the comments of one sheet."""
+    blocks = max(1, -(-len(cells) // 1024))
+    shapes = []
+    for number, (row, col) in enumerate(sorted(cells)):
+        shape_id = block * 1024 + 1 + number
+        shapes.append(
+            f'<v:shape id="_x0000_s{shape_id}" type="#_x0000_t202" '
+            'style="position:absolute;margin-left:59.25pt;margin-top:1.5pt;width:108pt;height:59.25pt;'
+            'z-index:1;visibility:hidden" fillcolor="#ffffe1" o:insetmode="auto">'
+            '<v:fill color2="#ffffe1"/><v:shadow on="t" color="black" obscured="t"/>'
+            '<v:path o:connecttype="none"/><v:textbox style="mso-direction-alt:auto">'
+            '<div style="text-align:left"></div></v:textbox>'
+            '<x:ClientData ObjectType="Note"><x:MoveWithCells/><x:SizeWithCells/>'
+            f"<x:Anchor>{col}, 15, {row - 1}, 10, {col + 2}, 15, {row + 3}, 4</x:Anchor>"
+            f"<x:AutoFill>False</x:AutoFill><x:Row>{row - 1}</x:Row><x:Column>{col - 1}</x:Column>"
+            "</x:ClientData></v:shape>"
+        )
+    idmap = ",".join(str(block + i) for i in range(blocks))
+    xml = (
+        '<xml xmlns:v="urn:schemas-microsoft-com:vml" xmlns:o="urn:schemas-microsoft-com:office:office" '
+        'xmlns:x="urn:schemas-microsoft-com:office:excel">'
+        f'<o:shapelayout v:ext="edit"><o:idmap v:ext="edit" data="{idmap}"/></o:shapelayout>'
+        '<v:shapetype id="_x0000_t202" coordsize="21600,21600" o:spt="202" path="m,l,21600r21600,l21600,xe">'
+        '<v:stroke joinstyle="miter"/><v:path gradientshapeok="t" o:connecttype="rect"/></v:shapetype>'
+        f"{''.join(shapes)}</xml>"
+    )
+    return xml, block + blocks
+
+
+def _free_vml_block(package: "_Package") -> int:
+    """First VML shape-id block not claimed by another sheet's drawing."""
+    used = [0]
+    for name in package.all_names():
+        if name.endswith(".vml"):
+            text = package.zip.read(name).decode("utf-8", "ignore") if name in package.names else ""
+            match = re.search(r'<o:idmap\b[^>]*?data="([^"]*)"', text)
+            if match:
+                used.extend(int(n) for n in re.findall(r"\d+", match.group(1)))
+    return max(used) + 1
+
+
+def _cell(ref: str, style: int, value=None) -> str:
+    if value is None or value == "":
+        return f'<c r="{ref}" s="{style}"/>'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c r="{ref}" s="{style}"><v>{value}</v></c>'
+    return f'<c r="{ref}" s="{style}" t="inlineStr"><is><t xml:space="preserve">{escape(_text(value))}</t></is></c>'
+
+
+def _check_result_xml(
+    entries: List[CheckEntry], sheet_name: str, styles: _Styles, performance: Sequence[PerformanceRow] = ()
+) -> Tuple[str, Dict[Tuple[int, int], str]]:
+    header = styles.xf(HEADER_FONT, HEADER_FILL, THIN_BORDER, CENTER)
+    centered = styles.xf(BODY_FONT, border=THIN_BORDER, alignment=CENTER)
+    plain = styles.xf(BODY_FONT, border=THIN_BORDER)
+    link = styles.xf(LINK_FONT, border=THIN_BORDER, alignment=CENTER)
+    width = len(CHECK_RESULT_COLUMNS)
+    last_col = get_column_letter(width)
+    quoted = "'" + sheet_name.replace("'", "''") + "'"
+
+    rows = [
+        '<row r="1">'
+        + "".join(_cell(f"{get_column_letter(i)}1", header, name) for i, name in enumerate(CHECK_RESULT_COLUMNS, 1))
+        + "</row>",
+        '<row r="2">'
+        + _cell("A2", header, CHECK_RESULT_BANNER)
+        + "".join(_cell(f"{get_column_letter(i)}2", header) for i in range(2, width + 1))
+        + "</row>",
+    ]
+    links = []
+    comments: Dict[Tuple[int, int], str] = {}
+    for number, entry in enumerate(entries, start=1):
+        r = number + 2
+        cells = [
+            _cell(f"A{r}", centered, number),
+            _cell(f"B{r}", centered, entry.site),
+            _cell(f"C{r}", plain, entry.description),
+            _cell(f"D{r}", plain, entry.expected),
+        ]
+        if entry.locations:
+            row, col = entry.locations[0]
+            display = f"Go to error ({len(entry.locations)} locations)"
+            cells.append(_cell(f"E{r}", link, display))
+            links.append(
+                f'<hyperlink ref="E{r}" location={quoteattr(f"{quoted}!{get_column_letter(col)}{row}")} '
+                f"display={quoteattr(display)}/>"
+            )
+            if len(entry.locations) > 1:
+                others = "\n".join(f"{get_column_letter(c)}{rr}" for rr, c in entry.locations[1:])
+                comments[(r, width)] = f"This error appears in multiple locations:\n{others}"
+        else:
+            cells.append(_cell(f"E{r}", plain))
+        rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+
+    # Rule timing goes below the warnings, under its own banner and header.
+    last_row = len(entries) + 2
+    merges = [f"A2:{last_col}2"]
+    if performance:
+        banner_row = last_row + 2
+        merges.append(f"A{banner_row}:{last_col}{banner_row}")
+        rows.append(
+            f'<row r="{banner_row}">'
+            + _cell(f"A{banner_row}", header, PERFORMANCE_BANNER)
+            + "".join(_cell(f"{get_column_letter(i)}{banner_row}", header) for i in range(2, width + 1))
+            + "</row>"
+        )
+        r = banner_row + 1
+        rows.append(
+            f'<row r="{r}">'
+            + "".join(
+                _cell(f"{get_column_letter(i)}{r}", header, name) for i, name in enumerate(PERFORMANCE_COLUMNS, 1)
+            )
+            + "</row>"
+        )
+        for title, milliseconds, scanned, found in performance:
+            r += 1
+            rows.append(
+                f'<row r="{r}">'
+                + _cell(f"A{r}", plain, title)
+                + _cell(f"B{r}", centered, round(milliseconds, 3))
+                + _cell(f"C{r}", centered, scanned)
+                + _cell(f"D{r}", centered, found)
+                + "</row>"
+            )
+        last_row = r
+
+    cols = "".join(
+        f'<col min="{i}" max="{i}" width="{len(name) + 20}" customWidth="1"/>'
+        for i, name in enumerate(CHECK_RESULT_COLUMNS, 1)
+    )
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<worksheet xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+        f'<dimension ref="A1:{last_col}{last_row}"/>'
+        '<sheetViews><sheetView workbookViewId="0"/></sheetViews>'
+        '<sheetFormatPr defaultRowHeight="15"/>'
+        f"<cols>{cols}</cols><sheetData>{''.join(rows)}</sheetData>"
+        f'<mergeCells count="{len(merges)}">{"".join(f"<mergeCell ref={quoteattr(ref)}/>" for ref in merges)}</mergeCells>'
+        + (f"<hyperlinks>{''.join(links)}</hyperlinks>" if links else "")
+        + '<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+        "</worksheet>"
+    )
+    return xml, comments
+
+
+class _Package:
+    """In-memory edits to an xlsx zip; untouched parts are copied as they are."""
+
+    def __init__(self, source: Source):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        self.zip = zipfile.ZipFile(source)
+        self.names = self.zip.namelist()
+        self.replaced: Dict[str, bytes] = {}
+        self.removed: set = set()
+
+    def read(self, name: str) -> str:
+        if name in self.replaced:
+            return self.replaced[name].decode("utf-8")
+        return self.zip.read(name).decode("utf-8")
+
+    def exists(self, name: str) -> bool:
+        return name in self.replaced or (name in self.names and name not in self.removed)
+
+    def write(self, name: str, text: str) -> None:
+        self.replaced[name] = text.encode("utf-8")
+        self.removed.discard(name)
+
+    def remove(self, name: str) -> None:
+        self.removed.add(name)
+        self.replaced.pop(name, None)
+
+    def all_names(self) -> List[str]:
+        return [n for n in self.names if n not in self.removed] + [
+            n for n in self.replaced if n not in self.names
+        ]
+
+    def save(self, target: Union[str, IO[bytes]]) -> None:
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as out:
+            for info in self.zip.infolist():
+                if info.filename in self.removed:
+                    continue
+                data = self.replaced.get(info.filename)
+                if data is None:
+                    data = self.zip.read(info.filename)
+                out.writestr(info, data)
+            for name, data in self.replaced.items():
+                if name not in self.names:
+                    out.writestr(name, data)
+        self.zip.close()
+
+
+def _sheet_parts(package: _Package) -> Tuple[str, List[Tuple[str, str, str]]]:
+    """Workbook xml and its sheets as (name, relationship id, part path)."""
+    workbook = package.read("xl/workbook.xml")
+    rels = _relationships(package.read(_rels_path("xl/workbook.xml")))
+    targets = {_attr(rel, "Id"): _resolve("xl/workbook.xml", _attr(rel, "Target")) for rel in rels}
+    sheets = []
+    for tag in re.findall(r"<sheet\b[^>]*/>", workbook):
+        rel_id = _relationship_id(tag)
+        sheets.append((_attr(tag, "name"), rel_id, targets.get(rel_id)))
+    return workbook, sheets
+
+
+def read_header(source: Source, sheet_name: str) -> Dict[str, int]:
+    """Column index of every header cell in the first row of ``sheet_name``."""
+    if hasattr(source, "seek"):
+        source.seek(0)
+    wb = load_workbook(source, read_only=True)
+    try:
+        first_row = next(wb[sheet_name].iter_rows(min_row=1, max_row=1, values_only=True), ())
+        return {value: index for index, value in enumerate(first_row, start=1) if value is not None}
+    finally:
+        wb.close()
+
+
+def export_highlights(
+    source: Source,
+    target: Union[str, IO[bytes]],
+    sheet_name: str,
+    comments: Dict[Tuple[int, int], str],
+    entries: List[CheckEntry],
+    drop_sheets: Iterable[str] = (),
+    performance: Sequence[PerformanceRow] = (),
+) -> None:
+    """Copy ``source`` to ``target`` with ``comments`` cells highlighted.
+
+    ``comments`` maps (row, column) of ``sheet_name`` to the note attached to
+    the red cell.  ``drop_sheets`` are removed, an existing CheckResult sheet
+    among them, and a fresh CheckResult sheet listing ``entries`` is added,
+    followed by the ``performance`` rule timings when given.
+    """
+    package = _Package(source)
+    workbook, sheets = _sheet_parts(package)
+    drop = set(drop_sheets) | {CHECK_RESULT_SHEET}
+    if sheet_name in drop:
+        raise ValueError(f"Cannot drop the highlighted sheet {sheet_name!r}")
+    sheet_part = next((part for name, _, part in sheets if name == sheet_name), None)
+    if sheet_part is None:
+        raise KeyError(f"Worksheet {sheet_name} does not exist.")
+
+    styles = _Styles(package.read("xl/styles.xml"))
+    content_types = package.read("[Content_Types].xml")
+    workbook_rels_path = _rels_path("xl/workbook.xml")
+    workbook_rels = package.read(workbook_rels_path)
+
+    # Drop sheets together with their relationships, content types and any
+    # defined names that point into them.  calcChain is dropped as well:
+    # Excel rebuilds it, and a stale one referencing removed sheets breaks.
+    kept = [(name, rel_id, part) for name, rel_id, part in sheets if name not in drop]
+    old_positions = {name: index for index, (name, _, _) in enumerate(sheets)}
+    new_positions = {name: index for index, (name, _, _) in enumerate(kept)}
+    dropped = [(name, rel_id, part) for name, rel_id, part in sheets if name in drop]
+    for name, rel_id, part in dropped:
+        workbook = re.sub(rf'<sheet\b[^>]*?\w+:id="{re.escape(rel_id)}"[^>]*/>', "", workbook)
+        workbook_rels = re.sub(rf'<Relationship\b[^>]*?Id="{re.escape(rel_id)}"[^>]*/>', "", workbook_rels)
+        content_types = re.sub(rf'<Override\b[^>]*?PartName="/{re.escape(part)}"[^>]*/>', "", content_types)
+        if package.exists(_rels_path(part)):
+            # Comments and their VML belong to exactly one sheet; drawings,
+            # tables etc. may be shared and are left in place.
+            for rel in _relationships(package.read(_rels_path(part))):
+                if _attr(rel, "Type") in (COMMENTS_REL, VML_REL) and _attr(rel, "TargetMode") != "External":
+                    owned = _resolve(part, _attr(rel, "Target"))
+                    content_types = re.sub(
+                        rf'<Override\b[^>]*?PartName="/{re.escape(owned)}"[^>]*/>', "", content_types
+                    )
+                    package.remove(owned)
+        package.remove(part)
+        package.remove(_rels_path(part))
+    for rel in _relationships(workbook_rels):
+        if _attr(rel, "Type") == CALC_CHAIN_REL:
+            part = _resolve("xl/workbook.xml", _attr(rel, "Target"))
+            workbook_rels = workbook_rels.replace(rel, "")
+            content_types = re.sub(rf'<Override\b[^>]*?PartName="/{re.escape(part)}"[^>]*/>', "", content_types)
+            package.remove(part)
+
+    dropped_names = [name for name, _, _ in dropped]
+    by_position = {index: name for name, index in old_positions.items()}
+
+    def keep_name(match):
+        tag = match.group(0)
+        local = _attr(tag, "localSheetId")
+        if local is not None:
+            owner = by_position.get(int(local))
+            if owner in drop:
+                return ""
+            tag = _set_attr(tag, "localSheetId", new_positions[owner])
+        body = html.unescape(re.sub(r"<[^>]+>", "", tag))
+        for name in dropped_names:
+            if f"'{name}'!" in body or re.search(rf"(?<![\w']){re.escape(name)}!", body):
+                return ""
+        return tag
+
+    workbook = re.sub(r"<definedName\b[^>]*?(?:/>|>.*?</definedName>)", keep_name, workbook, flags=re.S)
+    workbook = re.sub(r"<definedNames\b[^>]*>\s*</definedNames>", "", workbook)
+
+    # Highlighted sheet: restyle flagged cells and attach the comments.
+    sheet_xml = _patch_sheet_data(package.read(sheet_part), comments.keys(), styles)
+    vml_block = _free_vml_block(package)
+    if comments:
+        sheet_xml, content_types, vml_block = _attach_comments(
+            package, sheet_part, sheet_xml, comments, content_types, vml_block
+        )
+    package.write(sheet_part, sheet_xml)
+
+    # CheckResult as a brand-new worksheet part.
+    check_part = _free_part(package.all_names(), "xl/worksheets/sheet{}.xml")
+    check_xml, check_comments = _check_result_xml(entries, sheet_name, styles, performance)
+    if check_comments:
+        check_xml, content_types, vml_block = _attach_comments(
+            package, check_part, check_xml, check_comments, content_types, vml_block
+        )
+    package.write(check_part, check_xml)
+    content_types = content_types.replace(
+        "</Types>", f'<Override PartName="/{check_part}" ContentType="{WORKSHEET_TYPE}"/></Types>'
+    )
+    rel_id = _next_rel_id(_relationships(workbook_rels))
+    target_path = posixpath.relpath(check_part, "xl")
+    workbook_rels = workbook_rels.replace(
+        "</Relationships>",
+        f'<Relationship Id="{rel_id}" Type="{WORKSHEET_REL}" Target="{target_path}"/></Relationships>',
+    )
+    sheet_ids = [int(v) for v in re.findall(r'<sheet\b[^>]*?\ssheetId="(\d+)"', workbook)]
+    prefix = re.search(r'<sheet\b[^>]*?\s(\w+):id="', workbook)
+    prefix = prefix.group(1) if prefix else "r"
+    workbook = workbook.replace(
+        "</sheets>",
+        f'<sheet name="{CHECK_RESULT_SHEET}" sheetId="{max(sheet_ids, default=0) + 1}" {prefix}:id="{rel_id}"/></sheets>',
+    )
+    workbook = re.sub(
+        r"<workbookView\b[^>]*/?>",
+        lambda m: _drop_attr(_set_attr(m.group(0), "activeTab", new_positions[sheet_name]), "firstSheet"),
+        workbook,
+        count=1,
+    )
+
+    package.write("xl/styles.xml", styles.render())
+    package.write("xl/workbook.xml", workbook)
+    package.write(workbook_rels_path, workbook_rels)
+    package.write("[Content_Types].xml", content_types)
+    package.save(target)
+
+
+def _attach_comments(
+    package: _Package,
+    sheet_part: str,
+    sheet_xml: str,
+    comments: Dict[Tuple[int, int], str],
+    content_types: str,
+    vml_block: int,
+) -> Tuple[str, str, int]:
+    """Write the comments and VML parts of one sheet, reusing existing ones."""
+    rels_path = _rels_path(sheet_part)
+    rels_xml = (
+        package.read(rels_path)
+        if package.exists(rels_path)
+        else f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{PKG_REL_NS}"></Relationships>'
+    )
+    rels = _relationships(rels_xml)
+    comments_part = vml_part = None
+    vml_rel_id = None
+    for rel in rels:
+        rel_type = _attr(rel, "Type")
+        if rel_type == COMMENTS_REL:
+            comments_part = _resolve(sheet_part, _attr(rel, "Target"))
+        elif rel_type == VML_REL:
+            vml_part = _resolve(sheet_part, _attr(rel, "Target"))
+            vml_rel_id = _attr(rel, "Id")
+
+    existing = package.read(comments_part) if comments_part and package.exists(comments_part) else None
+    comments_xml = _comments_xml(comments, existing)
+    cells = [
+        (int(m.group(2)), column_index_from_string(m.group(1)))
+        for m in re.finditer(r'<comment\b[^>]*?\sref="([A-Z]+)(\d+)"', comments_xml)
+    ]
+    vml_xml, vml_block = _vml_xml(cells, vml_block)
+
+    if comments_part is None:
+        comments_part = _free_part(package.all_names(), "xl/comments{}.xml")
+        rel_id = _next_rel_id(rels)
+        rels_xml = rels_xml.replace(
+            "</Relationships>",
+            f'<Relationship Id="{rel_id}" Type="{COMMENTS_REL}" '
+            f'Target="{posixpath.relpath(comments_part, posixpath.dirname(sheet_part))}"/></Relationships>',
+        )
+        rels = _relationships(rels_xml)
+        content_types = content_types.replace(
+            "</Types>", f'<Override PartName="/{comments_part}" ContentType="{COMMENTS_TYPE}"/></Types>'
+        )
+    if vml_part is None:
+        vml_part = _free_part(package.all_names() + [comments_part], "xl/drawings/vmlDrawing{}.vml")
+        vml_rel_id = _next_rel_id(rels)
+        rels_xml = rels_xml.replace(
+            "</Relationships>",
+            f'<Relationship Id="{vml_rel_id}" Type="{VML_REL}" '
+            f'Target="{posixpath.relpath(vml_part, posixpath.dirname(sheet_part))}"/></Relationships>',
+        )
+    if 'Extension="vml"' not in content_types:
+        content_types = content_types.replace(
+            "<Override", f'<Default Extension="vml" ContentType="{VML_TYPE}"/><Override', 1
+        )
+
+    package.write(comments_part, comments_xml)
+    package.write(vml_part, vml_xml)
+    package.write(rels_path, rels_xml)
+    return _set_legacy_drawing(sheet_xml, vml_rel_id), content_types, vml_block